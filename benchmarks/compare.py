@@ -0,0 +1,86 @@
+"""
+Compares two benchmark result files and flags regressions.
+
+A metric regresses when its median grows by more than the metric's `tolerance` (a fraction)
+and by more than `min_delta` seconds, so tiny timings do not trip on noise.
+
+    python -m benchmarks.compare baseline.json current.json
+"""
+import argparse
+import json
+import os
+import sys
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+
+def load_thresholds(path=None):
+    """Loads the thresholds file: {"default": {...}, "metrics": {name or prefix: {...}}}."""
+    with open(path or DEFAULT_THRESHOLDS, encoding="utf-8") as thresholds_file:
+        return json.load(thresholds_file)
+
+
+def threshold_for(name, thresholds):
+    """Returns the threshold of a metric; the longest matching name prefix wins over the default."""
+    threshold = dict(thresholds.get("default", {}))
+    matches = [prefix for prefix in thresholds.get("metrics", {}) if name == prefix or name.startswith(prefix + ".")]
+    for prefix in sorted(matches, key=len):
+        threshold.update(thresholds["metrics"][prefix])
+    return {"tolerance": threshold.get("tolerance", 0.2), "min_delta": threshold.get("min_delta", 0.0)}
+
+
+def compare(baseline, current, thresholds):
+    """Returns one row per metric: (name, baseline median, current median, change, status)."""
+    rows = []
+    names = list(dict.fromkeys(list(baseline["metrics"]) + list(current["metrics"])))
+    for name in names:
+        before = baseline["metrics"].get(name, {}).get("median")
+        after = current["metrics"].get(name, {}).get("median")
+        if before is None or after is None:
+            rows.append((name, before, after, None, "new" if before is None else "missing"))
+            continue
+        threshold = threshold_for(name, thresholds)
+        change = (after - before) / before if before else 0.0
+        regressed = change > threshold["tolerance"] and after - before > threshold["min_delta"]
+        improved = change < -threshold["tolerance"] and before - after > threshold["min_delta"]
+        rows.append((name, before, after, change, "regression" if regressed else "improved" if improved else "ok"))
+    return rows
+
+
+def print_comparison(baseline, current, rows):
+    """Prints the comparison table and returns the exit code: 1 if any metric regressed."""
+    for key in ("shape", "settings"):
+        if baseline.get(key) != current.get(key):
+            print(f"⚠️ The runs differ in {key}; timings may not be comparable.")
+
+    print(f"{'Metric':<40} {'baseline':>10} {'current':>10} {'change':>8}  status")
+    print("-" * 82)
+    icons = {"ok": "✅", "improved": "🚀", "regression": "❌", "new": "🆕", "missing": "⚪"}
+    for name, before, after, change, status in rows:
+        before_text = f"{before:.4f}s" if before is not None else "-"
+        after_text = f"{after:.4f}s" if after is not None else "-"
+        change_text = f"{change:+.1%}" if change is not None else "-"
+        print(f"{name:<40} {before_text:>10} {after_text:>10} {change_text:>8}  {icons[status]} {status}")
+
+    regressions = [row for row in rows if row[4] == "regression"]
+    if regressions:
+        print(f"\n❌ {len(regressions)} metric(s) regressed beyond their threshold.")
+        return 1
+    print("\n✅ No regressions.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline", help="Results of the reference run")
+    parser.add_argument("current", help="Results of the run to check")
+    parser.add_argument("--thresholds", help="Regression thresholds JSON (default: benchmarks/thresholds.json)")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as baseline_file, open(args.current, encoding="utf-8") as current_file:
+        baseline, current = json.load(baseline_file), json.load(current_file)
+    sys.exit(print_comparison(baseline, current, compare(baseline, current, load_thresholds(args.thresholds))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Generates synthetic Frappe-style app trees for the benchmarks.
+
+A tree holds one app (or a bench with several apps under apps/) with modules, doctypes,
+nested utility packages and public JS, plus the noise real checkouts carry: node_modules,
+a virtual environment and build output. Generation is deterministic for a given seed.
+
+    python -m benchmarks.generate /tmp/frappe-tree --python-files 400 --js-files 100 --depth 4
+"""
+import argparse
+import json
+import os
+import random
+
+MODULES = ("core", "selling", "buying", "stock", "accounts", "hr", "projects", "support")
+DOCTYPE_WORDS = ("item", "order", "invoice", "entry", "ledger", "customer", "supplier", "task", "issue", "batch")
+NODE_PACKAGES = ("lodash", "moment", "vue", "jquery", "frappe-ui", "chart.js")
+
+
+def python_source(rng, name, index):
+    """Returns the source of a doctype controller or utility module with varied complexity."""
+    branches = rng.randint(0, 8)
+    lines = [
+        "import frappe",
+        "from frappe.model.document import Document",
+        "from frappe.utils import flt, cint" if index % 3 else "import json",
+        "",
+        "",
+        f"class {name.title().replace('_', '')}(Document):",
+        "    def validate(self):",
+        "        self.total = 0",
+        "        for row in self.get(\"items\") or []:",
+        "            self.total += flt(row.qty) * flt(row.rate)",
+    ]
+    for branch in range(branches):
+        lines.append(f"        if self.status == \"State{branch}\":")
+        lines.append(f"            self.flag_{branch} = cint(self.total > {branch * 100})")
+    lines += [
+        "",
+        "    def on_submit(self):",
+        "        frappe.db.set_value(self.doctype, self.name, \"docstatus\", 1)",
+        "",
+        "",
+        f"def get_{name}_summary(filters=None):",
+        "    unused_total = 0",
+        f"    return frappe.get_all(\"{name.title()}\", filters=filters or {{}}, fields=[\"name\", \"status\"])",
+        "",
+    ]
+    if index % 7 == 0:
+        lines += ["", "def run_report(query):", "    return frappe.db.sql(query)", ""]
+    return "\n".join(lines)
+
+
+def js_source(rng, name):
+    """Returns the source of a doctype form script."""
+    fields = [rng.choice(("qty", "rate", "amount", "status", "posting_date")) for _ in range(rng.randint(1, 5))]
+    handlers = "\n".join(
+        f"\t{field}(frm) {{\n\t\tfrm.trigger(\"calculate_total\");\n\t}}," for field in dict.fromkeys(fields)
+    )
+    return (
+        f"frappe.ui.form.on(\"{name.title()}\", {{\n"
+        f"{handlers}\n"
+        "\tcalculate_total(frm) {\n"
+        "\t\tlet total = 0;\n"
+        "\t\t(frm.doc.items || []).forEach((row) => { total += row.qty * row.rate; });\n"
+        "\t\tfrm.set_value(\"total\", total);\n"
+        "\t},\n"
+        "});\n"
+    )
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as target:
+        target.write(content)
+
+
+def source_paths(app_dir, app, count, extension, depth, rng):
+    """Spreads `count` source files over doctypes, nested utility packages and public/js."""
+    paths = []
+    for index in range(count):
+        module = MODULES[index % len(MODULES)]
+        name = f"{rng.choice(DOCTYPE_WORDS)}_{index}"
+        if extension == ".js" and index % 4 == 3:
+            paths.append((os.path.join(app_dir, app, "public", "js", module, f"{name}.js"), name))
+        elif index % 3 == 2:
+            nested = [f"level_{level}" for level in range(1 + index % max(1, depth))]
+            paths.append((os.path.join(app_dir, app, module, "utils", *nested, f"{name}{extension}"), name))
+        else:
+            paths.append((os.path.join(app_dir, app, module, "doctype", name, f"{name}{extension}"), name))
+    return paths
+
+
+def generate_app(app_dir, app, python_files, js_files, depth, rng):
+    """Writes one Frappe app and returns the number of source files created."""
+    write(os.path.join(app_dir, "setup.py"), f"from setuptools import setup\n\nsetup(name=\"{app}\")\n")
+    write(os.path.join(app_dir, app, "__init__.py"), "__version__ = \"0.0.1\"\n")
+    write(os.path.join(app_dir, app, "hooks.py"), f"app_name = \"{app}\"\napp_title = \"{app.title()}\"\n")
+    write(os.path.join(app_dir, app, "modules.txt"), "\n".join(module.title() for module in MODULES) + "\n")
+    write(os.path.join(app_dir, ".gitignore"), "*.pyc\n*.egg-info\nnode_modules/\n__pycache__/\n")
+
+    for index, (path, name) in enumerate(source_paths(app_dir, app, python_files, ".py", depth, rng)):
+        write(path, python_source(rng, name, index))
+        init_path = os.path.join(os.path.dirname(path), "__init__.py")
+        if not os.path.exists(init_path):
+            write(init_path, "")
+        if "doctype" in path:
+            write(os.path.splitext(path)[0] + ".json", json.dumps({"doctype": "DocType", "name": name.title()}))
+    for path, name in source_paths(app_dir, app, js_files, ".js", depth, rng):
+        write(path, js_source(rng, name))
+    return python_files + js_files
+
+
+def generate_noise(root, noise_files):
+    """Adds node_modules, a virtual environment and build output that validation must skip."""
+    per_kind = max(1, noise_files // 3)
+    for index in range(per_kind):
+        package = NODE_PACKAGES[index % len(NODE_PACKAGES)]
+        write(os.path.join(root, "node_modules", package, "lib", f"module_{index}.js"), "module.exports = {};\n")
+    venv = os.path.join(root, "env")
+    write(os.path.join(venv, "pyvenv.cfg"), "home = /usr/bin\n")
+    write(os.path.join(venv, "bin", "activate"), "# virtualenv activate script\n")
+    for index in range(per_kind):
+        write(os.path.join(venv, "lib", "python3.10", "site-packages", f"pkg_{index % 20}", f"mod_{index}.py"), "x = 1\n")
+    for index in range(noise_files - 2 * per_kind):
+        write(os.path.join(root, "sites", "assets", "dist", f"bundle_{index}.js"), "!function(){}();\n")
+    write(os.path.join(root, ".gitignore"), "sites/assets/\n")
+
+
+def generate_tree(root, python_files=200, js_files=50, depth=3, noise_files=300, apps=1, seed=0):
+    """
+    Generates a synthetic tree under `root` and returns a description of it.
+    With several apps the tree is laid out like a bench (apps/<app>), otherwise it is a single app.
+    """
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    if apps > 1:
+        for index in range(apps):
+            app = f"app_{index}"
+            generate_app(
+                os.path.join(root, "apps", app), app,
+                python_files // apps + (index < python_files % apps), js_files // apps + (index < js_files % apps), depth, rng
+            )
+    else:
+        generate_app(root, "synthetic_app", python_files, js_files, depth, rng)
+    generate_noise(root, noise_files)
+    return {
+        "python_files": python_files, "js_files": js_files, "depth": depth,
+        "noise_files": noise_files, "apps": apps, "seed": seed,
+    }
+
+
+def add_arguments(parser):
+    """Adds the tree shape options shared by the generator and the benchmark runner."""
+    parser.add_argument("--python-files", type=int, default=200, help="Number of Python source files (default: 200)")
+    parser.add_argument("--js-files", type=int, default=50, help="Number of JavaScript source files (default: 50)")
+    parser.add_argument("--depth", type=int, default=3, help="Maximum nesting of utility packages (default: 3)")
+    parser.add_argument("--noise-files", type=int, default=300, help="Files in node_modules, the venv and build output (default: 300)")
+    parser.add_argument("--apps", type=int, default=1, help="Number of apps; more than one generates a bench layout (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Frappe app tree")
+    parser.add_argument("root", help="Directory to create the tree in")
+    add_arguments(parser)
+    args = parser.parse_args()
+    shape = generate_tree(
+        args.root, args.python_files, args.js_files, args.depth, args.noise_files, args.apps, args.seed
+    )
+    print(json.dumps(shape))
+
+
+if __name__ == "__main__":
+    main()
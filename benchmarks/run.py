@@ -0,0 +1,268 @@
+"""
+Benchmarks discovery, per-tool execution and end-to-end validation on a synthetic Frappe tree.
+
+Tools are replaced by the stubs in stub_tool.py, so runs are offline and timings only move
+when the validator itself gets faster or slower. Results are written as JSON and can be
+compared against a previous run with per-metric regression thresholds:
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --baseline bench.json      # exits 1 on a regression
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.compare import compare, load_thresholds, print_comparison
+from benchmarks.generate import add_arguments, generate_tree
+from benchmarks.stub_tool import install_stubs
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_VERSION = 1
+PYTHON_TOOLS = ("pylint", "mypy", "vulture", "radon", "bandit")
+JS_CHECKS = ("eslint", "prettier", "retire")
+STAGED_FILES = 10  # Files modified and staged for the validate-staged benchmark
+STRESS_FILES = 16  # Python files validated by each run of the multi-job stress check
+STRESS_JOBS = 8  # Jobs of the stress check, whatever the machine's CPU count
+
+
+def measure(function, repeats, setup=None):
+    """Runs `function` `repeats` times (calling `setup` before each run) and returns timing statistics."""
+    timings = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "max": max(timings),
+        "runs": len(timings),
+    }
+
+
+def cli(*args, cwd=None, env=None):
+    """Runs the frappe-code CLI in a fresh interpreter, as a user would."""
+    result = subprocess.run(
+        [sys.executable, "-m", "my_code_validator.cli"] + list(args),
+        cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    if result.returncode not in (0, 1):
+        raise RuntimeError(f"frappe-code {' '.join(args)} exited with {result.returncode}: {result.stderr.strip()}")
+
+
+def bench_discovery(tree, repeats):
+    from my_code_validator.commands import discovery
+    from my_code_validator.commands.validate_project import get_files_by_extension
+
+    def clear_memos():
+        discovery.is_virtual_env.cache_clear()
+        discovery.is_ignored_dir.cache_clear()
+
+    python_files, js_files = get_files_by_extension(tree)
+    all_files = python_files + js_files
+    return {
+        "discovery.get_files_by_extension": measure(lambda: get_files_by_extension(tree), repeats, clear_memos),
+        "discovery.walk_without_git": measure(
+            lambda: list(discovery.iter_project_files(tree, use_git=False)), repeats, clear_memos
+        ),
+        "discovery.is_ignored_all_files": measure(lambda: [discovery.is_ignored(path) for path in all_files], repeats, clear_memos),
+    }, python_files, js_files
+
+
+def bench_tools(tree, python_files, js_files, repeats):
+    from my_code_validator.validators.backends import SubprocessBackend
+    from my_code_validator.validators.batch_validator import BatchPythonValidator
+    from my_code_validator.validators.js_validator import JSValidator
+    from my_code_validator.validators.requirements import DependencyResolver
+
+    metrics = {}
+    batch = BatchPythonValidator(tree)
+    for tool in PYTHON_TOOLS:
+        metrics[f"tools.{tool}.batch"] = measure(lambda: getattr(batch, f"run_{tool}")(python_files), repeats)
+
+    backend = SubprocessBackend()
+    sample = python_files[0]
+    for tool in PYTHON_TOOLS:
+        methods = ("radon_cc", "radon_mi") if tool == "radon" else (tool,)
+        metrics[f"tools.{tool}.file"] = measure(lambda: [getattr(backend, method)(sample) for method in methods], repeats)
+
+    # A fresh resolver and no result cache, so every run extracts and resolves every file's imports
+    metrics["tools.requirements.project"] = measure(lambda: DependencyResolver().project(python_files), repeats)
+
+    if js_files:
+        validator = JSValidator(tree)
+        for check in JS_CHECKS:
+            metrics[f"tools.{check}.file"] = measure(lambda: getattr(validator, f"check_{check}")(js_files[0]), repeats)
+    return metrics
+
+
+def bench_end_to_end(tree, repeats, jobs, env, apps=1):
+    cache_dir = os.path.join(tree, ".frappe_code_cache")
+    clear_cache = lambda: shutil.rmtree(cache_dir, ignore_errors=True)
+    jobs_args = ["--jobs", str(jobs)] if jobs else []
+    validate = lambda *extra: cli("validate", tree, "--no-daemon", *jobs_args, *extra, env=env)
+
+    metrics = {
+        "e2e.validate.cold": measure(lambda: validate("--no-cache"), repeats),
+    }
+    if apps > 1:
+        metrics["e2e.validate_bench.cold"] = measure(lambda: validate("--bench", "--no-cache"), repeats)
+    clear_cache()
+    validate()  # Prime the result cache
+    metrics["e2e.validate.warm"] = measure(validate, repeats)
+    clear_cache()
+    return metrics
+
+
+def bench_staged(tree, python_files, js_files, repeats, jobs, env):
+    """Commits the tree, modifies and stages a few files, and times validate-staged."""
+    git = lambda *args: subprocess.run(["git", "-C", tree] + list(args), check=True, capture_output=True)
+    git("init", "-q")
+    git("-c", "user.email=bench@example.com", "-c", "user.name=bench", "add", "-A")
+    git("-c", "user.email=bench@example.com", "-c", "user.name=bench", "commit", "-q", "-m", "synthetic tree")
+
+    changed = (python_files[:STAGED_FILES // 2] + js_files[:STAGED_FILES // 2]) or python_files[:STAGED_FILES]
+    for path in changed:
+        with open(path, "a", encoding="utf-8") as source:
+            source.write("\n# staged change\n" if path.endswith(".py") else "\n// staged change\n")
+            source.write("x = 1\n" if path.endswith(".py") else "var x = 1;\n")
+    git("add", *changed)
+
+    jobs_args = ["--jobs", str(jobs)] if jobs else []
+    return {
+        "e2e.validate_staged": measure(lambda: cli("validate-staged", "--no-daemon", "--no-cache", *jobs_args, cwd=tree, env=env), repeats),
+    }
+
+
+def bench_stress(python_files, repeats, env):
+    """
+    Validates a slice of the tree cold with the in-process backend and many jobs, where the analyzers
+    share the process's stdout and stderr, and fails if a run crashes or loses a file's report.
+    """
+    files = python_files[:STRESS_FILES]
+
+    def validate():
+        result = subprocess.run(
+            [sys.executable, "-m", "my_code_validator.cli", "validate-file", *files, "--no-daemon", "--no-cache",
+             "--backend", "inprocess", "--jobs", str(STRESS_JOBS), "--format", "ndjson"],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        reported = [json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")]
+        reported = [record for record in reported if record.get("type") == "file"]
+        if result.returncode not in (0, 1) or "Traceback" in result.stderr or len(reported) != len(files):
+            raise RuntimeError(
+                f"The {STRESS_JOBS}-job in-process stress run reported {len(reported)} of {len(files)} file(s) "
+                f"and exited with {result.returncode}: {result.stderr.strip()}"
+            )
+
+    return {"e2e.stress.inprocess": measure(validate, repeats)}
+
+
+def run(args):
+    """Generates the tree, runs every benchmark and returns the results document."""
+    workdir = tempfile.mkdtemp(prefix="frappe-code-bench-")
+    tree = os.path.join(workdir, "tree")
+    stub_bin = install_stubs(os.path.join(workdir, "bin"))
+    try:
+        shape = generate_tree(
+            tree, args.python_files, args.js_files, args.depth, args.noise_files, args.apps, args.seed
+        )
+        env = dict(os.environ, PATH=stub_bin + os.pathsep + os.environ.get("PATH", ""))
+        env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+        env["BENCH_TOOL_DELAY"] = str(args.tool_delay)
+        env["BENCH_FILE_DELAY"] = str(args.file_delay)
+        # The in-process parts of the harness resolve tools through the same stubs
+        os.environ.update({key: env[key] for key in ("PATH", "BENCH_TOOL_DELAY", "BENCH_FILE_DELAY")})
+
+        previous_cwd = os.getcwd()
+        os.chdir(tree)
+        try:
+            metrics, python_files, js_files = bench_discovery(tree, args.repeats)
+            # Noise files that leak into discovery would skew every other number
+            discovered = {"python_files": len(python_files), "js_files": len(js_files)}
+            if "tools" in args.suites:
+                metrics.update(bench_tools(tree, python_files, js_files, args.repeats))
+            if "e2e" in args.suites:
+                metrics.update(bench_end_to_end(tree, args.e2e_repeats, args.jobs, env, args.apps))
+            if "stress" in args.suites:
+                metrics.update(bench_stress(python_files, args.e2e_repeats, env))
+            if "staged" in args.suites:
+                metrics.update(bench_staged(tree, python_files, js_files, args.e2e_repeats, args.jobs, env))
+        finally:
+            os.chdir(previous_cwd)
+    finally:
+        if args.keep_tree:
+            print(f"🌳 Synthetic tree kept at {tree}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "shape": shape,
+        "discovered": discovered,
+        "settings": {
+            "repeats": args.repeats, "e2e_repeats": args.e2e_repeats, "jobs": args.jobs,
+            "tool_delay": args.tool_delay, "file_delay": args.file_delay, "suites": sorted(args.suites),
+        },
+        "metrics": metrics,
+    }
+
+
+def print_results(results):
+    print(f"{'Metric':<40} {'median':>10} {'min':>10} {'max':>10}")
+    print("-" * 73)
+    for name, stats in results["metrics"].items():
+        print(f"{name:<40} {stats['median']:>9.4f}s {stats['min']:>9.4f}s {stats['max']:>9.4f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frappe-code-validate on a synthetic Frappe tree")
+    add_arguments(parser)
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per discovery and tool benchmark (default: 5)")
+    parser.add_argument("--e2e-repeats", type=int, default=3, help="Runs per end-to-end benchmark (default: 3)")
+    parser.add_argument("--jobs", type=int, default=None, help="--jobs passed to the validate commands (default: CPU count)")
+    parser.add_argument("--tool-delay", type=float, default=0.0, help="Simulated start-up cost of each stub tool run, in seconds")
+    parser.add_argument("--file-delay", type=float, default=0.0, help="Simulated cost per file of each stub tool run, in seconds")
+    parser.add_argument(
+        "--suites", nargs="+", choices=["tools", "e2e", "stress", "staged"], default=["tools", "e2e", "stress", "staged"],
+        help="Benchmarks to run in addition to discovery (default: all)"
+    )
+    parser.add_argument("--output", "-o", help="Write the results JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previous results file; exits 1 on a regression")
+    parser.add_argument("--thresholds", help="Regression thresholds JSON (default: benchmarks/thresholds.json)")
+    parser.add_argument("--keep-tree", action="store_true", help="Keep the generated tree for inspection")
+    args = parser.parse_args()
+
+    results = run(args)
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        rows = compare(baseline, results, load_thresholds(args.thresholds))
+        print()
+        sys.exit(print_comparison(baseline, results, rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Guards the CLI's start-up time: commands that do not validate must not import the validators.
+
+Each command runs in a fresh interpreter, as a user would run it. Its start-up cost is the
+median wall-clock time above that of a bare interpreter, so the budget does not depend on
+how slow the machine's Python itself starts. The modules each command imports are read
+from `python -X importtime`:
+
+    python -m benchmarks.startup                 # exits 1 over budget or on a forbidden import
+    python -m benchmarks.startup --budget 0.03 --repeats 20
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET = 0.05  # Seconds a non-validating command may add to interpreter start-up
+# Modules that load the tools and analyzers; only commands that validate files may import them
+VALIDATOR_MODULES = (
+    "my_code_validator.validators.analysis",
+    "my_code_validator.validators.backends",
+    "my_code_validator.validators.batch_validator",
+    "my_code_validator.validators.js_validator",
+    "my_code_validator.validators.python_validator",
+    "my_code_validator.validators.requirements",
+    "my_code_validator.validators.scheduler",
+)
+# Command line, and the module prefixes it must not import
+COMMANDS = {
+    "--version": (["--version"], ("my_code_validator.validators",)),
+    "--help": (["--help"], ("my_code_validator.validators",)),
+    "validate-staged (nothing staged)": (["validate-staged", "--no-daemon"], VALIDATOR_MODULES),
+}
+
+
+def run_timed(args, cwd, env):
+    """Runs a command and returns its wall-clock time in seconds."""
+    start = time.perf_counter()
+    subprocess.run(args, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def imported_modules(args, cwd, env):
+    """Returns the modules a Python command imports, from its -X importtime report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args, cwd=cwd, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    return [
+        line.rsplit("|", 1)[1].strip() for line in result.stderr.splitlines()
+        if line.startswith("import time:") and line.count("|") == 2
+    ][1:]  # The first line is the report's header
+
+
+def make_empty_repository(directory):
+    """Creates a Git repository with a staged change that has no Python or JS files."""
+    git = lambda *args: subprocess.run(["git", "-C", directory] + list(args), check=True, capture_output=True)
+    git("init", "-q")
+    with open(os.path.join(directory, "README.md"), "w", encoding="utf-8") as readme:
+        readme.write("# Empty\n")
+    git("add", "README.md")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the start-up time of frappe-code commands that do not validate")
+    parser.add_argument(
+        "--budget", type=float, default=STARTUP_BUDGET, metavar="SECONDS",
+        help=f"Allowed start-up time above a bare interpreter (default: {STARTUP_BUDGET:g})"
+    )
+    parser.add_argument("--repeats", type=int, default=10, help="Runs per command (default: 10)")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    workdir = tempfile.mkdtemp(prefix="frappe-code-startup-")
+    try:
+        make_empty_repository(workdir)
+        baseline = statistics.median(run_timed([sys.executable, "-c", "pass"], workdir, env) for _ in range(args.repeats))
+        print(f"{'Command':<34} {'median':>10} {'startup':>10}  Forbidden imports")
+        print("-" * 78)
+        failures = []
+        for name, (command, forbidden) in COMMANDS.items():
+            cli = ["-m", "my_code_validator.cli"] + command
+            median = statistics.median(run_timed([sys.executable] + cli, workdir, env) for _ in range(args.repeats))
+            modules = [module for module in imported_modules(cli, workdir, env) if module.startswith(forbidden)]
+            startup = median - baseline
+            print(f"{name:<34} {median:>9.4f}s {startup:>9.4f}s  {', '.join(modules) or '-'}")
+            if startup > args.budget:
+                failures.append(f"{name} takes {startup * 1000:.0f} ms to start, over the {args.budget * 1000:.0f} ms budget")
+            if modules:
+                failures.append(f"{name} imports {', '.join(modules)}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\nBare interpreter: {baseline:.4f}s")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print(f"✅ Every command starts within {args.budget * 1000:.0f} ms without importing the validators.")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
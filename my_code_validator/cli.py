@@ -1,20 +1,46 @@
 import argparse
-import subprocess
-from my_code_validator.commands.validate_project import validate_project
-from my_code_validator.commands.validate_file import validate_files
-from my_code_validator.commands.install_packages import install_packages
-from my_code_validator.commands.uninstall_packages import uninstall_packages
-from my_code_validator.commands.version import version
-
-def get_staged_files():
-    """Retrieve a list of staged files from Git."""
+import os
+import sys
+
+# Command modules are imported when their command is dispatched, so the CLI starts fast and
+# commands that do not validate (like --version) never load the validators and their tools.
+
+
+def parse_shard(value):
+    """Parses an INDEX/COUNT shard argument (1-based) into an (index, count) tuple."""
     try:
-        result = subprocess.run(["git", "diff", "--name-only", "--cached"], capture_output=True, text=True, check=True)
-        files = result.stdout.strip().split("\n")
-        return [file for file in files if file.endswith((".py", ".js"))]
-    except subprocess.CalledProcessError:
-        print("❌ Error: Failed to get staged files. Ensure you're inside a Git repository.")
-        return []
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT, like 2/4, got {value!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and {count}, got {value!r}")
+    return index, count
+
+def use_daemon(args, command, **options):
+    """Hand a validate command to a running daemon. Returns False if it must run locally."""
+    if args.no_daemon:
+        return False
+    from my_code_validator.commands.daemon import run_in_daemon
+    exit_code = run_in_daemon(
+        command, jobs=args.jobs, use_cache=not args.no_cache, backend=args.backend, output_format=args.format,
+        fail_fast=args.fail_fast, budget=args.budget,
+        profile=args.profile, trace=args.trace and os.path.abspath(args.trace), **options
+    )
+    if exit_code is None:
+        return False
+    if exit_code:
+        sys.exit(exit_code)
+    return True
+
+def run_locally(args, validate, *positional, **options):
+    """Run a validate command in this process, profiled when asked to, and exit with its exit code."""
+    from my_code_validator.validators.profiler import profiling
+    with profiling(args.profile, args.trace):
+        exit_code = validate(
+            *positional, jobs=args.jobs, use_cache=not args.no_cache, backend=args.backend, output_format=args.format,
+            fail_fast=args.fail_fast, budget=args.budget, **options
+        )
+    sys.exit(exit_code)
 
 def main():
     """Entry point for the CLI."""
@@ -35,34 +61,251 @@ def main():
     # Validate project
     validate_parser = subparsers.add_parser("validate", help="Validate all Python and JS files in a project directory")
     validate_parser.add_argument("directory", type=str, help="Project directory path")
+    validate_parser.add_argument(
+        "--bench", action="store_true",
+        help="Treat the directory as a bench: validate each app under apps/ with its own configuration, "
+             "ignore rules and result cache, several apps at once, and summarize the results per app"
+    )
+    validate_parser.add_argument(
+        "--since", metavar="REF",
+        help="Validate only the files changed since the Git reference REF (from its merge base with HEAD, "
+             "including uncommitted changes) and the files that import them"
+    )
+    validate_parser.add_argument(
+        "--shard", type=parse_shard, metavar="INDEX/COUNT",
+        help="Validate only shard INDEX of COUNT, balanced by the per-file runtimes in --timings, or by file size without it"
+    )
+    validate_parser.add_argument(
+        "--timings", metavar="FILE",
+        help="Per-file runtimes, recorded by unsharded runs (default: timings.json in the project cache) "
+             "and used to balance shards; every shard must read the same file"
+    )
+    validate_parser.add_argument(
+        "--generated-files", choices=("security", "skip", "all"),
+        help="How minified, generated and oversized files are checked: security checks only, "
+             "not at all, or with all checks (default: security)"
+    )
+    validate_parser.add_argument(
+        "--max-file-size", type=int, metavar="KB",
+        help="Size above which a file is oversized (default: 1024)"
+    )
+    validate_parser.add_argument(
+        "--max-line-length", type=int, metavar="CHARS",
+        help="Line length above which a file is taken as minified (default: 1000)"
+    )
+    validate_parser.add_argument(
+        "--coverage-file", metavar="FILE",
+        help="Coverage data file of the test run, relative to the project directory "
+             "(default: $COVERAGE_FILE or .coverage); files are checked against it when it exists"
+    )
+    validate_parser.add_argument(
+        "--min-coverage", type=float, metavar="PERCENT",
+        help="Fail files whose test coverage is below PERCENT, or that the tests never ran (default: report only)"
+    )
 
     # Validate multiple files
     file_parser = subparsers.add_parser("validate-file", help="Validate one or more Python or JS files")
     file_parser.add_argument("files", nargs="+", help="Path(s) to file(s)")
 
     # Validate only staged files
-    subparsers.add_parser("validate-staged", help="Validate only staged Python and JS files")
+    staged_parser = subparsers.add_parser("validate-staged", help="Validate only staged Python and JS files")
+
+    for command_parser in (validate_parser, file_parser, staged_parser):
+        command_parser.add_argument(
+            "--jobs", "-j", type=int, default=None,
+            help="Number of checks to run in parallel (default: number of CPUs)"
+        )
+        command_parser.add_argument(
+            "--no-cache", action="store_true",
+            help="Re-run every check instead of replaying results for unchanged files"
+        )
+        command_parser.add_argument(
+            "--backend", choices=["subprocess", "inprocess", "native"], default="subprocess",
+            help="Run tools as subprocesses (default), or in-process through their APIs with one Node worker for JS; "
+                 "native also replaces radon and vulture with one shared parse per file (dead code findings approximate vulture's)"
+        )
+        command_parser.add_argument(
+            "--no-daemon", action="store_true",
+            help="Validate in this process even if a daemon is running"
+        )
+        command_parser.add_argument(
+            "--format", choices=["text", "ndjson", "sarif"], default="text",
+            help="Report format, streamed as each file finishes (default: text)"
+        )
+        command_parser.add_argument(
+            "--fail-fast", action="store_true",
+            help="Run each file's checks cheapest first and stop them once the file has failed"
+        )
+        command_parser.add_argument(
+            "--budget", type=float, metavar="SECONDS",
+            help="Wall-clock limit for the run; checks that do not fit are reported as skipped"
+        )
+        command_parser.add_argument(
+            "--profile", action="store_true",
+            help="Print where time went: phases, slowest tools and files, p50/p95, CPU, peak RSS and cache hits"
+        )
+        command_parser.add_argument(
+            "--trace", metavar="FILE",
+            help="Write a Chrome trace-event JSON file of every phase, check and tool run"
+        )
+
+    # Watch a project and validate changed files
+    watch_parser = subparsers.add_parser("watch", help="Validate changed files on every save until interrupted")
+    watch_parser.add_argument("directory", nargs="?", default=".", help="Project directory path (default: current directory)")
+    watch_parser.add_argument(
+        "--jobs", "-j", type=int, default=None,
+        help="Number of checks to run in parallel (default: number of CPUs)"
+    )
+    watch_parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Re-run every check instead of replaying results for unchanged files"
+    )
+    watch_parser.add_argument(
+        "--backend", choices=["subprocess", "inprocess", "native"], default="inprocess",
+        help="How tools are run, see validate (default: inprocess, which keeps analyzers loaded between saves)"
+    )
+    watch_parser.add_argument(
+        "--format", choices=["text", "ndjson"], default="text",
+        help="Report format of each validation (default: text)"
+    )
+    watch_parser.add_argument(
+        "--debounce", type=float, metavar="SECONDS",
+        help="Quiet time after the last save before validating (default: 0.2)"
+    )
+    watch_parser.add_argument("--poll", action="store_true", help="Poll for changes instead of using inotify")
+    watch_parser.add_argument(
+        "--poll-interval", type=float, metavar="SECONDS",
+        help="Seconds between scans when polling (default: 1)"
+    )
+
+    # Merge sharded results
+    merge_parser = subparsers.add_parser("merge-results", help="Combine the NDJSON reports of sharded runs into one summary")
+    merge_parser.add_argument("reports", nargs="+", help="NDJSON report of each shard (validate --shard I/N --format ndjson)")
+    merge_parser.add_argument(
+        "--format", choices=["text", "ndjson"], default="text",
+        help="Print a text summary (default), or all records followed by one merged summary record"
+    )
+    merge_parser.add_argument(
+        "--timings-output", metavar="FILE",
+        help="Write the per-file runtimes recorded by all shards, for the next run's --timings"
+    )
+
+    # Resident daemon
+    daemon_parser = subparsers.add_parser("daemon", help="Keep a warm validation server running for this directory")
+    daemon_parser.add_argument("action", choices=["start", "stop", "status"], help="Daemon action")
+
+    # Manage the result cache
+    cache_parser = subparsers.add_parser("cache", help="Manage the validation result cache")
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command")
+    clear_parser = cache_subparsers.add_parser("clear", help="Delete all cached validation results")
+    clear_parser.add_argument("directory", nargs="?", default=".", help="Project directory path (default: current directory)")
+
+    # Query the diagnostics history
+    report_parser = subparsers.add_parser("report", help="Query the diagnostics recorded by past validate runs")
+    report_options = argparse.ArgumentParser(add_help=False)
+    report_options.add_argument(
+        "--directory", "-C", default=".", help="Project directory whose history is queried (default: current directory)"
+    )
+    report_options.add_argument("--format", choices=["text", "json"], default="text", help="Output format (default: text)")
+    report_subparsers = report_parser.add_subparsers(dest="report_command")
+    top_parser = report_subparsers.add_parser("top", parents=[report_options], help="Files with the most findings")
+    top_parser.add_argument("--tool", help="Only count the findings of one tool, e.g. pylint")
+    top_parser.add_argument("--limit", type=int, default=20, help="Number of files listed (default: 20)")
+    new_parser = report_subparsers.add_parser(
+        "new", parents=[report_options], help="Findings that appeared since a Git reference was validated"
+    )
+    new_parser.add_argument("ref", help="Git reference; its merge base with HEAD, or an ancestor, must have a recorded run")
+    trends_parser = report_subparsers.add_parser(
+        "trends", parents=[report_options], help="Pylint rating and radon rank changes per file, and recent runs"
+    )
+    trends_parser.add_argument("--days", type=int, default=30, help="Period compared, in days (default: 30)")
+    trends_parser.add_argument("--file", dest="file_pattern", metavar="GLOB", help="Only files matching a glob pattern, e.g. 'app/api/*'")
+    report_subparsers.add_parser("suppressions", parents=[report_options], help="List the suppressed findings")
+    suppress_parser = report_subparsers.add_parser(
+        "suppress", parents=[report_options], help="Mark current findings as known, so validate leaves them out"
+    )
+    unsuppress_parser = report_subparsers.add_parser(
+        "unsuppress", parents=[report_options], help="Report suppressed findings again"
+    )
+    for query_parser in (suppress_parser, unsuppress_parser):
+        query_parser.add_argument("files", nargs="*", help="Files whose findings are affected (default: all files)")
+        query_parser.add_argument("--tool", help="Only the findings of one tool")
+    suppress_parser.add_argument("--reason", help="Why the findings are accepted, shown by `report suppressions`")
 
 
     args = parser.parse_args()
+    if getattr(args, "budget", None) is not None and args.budget <= 0:
+        parser.error("--budget must be a positive number of seconds")
+    if args.command == "validate" and args.bench and (args.shard or args.timings):
+        parser.error("--bench cannot be combined with --shard or --timings")
+    if args.command == "validate" and any(
+        value is not None and value <= 0 for value in (args.max_file_size, args.max_line_length)
+    ):
+        parser.error("--max-file-size and --max-line-length must be positive")
+    if args.command == "validate" and args.min_coverage is not None and not 0 <= args.min_coverage <= 100:
+        parser.error("--min-coverage must be a percentage between 0 and 100")
+    if args.command == "watch" and (
+        (args.debounce is not None and args.debounce < 0) or (args.poll_interval is not None and args.poll_interval <= 0)
+    ):
+        parser.error("--debounce must not be negative and --poll-interval must be positive")
 
     # Handle commands
     if args.version:
+        from my_code_validator.commands.version import version
         version()
     elif args.command == "validate":
-        validate_project(args.directory)
+        timings = args.timings and os.path.abspath(args.timings)
+        file_limits = dict(
+            action=args.generated_files,
+            max_size=args.max_file_size and args.max_file_size * 1024,
+            max_line_length=args.max_line_length,
+        )
+        file_limits = {name: value for name, value in file_limits.items() if value is not None}
+        coverage_options = dict(data_file=args.coverage_file, threshold=args.min_coverage)
+        coverage_options = {name: value for name, value in coverage_options.items() if value is not None}
+        options = dict(
+            shard=args.shard, timings=timings, bench=args.bench, since=args.since, file_limits=file_limits,
+            coverage_options=coverage_options
+        )
+        if not use_daemon(args, "validate", directory=args.directory, **options):
+            from my_code_validator.commands.validate_project import validate_project
+            run_locally(args, validate_project, args.directory, **options)
     elif args.command == "validate-file":
-        validate_files(args.files)  
+        if not use_daemon(args, "validate-file", files=args.files):
+            from my_code_validator.commands.validate_file import validate_files
+            run_locally(args, validate_files, args.files)
     elif args.command == "validate-staged":
-        staged_files = get_staged_files()
-        if staged_files:
-            print(f"📂 Staged files: {', '.join(staged_files)}")
-            validate_files(staged_files)
-        else:
-            print("✅ No staged Python or JavaScript files to validate.")
+        if not use_daemon(args, "validate-staged"):
+            from my_code_validator.commands.staged import validate_staged
+            run_locally(args, validate_staged)
+    elif args.command == "watch":
+        from my_code_validator.commands.watch import watch
+        sys.exit(watch(
+            args.directory, jobs=args.jobs, use_cache=not args.no_cache, backend=args.backend, output_format=args.format,
+            debounce=args.debounce, poll=args.poll, poll_interval=args.poll_interval
+        ))
+    elif args.command == "merge-results":
+        from my_code_validator.commands.merge_results import merge_results
+        sys.exit(merge_results(args.reports, args.format, args.timings_output))
+    elif args.command == "daemon":
+        from my_code_validator.commands.daemon import daemon_status, start_daemon, stop_daemon
+        {"start": start_daemon, "stop": stop_daemon, "status": daemon_status}[args.action]()
+    elif args.command == "cache" and args.cache_command == "clear":
+        from my_code_validator.commands.cache import clear_cache
+        clear_cache(args.directory)
+    elif args.command == "report" and args.report_command:
+        from my_code_validator.commands.report import report
+        # Each query takes its own options
+        options = {
+            name: getattr(args, name)
+            for name in ("ref", "tool", "limit", "days", "file_pattern", "files", "reason") if hasattr(args, name)
+        }
+        sys.exit(report(args.report_command, args.directory, args.format, **options))
     elif args.command == "install":
+        from my_code_validator.commands.install_packages import install_packages
         install_packages()
     elif args.command == "uninstall":
+        from my_code_validator.commands.uninstall_packages import uninstall_packages
         uninstall_packages()
     else:
         parser.print_help()
@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from my_code_validator.validators.process import in_directory
+from my_code_validator.validators.reporters import EXIT_ERROR
+from my_code_validator.validators.scheduler import default_jobs
+from .discovery import find_apps
+from .validate_project import validate_directory
+
+PARALLEL_APPS = 4  # Apps validated at once; each gets an equal share of --jobs
+MIN_APP_BUDGET = 0.001  # Seconds given to an app that starts after the budget ran out, so its checks are reported as skipped
+
+
+class AppReporter:
+    """
+    Reports one app of a bench through the run's reporter. Each file's report is written under
+    a lock shared by all apps, so reports of apps validated at once never interleave, and the
+    app's own results are counted for the bench summary. Messages are prefixed with the app's name.
+    """
+
+    def __init__(self, reporter, app, lock):
+        self.reporter = reporter
+        self.app = app
+        self.lock = lock
+        self.files = 0
+        self.failed_files = 0
+        self.errors = 0
+        self.run_info = {}  # The app's requirements and timings, kept out of the run's summary
+
+    def message(self, text):
+        lead = text[:len(text) - len(text.lstrip("\n"))]
+        with self.lock:
+            self.reporter.message(f"{lead}[{self.app}] {text[len(lead):]}")
+
+    def error(self, text):
+        self.errors += 1
+        with self.lock:
+            self.reporter.error(f"[{self.app}] {text}")
+
+    def report(self, validator, file_path, results, header=None):
+        with self.lock:
+            failed = self.reporter.report(validator, file_path, results, header)
+        self.files += 1
+        self.failed_files += failed
+        return failed
+
+    def summary(self, seconds):
+        """Returns the app's entry in the bench summary."""
+        return {
+            "files": self.files, "failed": self.failed_files, "errors": self.errors, "seconds": round(seconds, 3),
+            **self.run_info,
+        }
+
+
+def validate_app(
+    app_dir, reporter, jobs, use_cache, backend, fail_fast, deadline, since=None, file_limits=None, coverage_options=None
+):
+    """
+    Validate one app with its own configuration, ignore rules, result cache and recorded runtimes.
+    Its tools run in the app directory, so they read the app's configuration files.
+    Returns the time it took.
+    """
+    start = time.perf_counter()
+    budget = None if deadline is None else max(MIN_APP_BUDGET, deadline - time.monotonic())
+    try:
+        with in_directory(app_dir):
+            validate_directory(
+                app_dir, reporter, jobs, use_cache, backend, fail_fast, budget,
+                since=since, file_limits=file_limits, coverage_options=coverage_options
+            )
+    except Exception as e:  # One broken app must not stop the others
+        reporter.error(f"❌ Error: Failed to validate {app_dir}: {e}")
+    return time.perf_counter() - start
+
+
+def print_bench_summary(reporter, summaries):
+    lines = ["\n📊 Bench Summary", "-" * 50, f"{'App':<24} {'Files':>6} {'Failed':>7} {'Errors':>7} {'Time':>8}"]
+    for app, summary in summaries.items():
+        lines.append(
+            f"{app:<24} {summary['files']:>6} {summary['failed']:>7} {summary['errors']:>7} {summary['seconds']:>7.1f}s"
+        )
+    lines.append("-" * 50)
+    reporter.message("\n".join(lines))
+
+
+def validate_bench(
+    directory, reporter, jobs=None, use_cache=True, backend="subprocess", fail_fast=False, budget=None, since=None,
+    file_limits=None, coverage_options=None
+):
+    """
+    Validate each app of a bench (apps/<app>, see discovery.find_apps) on its own: with the app's
+    configuration, ignore rules and result cache, so unchanged apps replay from their cache.
+    Up to PARALLEL_APPS apps are validated at once, each with its share of the `jobs` workers;
+    a `budget` covers the whole bench and `since` selects each app's changed files and their dependents.
+    `file_limits` and `coverage_options` apply to every app, see validate_project; each app reads
+    its own coverage data file.
+    The results of each app go into a per-app summary, printed at the end and included in
+    structured reports as "apps".
+    Returns the exit code: 2 if no app was found or an app could not be validated,
+    1 if any file failed validation, otherwise 0.
+    """
+    apps = find_apps(os.path.abspath(directory))
+    if not apps:
+        reporter.message(f"❌ Error: No Frappe apps found in {directory} (looked for setup.py, pyproject.toml or hooks.py).")
+        return EXIT_ERROR
+    reporter.message(f"🏗️ Validating {len(apps)} app(s): {', '.join(os.path.basename(app) for app in apps)}")
+
+    parallel = min(len(apps), PARALLEL_APPS)
+    app_jobs = max(1, (jobs or default_jobs()) // parallel)
+    deadline = None if budget is None else time.monotonic() + budget
+    lock = threading.Lock()
+    app_reporters = {os.path.basename(app): AppReporter(reporter, os.path.basename(app), lock) for app in apps}
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        durations = [
+            executor.submit(
+                validate_app, app, app_reporter, app_jobs, use_cache, backend, fail_fast, deadline, since, file_limits,
+                coverage_options
+            )
+            for app, app_reporter in zip(apps, app_reporters.values())
+        ]
+        summaries = {
+            name: app_reporter.summary(duration.result())
+            for (name, app_reporter), duration in zip(app_reporters.items(), durations)
+        }
+
+    print_bench_summary(reporter, summaries)
+    reporter.run_info["apps"] = summaries
+    if since is not None:
+        reporter.run_info["since"] = since
+    return reporter.finish()
@@ -0,0 +1,12 @@
+import os
+from my_code_validator.validators.cache import ResultCache
+
+def clear_cache(directory):
+    """Delete the validation result cache of a project directory."""
+    cache = ResultCache(directory)
+    if not os.path.isdir(cache.root):
+        print(f"✅ No cached results found in {directory}.")
+        return
+
+    cache.clear()
+    print(f"🗑 Cleared cached validation results in {cache.root}.")
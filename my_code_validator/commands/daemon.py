@@ -0,0 +1,310 @@
+import hashlib
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+START_TIMEOUT = 15  # Seconds to wait for a freshly started daemon to accept connections
+REQUEST_TIMEOUT = 10  # Seconds to wait for the answer to a ping or shutdown request
+# Seconds a validate request may go without output before the daemon is taken to be wedged;
+# longer than the longest tool timeout (see process.TOOL_TIMEOUTS)
+OUTPUT_TIMEOUT = 960
+EXIT_ERROR = 2  # As in reporters.py, which the client side does not load
+STREAM_CHUNK = 64 * 1024  # Characters of output without a line break sent as one message
+
+
+def socket_path(directory=None):
+    """Return the Unix socket path of the daemon serving a project directory."""
+    root = os.path.abspath(directory or os.getcwd())
+    digest = hashlib.sha256(root.encode()).hexdigest()[:12]
+    # Sockets live in the temp dir because project paths can exceed the socket path limit
+    return os.path.join(tempfile.gettempdir(), f"frappe-code-{os.getuid()}-{digest}.sock")
+
+
+def send_request(payload, directory=None, timeout=REQUEST_TIMEOUT, on_output=None):
+    """
+    Send a request to the daemon and return its decoded response, or None if it is not running.
+    The daemon sends one JSON message per line: output messages ({"stdout": text} or
+    {"stderr": text}) as the run produces them, each handed to `on_output`, then the response.
+    Raises TimeoutError if the daemon sends nothing for `timeout` seconds, and ConnectionError
+    if it closes the connection without a response.
+    """
+    path = socket_path(directory)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(path)
+            client.sendall(json.dumps(payload).encode() + b"\n")
+            with client.makefile("rb") as messages:
+                for line in messages:
+                    message = json.loads(line.decode())
+                    if "stdout" not in message and "stderr" not in message:
+                        return message
+                    if on_output is not None:
+                        on_output(message)
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None
+    raise ConnectionError("the daemon closed the connection without a response")
+
+
+def write_output(message):
+    """Print an output message of the daemon to the stream it was written to."""
+    for name, stream in (("stdout", sys.stdout), ("stderr", sys.stderr)):
+        if name in message:
+            stream.write(message[name])
+            stream.flush()
+
+
+def run_in_daemon(command, **options):
+    """
+    Run a validate command in the daemon when one is running for the current directory.
+    Prints the daemon's output as it arrives and returns the exit code, or None if no daemon is available.
+    """
+    try:
+        response = send_request(
+            {"command": command, "cwd": os.getcwd(), "options": options}, timeout=OUTPUT_TIMEOUT, on_output=write_output
+        )
+    except (TimeoutError, ConnectionError) as e:
+        print(f"❌ Error: The daemon stopped answering ({e or 'timed out'}). Stop it with `frappe-code daemon stop`.", file=sys.stderr)
+        return EXIT_ERROR
+    if response is None:
+        return None
+    return response["exit_code"]
+
+
+def request_status(command):
+    """Send a ping or shutdown request; exits if the daemon does not answer."""
+    try:
+        return send_request({"command": command})
+    except (TimeoutError, ConnectionError):
+        print(
+            f"❌ Error: The daemon for this directory does not answer within {REQUEST_TIMEOUT}s; "
+            "it may be busy with a long run, or see its daemon.log."
+        )
+        sys.exit(1)
+
+
+class StreamWriter(io.TextIOBase):
+    """
+    An output stream of a daemon request, sent to the client as it is written, so the daemon
+    holds at most a line of a run's output. Output is dropped once the client has gone.
+    """
+    name = "<daemon>"  # Some tools expect sys.stdout to have a name
+
+    def __init__(self, send, stream):
+        super().__init__()
+        self.send = send
+        self.stream = stream
+        self.buffer = ""
+        self.lock = threading.Lock()  # Reporters and tools may write from scheduler threads
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        with self.lock:
+            self.buffer += text
+            if "\n" in text or len(self.buffer) >= STREAM_CHUNK:
+                self.send_buffer()
+        return len(text)
+
+    def flush(self):
+        with self.lock:
+            self.send_buffer()
+
+    def send_buffer(self):
+        if self.buffer:
+            text, self.buffer = self.buffer, ""
+            self.send({self.stream: text})
+
+    def close(self):
+        pass  # Tool reporters close the streams they were given
+
+
+@contextmanager
+def request_streams(output, errors, lock):
+    """
+    Points sys.stdout and sys.stderr at a request's streams for the duration of the block.
+    The swaps happen under `lock` (backends.STREAMS_LOCK), so they never interleave with the
+    in-process tools, which swap the streams under it too; a tool still running for an
+    abandoned check then restores the streams it found before the next request swaps them.
+    """
+    with lock:
+        previous = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = output, errors
+    try:
+        yield
+    finally:
+        with lock:
+            sys.stdout, sys.stderr = previous
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request per connection, streaming its output back as it is produced."""
+
+    def handle(self):
+        request = json.loads(self.rfile.readline().decode())
+        lock = threading.Lock()
+        connected = [True]
+
+        def send(message):
+            with lock:
+                if not connected[0]:
+                    return
+                try:
+                    self.wfile.write(json.dumps(message).encode() + b"\n")
+                except OSError:
+                    connected[0] = False
+
+        send(self.server.dispatch(request, send))
+
+
+class ValidationDaemon(socketserver.UnixStreamServer):
+    """
+    A resident validation server. Requests are handled one at a time, so redirected output
+    never mixes; the checks of each request still run in parallel through the scheduler.
+    Analyzers, the mypy daemon and result caches stay loaded between requests.
+    """
+
+    def __init__(self, path, directory):
+        self.directory = directory
+        self.started = time.time()
+        self.requests = 0
+        super().__init__(path, DaemonHandler)
+
+        # Imported here so the client side stays cheap to load
+        from my_code_validator.validators import backends
+        backends.BACKEND_INSTANCES["inprocess"] = backends.InProcessBackend(mypy_daemon=True)
+        self.backend = backends.BACKEND_INSTANCES["inprocess"]
+
+    def dispatch(self, request, send):
+        """Run a request, sending its output through `send`, and return its response."""
+        command = request.get("command")
+        if command == "ping":
+            return {"pid": os.getpid(), "directory": self.directory, "uptime": time.time() - self.started, "requests": self.requests}
+        if command == "shutdown":
+            threading.Thread(target=self.shutdown).start()
+            return {"exit_code": 0}
+
+        self.requests += 1
+        return self.run_validation(command, request.get("cwd", self.directory), request.get("options", {}), send)
+
+    def run_validation(self, command, cwd, options, send):
+        """Run a validate command, streaming its output through `send`, and return the exit code."""
+        from my_code_validator.commands.validate_file import validate_files
+        from my_code_validator.commands.validate_project import validate_project
+        from my_code_validator.commands.staged import validate_staged
+        from my_code_validator.validators.backends import STREAMS_LOCK
+        from my_code_validator.validators.profiler import profiling
+
+        options = dict(options, backend="native" if options.get("backend") == "native" else "inprocess")
+        profile, trace = options.pop("profile", False), options.pop("trace", None)
+        output = StreamWriter(send, "stdout")
+        errors = StreamWriter(send, "stderr")
+        exit_code = 0
+        previous_cwd = os.getcwd()
+        try:
+            os.chdir(cwd)
+            with request_streams(output, errors, STREAMS_LOCK), profiling(profile, trace, report=lambda text: errors.write(text + "\n")):
+                if command == "validate":
+                    exit_code = validate_project(options.pop("directory"), **options)
+                elif command == "validate-file":
+                    exit_code = validate_files(options.pop("files"), **options)
+                elif command == "validate-staged":
+                    exit_code = validate_staged(**options)
+                else:
+                    print(f"❌ Error: Unknown daemon command {command}.")
+                    exit_code = EXIT_ERROR
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except Exception:  # Keep serving the other clients; report the failure to this one
+            errors.write(f"❌ Error: The daemon failed to validate:\n{traceback.format_exc()}")
+            exit_code = EXIT_ERROR
+        finally:
+            os.chdir(previous_cwd)
+            output.flush()
+            errors.flush()
+        return {"exit_code": exit_code}
+
+
+def serve(directory):
+    """Run the daemon in the foreground until it is asked to stop."""
+    path = socket_path(directory)
+    if os.path.exists(path):
+        os.remove(path)
+
+    os.chdir(directory)
+    server = ValidationDaemon(path, directory)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        server.backend.close()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def start_daemon():
+    """Start a daemon for the current directory in the background."""
+    directory = os.getcwd()
+    status = request_status("ping")
+    if status is not None:
+        print(f"✅ Daemon already running (pid {status['pid']}).")
+        return
+
+    # Imported here, like the validators, so the client side stays cheap to load
+    from my_code_validator.validators.cache import CACHE_DIR_NAME
+    log_dir = os.path.join(directory, CACHE_DIR_NAME)
+    os.makedirs(log_dir, exist_ok=True)
+    with open(os.path.join(log_dir, "daemon.log"), "a", encoding="utf-8") as log_file:
+        subprocess.Popen(
+            [sys.executable, "-m", "my_code_validator.commands.daemon", directory],
+            stdin=subprocess.DEVNULL, stdout=log_file, stderr=log_file, start_new_session=True
+        )
+
+    deadline = time.time() + START_TIMEOUT
+    while time.time() < deadline:
+        try:
+            status = send_request({"command": "ping"})
+        except (TimeoutError, ConnectionError):  # Still loading the analyzers
+            status = None
+        if status is not None:
+            print(f"🚀 Daemon started (pid {status['pid']}) for {directory}.")
+            return
+        time.sleep(0.1)
+
+    print(f"❌ Error: Daemon did not start, see {os.path.join(log_dir, 'daemon.log')}.")
+    sys.exit(1)
+
+
+def stop_daemon():
+    """Stop the daemon of the current directory."""
+    if request_status("shutdown") is None:
+        print("⚠️ No daemon is running for this directory.")
+        return
+    print("✅ Daemon stopped.")
+
+
+def daemon_status():
+    """Print whether a daemon is running for the current directory."""
+    status = request_status("ping")
+    if status is None:
+        print("⚪ No daemon is running for this directory.")
+        return
+    print(f"🟢 Daemon running (pid {status['pid']}) for {status['directory']}")
+    print(f"   Uptime: {status['uptime']:.0f}s, requests served: {status['requests']}")
+
+
+if __name__ == "__main__":
+    serve(os.path.abspath(sys.argv[1]))
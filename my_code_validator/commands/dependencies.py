@@ -3,7 +3,6 @@ install_requires = [
     "vulture",      # Type checking
     "bandit",       # Security analysis
     "pylint",       # Linting
-    "pipreqs",      # Generate requirements.txt
     "coverage",     # Test coverage
     "radon",        # Code complexity
     "mypy",         # Static type checking
@@ -0,0 +1,265 @@
+import os
+import re
+import subprocess
+from functools import lru_cache
+
+IGNORE_FILES = {"node_modules", ".git", ".venv", ".vscode", "__pycache__", ".frappe_code_cache"}
+VENV_NAMES = {"venv", ".venv", "env", "myenv"}
+VENV_INDICATORS = {"bin", "Scripts", "pyvenv.cfg"}  # Common venv structure
+SOURCE_EXTENSIONS = (".py", ".js")
+APP_MARKERS = ("setup.py", "pyproject.toml")  # Files at the root of a Frappe app, besides its hooks.py
+
+
+@lru_cache(maxsize=None)
+def is_virtual_env(path):
+    """
+    Check if the given directory is a virtual environment folder.
+    Results are memoized, so each directory is inspected at most once per run.
+    """
+    abs_path = os.path.abspath(path)
+    if os.path.basename(abs_path) in VENV_NAMES:
+        return True
+
+    # A bare bin/ or Scripts/ folder is common in projects; require the venv marker file or activate script
+    if os.path.exists(os.path.join(abs_path, "pyvenv.cfg")):
+        return True
+    return any(
+        os.path.exists(os.path.join(abs_path, scripts_dir, "activate"))
+        for scripts_dir in VENV_INDICATORS - {"pyvenv.cfg"}
+    )
+
+
+@lru_cache(maxsize=None)
+def is_ignored_dir(path, boundary=None):
+    """
+    Check if a directory, or any of its parents below `boundary`, is ignored (memoized per directory).
+    The boundary keeps folders above the project (e.g. a checkout under ~/env/) from hiding it.
+    """
+    abs_path = os.path.abspath(path)
+    if abs_path == boundary:
+        return False
+    if os.path.basename(abs_path) in IGNORE_FILES or is_virtual_env(abs_path):
+        return True
+    parent = os.path.dirname(abs_path)
+    return parent != abs_path and is_ignored_dir(parent, boundary)
+
+
+def default_boundary(path):
+    """Return the directory above which ignore rules stop applying: the parent of the working directory."""
+    cwd = os.getcwd()
+    if path == cwd or path.startswith(cwd + os.sep):
+        return os.path.dirname(cwd)
+    return None
+
+
+def is_ignored(path):
+    """Check if the given path is inside any ignored directory."""
+    abs_path = os.path.abspath(path)
+    boundary = default_boundary(abs_path)
+    if os.path.isdir(abs_path):
+        return is_ignored_dir(abs_path, boundary)
+    return os.path.basename(abs_path) in IGNORE_FILES or is_ignored_dir(os.path.dirname(abs_path), boundary)
+
+
+def is_app(path):
+    """Check if a directory is a Frappe app: it holds setup.py or pyproject.toml, or hooks.py in its package."""
+    return any(os.path.isfile(os.path.join(path, name)) for name in APP_MARKERS) or any(
+        os.path.isfile(os.path.join(base, "hooks.py")) for base in (path, os.path.join(path, os.path.basename(path)))
+    )
+
+
+def find_apps(directory):
+    """
+    Return the app directories of a bench, sorted by name: the apps under its apps/ folder,
+    or the apps directly inside `directory` when it has no apps/ folder.
+    """
+    apps_dir = os.path.join(directory, "apps")
+    if not os.path.isdir(apps_dir):
+        apps_dir = directory
+    apps = []
+    for name in sorted(os.listdir(apps_dir)):
+        path = os.path.join(apps_dir, name)
+        if os.path.isdir(path) and name not in IGNORE_FILES and not is_virtual_env(path) and is_app(path):
+            apps.append(path)
+    return apps
+
+
+class GitIgnore:
+    """
+    A matcher for the patterns of one .gitignore file, relative to the directory holding it.
+    Supports comments, negation (!), directory-only (trailing /), anchored (leading or inner /),
+    wildcard (*, ?, **) and bracket ([abc], [a-z], [!abc]) patterns.
+    """
+
+    def __init__(self, base, lines):
+        self.base = base
+        self.rules = []
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.strip("/") if dir_only else line
+            anchored = "/" in line.lstrip("/") or line.startswith("/")
+            self.rules.append((self.compile(line.lstrip("/"), anchored), negate, dir_only))
+
+    @staticmethod
+    def compile(pattern, anchored):
+        """Translate a gitignore glob into a regular expression on a relative path."""
+        regex = ""
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith("**/", i):
+                regex += "(?:.*/)?"
+                i += 3
+            elif pattern.startswith("**", i):
+                regex += ".*"
+                i += 2
+            elif pattern[i] == "*":
+                regex += "[^/]*"
+                i += 1
+            elif pattern[i] == "?":
+                regex += "[^/]"
+                i += 1
+            elif pattern[i] == "[":
+                # A bracket expression such as [cod] or [!0-9]; ranges keep their "-"
+                end = GitIgnore.bracket_end(pattern, i)
+                if end == -1:
+                    return re.compile("(?!)")  # Like git, a pattern with an unclosed bracket matches nothing
+                negate = pattern[i + 1] in "!^"
+                body = pattern[i + 1 + negate:end]
+                regex += ("[^/" if negate else "[") + "".join(c if c == "-" else re.escape(c) for c in body) + "]"
+                i = end + 1
+            else:
+                regex += re.escape(pattern[i])
+                i += 1
+        return re.compile(("^" if anchored else "^(?:.*/)?") + regex + "$")
+
+    @staticmethod
+    def bracket_end(pattern, start):
+        """Return the index of the "]" closing the bracket expression at `start`, or -1 if it is not closed."""
+        i = start + 1
+        if pattern[i:i + 1] in ("!", "^"):
+            i += 1
+        # A "]" right after the opening bracket (or its negation) is part of the set
+        return pattern.find("]", i + 1)
+
+    @classmethod
+    def load(cls, directory):
+        """Return the matcher for a directory's .gitignore, or None if it has none."""
+        try:
+            with open(os.path.join(directory, ".gitignore"), encoding="utf-8") as ignore_file:
+                return cls(directory, ignore_file.readlines())
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def match(self, path, is_dir):
+        """Return True (ignored), False (re-included) or None (no rule applies) for a path."""
+        relative = os.path.relpath(path, self.base).replace(os.sep, "/")
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relative):
+                result = not negate
+        return result
+
+
+def is_gitignored(path, is_dir, matchers):
+    """Apply the .gitignore files of all enclosing directories; deeper files take precedence."""
+    ignored = False
+    for matcher in matchers:
+        result = matcher.match(path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+def gitignore_matchers(directory, root):
+    """Return the matchers of the .gitignore files from `root` down to a directory below it, as walk_project applies them."""
+    bases = [directory]
+    while directory != root and os.path.dirname(directory) != directory:
+        directory = os.path.dirname(directory)
+        bases.append(directory)
+    return [matcher for matcher in map(GitIgnore.load, reversed(bases)) if matcher]
+
+
+def git_files(directory):
+    """
+    List tracked and untracked, non-ignored files with `git ls-files`.
+    Returns None when the directory is not inside a Git work tree.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", directory, "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [name for name in result.stdout.decode("utf-8", "surrogateescape").split("\0") if name]
+
+
+def walk_project(directory):
+    """
+    Walk a directory, pruning ignored directories (including .gitignore matches) in place.
+    Yields each kept directory with the paths of its files that are not gitignored.
+    """
+    matchers_by_dir = {}
+    for root, dirs, files in os.walk(directory):
+        parent_matchers = matchers_by_dir.pop(root, [])
+        own_matcher = GitIgnore.load(root)
+        matchers = parent_matchers + [own_matcher] if own_matcher else parent_matchers
+
+        kept = []
+        for name in sorted(dirs):
+            path = os.path.join(root, name)
+            if name in IGNORE_FILES or is_virtual_env(path) or is_gitignored(path, True, matchers):
+                continue
+            kept.append(name)
+            matchers_by_dir[path] = matchers
+        dirs[:] = kept
+
+        yield root, [
+            os.path.join(root, name) for name in sorted(files)
+            if not is_gitignored(os.path.join(root, name), False, matchers)
+        ]
+
+
+def walk_files(directory):
+    """Walk a directory and yield its files, pruning ignored directories (see walk_project)."""
+    for _, paths in walk_project(directory):
+        yield from paths
+
+
+def iter_project_files(directory, extensions=SOURCE_EXTENSIONS, use_git=True):
+    """
+    Lazily yield the source files of a project directory with one of the given extensions.
+    Inside a Git work tree the file list comes from `git ls-files`, which already honors
+    .gitignore; otherwise the tree is walked with ignored directories pruned.
+    """
+    boundary = os.path.dirname(os.path.abspath(directory))
+    if is_ignored_dir(directory, boundary):
+        return
+
+    names = git_files(directory) if use_git else None
+    if names is None:
+        for path in walk_files(directory):
+            if path.endswith(extensions):
+                yield path
+        return
+
+    for name in names:
+        if name.endswith("/"):
+            # Nested repositories (e.g. apps inside a bench) are listed as a single directory entry
+            nested = os.path.join(directory, name.rstrip("/"))
+            if not is_ignored_dir(nested, boundary):
+                yield from iter_project_files(nested, extensions, use_git)
+            continue
+        if not name.endswith(extensions):
+            continue
+        path = os.path.join(directory, name)
+        if not is_ignored_dir(os.path.dirname(path), boundary) and os.path.isfile(path):
+            yield path
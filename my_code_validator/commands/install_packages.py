@@ -2,6 +2,7 @@ import subprocess
 import sys
 import os
 
+from my_code_validator.validators.toolchain import write_toolchain
 from .dependencies import install_requires, js_dependencies
 
 PRE_COMMIT_HOOK = """#!/bin/bash
@@ -126,12 +127,21 @@ module.exports = [
     else:
         print("✅ eslint.config.cjs already exists.")
 
+def record_toolchain():
+    """Record where each tool is installed, so validators run it without resolving it again."""
+    print("\U0001F504 Recording the toolchain...")
+    path, missing = write_toolchain(os.getcwd(), install_requires, js_dependencies + ["eslint"])
+    for tool in missing:
+        print(f"⚠️ {tool} was not found; it will be looked up on PATH when validating.")
+    print(f"✅ Toolchain manifest written to {path}.")
+
 def install_packages():
     """Install required dependencies and set up pre-commit hook."""
     print("\U0001F504 Checking and installing dependencies...")
     install_pre_commit()
     install_python_dependencies()
     install_js_dependencies()
+    record_toolchain()
     setup_pre_commit_hook()
     print("🚀 All dependencies installed ")
 
@@ -0,0 +1,107 @@
+import json
+import sys
+from my_code_validator.validators.reporters import EXIT_ERROR, EXIT_FAILED, EXIT_PASSED
+from my_code_validator.validators.sharding import write_timings
+
+
+def read_shard(path):
+    """Reads one shard's NDJSON report and returns its records, or None if it cannot be read."""
+    records = []
+    try:
+        with open(path, encoding="utf-8") as report:
+            for line in report:
+                if line.strip():
+                    records.append(json.loads(line))
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: Could not read {path}: {e}", file=sys.stderr)
+        return None
+    return records
+
+
+def check_shards(summaries):
+    """
+    Returns a list of problems with the shard set: missing, duplicated or inconsistent shards,
+    or shards that did not compute the same partition of the files.
+    """
+    shards = [summary.get("shard") for summary in summaries.values() if summary.get("shard")]
+    if not shards:
+        return []
+    counts = {shard.split("/")[1] for shard in shards}
+    if len(counts) > 1:
+        return [f"Reports come from different shard counts: {', '.join(sorted(shards))}"]
+    count = int(counts.pop())
+    indexes = [int(shard.split("/")[0]) for shard in shards]
+    problems = [f"Shard {index}/{count} is missing" for index in range(1, count + 1) if index not in indexes]
+    problems += [f"Shard {index}/{count} was given more than once" for index in sorted(set(indexes)) if indexes.count(index) > 1]
+    partitions = {summary.get("partition") for summary in summaries.values() if summary.get("shard")}
+    if len(partitions) > 1:
+        problems.append(
+            "Shards partitioned the files differently, so files may be missing or validated twice; "
+            "give every shard the same files and --timings file"
+        )
+    if len(shards) != len(summaries):
+        problems.append("Some reports were not produced by a sharded run")
+    return problems
+
+
+def merge_results(paths, output_format="text", timings_output=None):
+    """
+    Combine the NDJSON reports of the shards of a run (`validate --shard I/N --format ndjson`)
+    into one summary and exit status. Reports a missing, duplicated or crashed shard as an error.
+    With "ndjson", every diagnostic and file record is re-emitted followed by one merged summary.
+    `timings_output` receives the per-file runtimes recorded by all shards, to partition the next run.
+    Returns the exit code: 2 on errors, 1 if any file failed validation, otherwise 0.
+    """
+    summaries, files, diagnostics, problems = {}, [], [], []
+    for path in paths:
+        records = read_shard(path)
+        if records is None:
+            problems.append(f"{path} could not be read")
+            continue
+        summary = next((record for record in records if record.get("type") == "summary"), None)
+        if summary is None:
+            problems.append(f"{path} has no summary record, its run did not finish")
+            continue
+        summaries[path] = summary
+        files += [record for record in records if record.get("type") == "file"]
+        diagnostics += [record for record in records if record.get("type") == "diagnostic"]
+    problems += check_shards(summaries)
+
+    merged = {
+        "type": "summary",
+        "files": sum(summary.get("files", 0) for summary in summaries.values()),
+        "failed": sum(summary.get("failed", 0) for summary in summaries.values()),
+        "errors": sum(summary.get("errors", 0) for summary in summaries.values()) + len(problems),
+        "shards": len(summaries),
+    }
+
+    if output_format == "ndjson":
+        for record in diagnostics + files:
+            print(json.dumps(record, ensure_ascii=False))
+        print(json.dumps(merged, ensure_ascii=False))
+        out = sys.stderr
+    else:
+        out = sys.stdout
+        failed_files = [record["file"] for record in files if record.get("status") == "failed"]
+        if failed_files:
+            print("\n❌ Failed files\n" + "-" * 30, file=out)
+            for file_path in failed_files:
+                count = sum(1 for diagnostic in diagnostics if diagnostic.get("file") == file_path)
+                print(f"{file_path} ({count} finding{'s' if count != 1 else ''})", file=out)
+        print("\n📊 Merged Validation Summary\n" + "-" * 30, file=out)
+        for label, key in (("Shards", "shards"), ("Files", "files"), ("Failed", "failed"), ("Errors", "errors")):
+            print(f"{label:<20} {merged[key]}", file=out)
+        print("-" * 30, file=out)
+    for problem in problems:
+        print(f"❌ Error: {problem}", file=out)
+
+    if timings_output:
+        timings = {}
+        for summary in summaries.values():
+            timings.update(summary.get("timings", {}))
+        write_timings(timings_output, timings)
+        print(f"💾 Recorded runtimes of {len(timings)} file(s) written to {timings_output}", file=out)
+
+    if merged["errors"]:
+        return EXIT_ERROR
+    return EXIT_FAILED if merged["failed"] else EXIT_PASSED
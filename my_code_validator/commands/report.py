@@ -0,0 +1,130 @@
+import json
+import os
+import time
+from datetime import datetime
+from my_code_validator.validators.cache import CACHE_DIR_NAME, HISTORY_FILE
+from my_code_validator.validators.history import History
+from my_code_validator.validators.reporters import EXIT_ERROR, EXIT_PASSED
+from .since import GitError, git
+
+HISTORY_DEPTH = 1000  # Ancestors of the base commit searched for a recorded run
+DEFAULT_TREND_DAYS = 30
+DEFAULT_LIMIT = 20
+
+
+def print_rows(rows, output_format, columns, title):
+    """Prints query results as a table of `columns` ((key, heading, width) tuples) or as JSON."""
+    if output_format == "json":
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    print(f"\n{title}\n" + "-" * 78)
+    if not rows:
+        print("Nothing to report.")
+        return
+    print(" ".join(f"{heading:<{width}}" for _, heading, width in columns).rstrip())
+    for row in rows:
+        values = ["-" if row[key] is None else row[key] for key, _, _ in columns]
+        print(" ".join(f"{str(value):<{width}}" for value, (_, _, width) in zip(values, columns)).rstrip())
+
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+def report_top(history, output_format, tool=None, limit=DEFAULT_LIMIT):
+    rows = history.top_offenders(tool, limit)
+    columns = [
+        ("file", "File", 44), ("errors", "Errors", 7), ("findings", "Findings", 9), ("pylint_rating", "Pylint", 7),
+        ("cc_rank", "CC", 3), ("mi_rank", "MI", 3),
+    ]
+    print_rows(rows, output_format, columns, f"🏆 Top offenders{f' ({tool})' if tool else ''}")
+
+
+def report_new(history, output_format, directory, ref):
+    """Reports the findings that appeared since the last recorded run at `ref`'s merge base or one of its ancestors."""
+    try:
+        base = git(directory, "merge-base", ref, "HEAD").strip()
+        ancestors = git(directory, "rev-list", f"--max-count={HISTORY_DEPTH}", base).split()
+    except GitError as e:
+        print(f"❌ Error: Failed to read the history of {ref}: {e}")
+        return EXIT_ERROR
+    base_runs = history.runs_at(ancestors)
+    if not base_runs:
+        print(f"❌ Error: No validation run was recorded at {ref} or one of its last {HISTORY_DEPTH} ancestors.")
+        return EXIT_ERROR
+    rows = history.new_findings(base_runs)
+    columns = [
+        ("file", "File", 36), ("line", "Line", 5), ("tool", "Tool", 9), ("rule", "Rule", 26), ("message", "Message", 0),
+    ]
+    print_rows(rows, output_format, columns, f"🆕 New findings since {ref} ({base[:10]})")
+    return EXIT_PASSED
+
+
+def report_trends(history, output_format, days=DEFAULT_TREND_DAYS, file_pattern=None):
+    since = time.time() - days * 86400
+    changes = history.trends(since, file_pattern)
+    runs = history.run_totals(since)
+    if output_format == "json":
+        print(json.dumps({"files": changes, "runs": runs}, ensure_ascii=False, indent=2))
+        return
+    for change in changes:
+        for value in ("pylint_rating", "cc_rank", "mi_rank"):
+            before, now = change[f"{value}_before"], change[value]
+            change[value] = f"{'-' if before is None else before} → {'-' if now is None else now}"
+    columns = [("file", "File", 44), ("pylint_rating", "Pylint", 14), ("cc_rank", "CC", 7), ("mi_rank", "MI", 7)]
+    print_rows(changes, output_format, columns, f"📈 Changes over the last {days} day(s), largest pylint drop first")
+    for run in runs:
+        run["started"] = format_time(run["started"])
+        run["commit_sha"] = (run["commit_sha"] or "")[:10]
+        run["pylint_rating"] = None if run["pylint_rating"] is None else round(run["pylint_rating"], 2)
+    columns = [
+        ("started", "Run", 17), ("commit_sha", "Commit", 11), ("files", "Files", 6), ("failed", "Failed", 7),
+        ("findings", "Findings", 9), ("pylint_rating", "Avg pylint", 10),
+    ]
+    print_rows(runs, output_format, columns, "🕒 Runs")
+
+
+def report_suppressions(history, output_format):
+    rows = history.suppressions()
+    for row in rows:
+        row["created"] = format_time(row["created"])
+    columns = [
+        ("file", "File", 36), ("tool", "Tool", 9), ("rule", "Rule", 26), ("created", "Since", 17), ("message", "Message", 0),
+    ]
+    print_rows(rows, output_format, columns, "🔕 Suppressed findings")
+
+
+def report(
+    query, directory=".", output_format="text", ref=None, tool=None, limit=DEFAULT_LIMIT, days=DEFAULT_TREND_DAYS,
+    file_pattern=None, files=None, reason=None
+):
+    """
+    Answers a question about past runs from the project's diagnostics history (see history.py),
+    without running any tool. Queries: "top" (files with the most findings), "new" (findings
+    that appeared since `ref`), "trends" (pylint rating and radon rank changes over `days`, and
+    the runs of that period) and "suppressions". "suppress" marks the current findings of `files`
+    (all by default) as known, so validation leaves them out of its reports; "unsuppress" undoes it.
+    Returns the exit code: 2 without a history or when `ref` cannot be used, otherwise 0.
+    """
+    directory = os.path.abspath(directory)
+    if not os.path.isfile(os.path.join(directory, CACHE_DIR_NAME, HISTORY_FILE)):
+        print(f"❌ Error: No diagnostics history in {directory}. Run `frappe-code validate {directory}` first.")
+        return EXIT_ERROR
+    history = History(directory)
+    keys = [history.key(path) for path in files] if files else None
+    try:
+        if query == "top":
+            report_top(history, output_format, tool, limit)
+        elif query == "new":
+            return report_new(history, output_format, directory, ref)
+        elif query == "trends":
+            report_trends(history, output_format, days, file_pattern)
+        elif query == "suppressions":
+            report_suppressions(history, output_format)
+        elif query == "suppress":
+            print(f"🔕 Suppressed {history.suppress(keys, tool, reason)} finding(s).")
+        elif query == "unsuppress":
+            print(f"🔔 Removed {history.unsuppress(keys, tool)} suppression(s).")
+    finally:
+        history.close()
+    return EXIT_PASSED
@@ -0,0 +1,63 @@
+import os
+from my_code_validator.validators import process, profiler
+from my_code_validator.validators.cache import CONFIG_FILES
+
+
+class GitError(Exception):
+    """Raised when the changes since a Git reference cannot be read."""
+
+
+def git(directory, *args):
+    """
+    Run a git command in a directory and return its standard output. Like the tools, it is
+    killed after its process.TOOL_TIMEOUTS entry. Raises GitError if it fails or times out.
+    """
+    result = process.run(["git", "-C", directory, *args])
+    if result.timed_out:
+        raise GitError(f"git {args[0]} timed out after {result.duration:.0f}s")
+    if result.returncode != 0:
+        raise GitError(result.stderr.strip() or f"git {args[0]} exited with status {result.returncode}")
+    return result.stdout
+
+
+def changed_since(directory, ref):
+    """
+    Returns the absolute paths of the files under `directory` that differ from where the
+    current branch left `ref` (their merge base), in commits or in the working tree,
+    including deleted files and untracked files that are not ignored.
+    """
+    directory = os.path.abspath(directory)
+    root = git(directory, "rev-parse", "--show-toplevel").strip()
+    base = git(directory, "merge-base", ref, "HEAD").strip()
+    changed = git(root, "diff", "--name-only", "--no-renames", base).splitlines()
+    changed += git(root, "ls-files", "--others", "--exclude-standard").splitlines()
+    paths = {os.path.join(root, path) for path in changed if path}
+    return sorted(path for path in paths if os.path.commonpath([path, directory]) == directory)
+
+
+def select_since(directory, files, ref):
+    """
+    Returns the `files` (all Python and JS files of the project) to validate for the changes
+    since `ref`: the changed ones and every file that imports them, directly or not, as found in
+    the project's import graph (see import_graph.py), which is brought up to date on the way.
+    All files are selected if a configuration file changed, as it may change any file's results.
+    Returns the selected files and a dict counting the changed (Python and JS), dependent and parsed files.
+    Raises GitError if the changes cannot be read.
+    """
+    # Imported here, so the commands that only run git (validate-staged) do not load the analyzers
+    from my_code_validator.validators.import_graph import ImportGraph
+
+    changed = changed_since(directory, ref)
+    config_dirs = {os.path.abspath(directory), os.getcwd()}
+    if any(os.path.basename(path) in CONFIG_FILES and os.path.dirname(path) in config_dirs for path in changed):
+        return files, {"changed": len(changed), "dependents": 0, "parsed": 0, "config": True}
+
+    with profiler.span("import graph", "phase"):
+        graph = ImportGraph(directory)
+        parsed = graph.update(files)
+        graph.save()
+        # Deleted files are kept: the files still importing them must be validated again
+        changed = {path for path in changed if path.endswith((".py", ".js"))}
+        dependents = graph.dependents(changed)
+    selected = [path for path in files if os.path.abspath(path) in changed or graph.key(path) in dependents]
+    return selected, {"changed": len(changed), "dependents": len(dependents), "parsed": parsed, "config": False}
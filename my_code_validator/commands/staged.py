@@ -0,0 +1,321 @@
+import hashlib
+import os
+import re
+import shutil
+from functools import partial
+from my_code_validator.validators import profiler
+from my_code_validator.validators.cache import CACHE_DIR_NAME, open_cache, package_root
+from my_code_validator.validators.planner import make_plan
+from my_code_validator.validators.reporters import EXIT_ERROR, get_reporter
+from my_code_validator.validators.toolchain import prepare_toolchain
+from .discovery import is_ignored
+from .since import GitError, git
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+PATH_LINE = r"^{path}:(\d+):"
+ESLINT_LINE = re.compile(r"^\s+(\d+):\d+\s+(error|warning)\s")
+ESLINT_TOTAL = re.compile(r"^✖ \d+ problems?")
+BANDIT_LOCATION = re.compile(r"Location: .*:(\d+):\d+")
+BANDIT_BLOCK_END = ("--------", ">> Issue:", "Code scanned:")
+PYLINT_MESSAGE = re.compile(r"^.+?:\d+:\d+: ([A-Z])\d{4}: ", re.MULTILINE)
+PYLINT_RATING = re.compile(r"^Your code has been rated at (-?\d+\.\d+)/10.*$", re.MULTILINE)
+PYLINT_MESSAGE_TYPES = {"C": "convention", "R": "refactor", "W": "warning", "E": "error", "F": "fatal", "I": "info"}
+SNAPSHOT_CHUNK = 200  # Paths per `git checkout-index` call, keeps argv well below the OS limit
+# Git quotes paths with unusual characters C-style: "dir/caf\303\251.py"
+QUOTED_PATH_ESCAPE = re.compile(rb'\\([0-7]{3}|.)')
+PATH_ESCAPES = {b"a": b"\a", b"b": b"\b", b"t": b"\t", b"n": b"\n", b"v": b"\v", b"f": b"\f", b"r": b"\r"}
+
+# Checks whose findings point at individual lines; skipped when only whitespace or comments changed
+LINE_LOCAL_TOOLS = {"pylint", "mypy", "vulture", "bandit", "eslint"}
+COMMENT_PREFIXES = {".py": ("#",), ".js": ("//", "/*", "*", "*/")}
+
+
+def get_staged_files():
+    """Retrieve a list of staged (added, copied, modified or renamed) Python and JS files from Git."""
+    try:
+        files = git(os.getcwd(), "diff", "--name-only", "--cached", "--diff-filter=ACMR").strip().split("\n")
+        return [file for file in files if file.endswith((".py", ".js"))]
+    except GitError:
+        print("❌ Error: Failed to get staged files. Ensure you're inside a Git repository.")
+        return []
+
+
+def unquote_path(path):
+    """Undo Git's quoting of a path in diff output; unquoted paths are returned as they are."""
+    if not (len(path) > 1 and path.startswith('"') and path.endswith('"')):
+        return path
+
+    def unescape(match):
+        escape = match.group(1)
+        return bytes([int(escape, 8)]) if len(escape) == 3 else PATH_ESCAPES.get(escape, escape)
+
+    raw = QUOTED_PATH_ESCAPE.sub(unescape, path[1:-1].encode("utf-8", "surrogateescape"))
+    return raw.decode("utf-8", "surrogateescape")
+
+
+def parse_staged_hunks(diff_text):
+    """
+    Parse `git diff --cached -U0` output into {path: {"ranges": [(start, end)], "changed": [lines]}}.
+    Ranges are 1-based, inclusive line numbers in the staged version of the file.
+    """
+    hunks = {}
+    current = None
+    for line in diff_text.splitlines():
+        if line.startswith("+++ "):
+            path = unquote_path(line[4:])
+            current = hunks.setdefault(path[2:], {"ranges": [], "changed": []}) if path.startswith("b/") else None
+        elif current is None:
+            continue
+        elif line.startswith("@@"):
+            match = HUNK_HEADER.match(line)
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            # A pure deletion touches the line that now sits where the removed lines were
+            current["ranges"].append((max(start, 1), start + max(count, 1) - 1))
+        elif line.startswith(("+", "-")) and not line.startswith(("+++", "---")):
+            current["changed"].append(line[1:])
+    return hunks
+
+
+def is_trivial_change(file_path, changed_lines):
+    """Check if every changed line is blank or a comment (type comments count as code)."""
+    prefixes = COMMENT_PREFIXES.get(os.path.splitext(file_path)[1], ())
+    for line in changed_lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if not stripped.startswith(prefixes) or stripped.startswith("# type:"):
+            return False
+    return True
+
+
+def in_ranges(line_number, ranges):
+    """Check if a line number falls inside one of the changed ranges."""
+    return any(start <= line_number <= end for start, end in ranges)
+
+
+def filter_diagnostics(text, checked_path, display_path, ranges):
+    """
+    Keep only the diagnostics of `text` that point at changed lines, and show the file as
+    `display_path`. Lines that are not diagnostics (headers, ratings, summaries) are kept.
+    With `ranges` set to None, every line is kept and only the path is rewritten.
+    """
+    paths = {checked_path, os.path.relpath(checked_path), os.path.abspath(checked_path), display_path}
+    path_line = re.compile(PATH_LINE.format(path="(?:" + "|".join(map(re.escape, paths)) + ")"))
+    kept = []
+    bandit_block = None
+
+    def keep_bandit_block():
+        location = BANDIT_LOCATION.search("\n".join(bandit_block))
+        if location is None or ranges is None or in_ranges(int(location.group(1)), ranges):
+            kept.extend(bandit_block)
+
+    for line in text.split("\n"):
+        # Bandit reports each issue as a multi-line block, located by its "Location:" line
+        if bandit_block is not None and line.startswith(BANDIT_BLOCK_END):
+            keep_bandit_block()
+            bandit_block = None
+        if line.startswith(">> Issue:"):
+            bandit_block = [line]
+            continue
+        if bandit_block is not None:
+            bandit_block.append(line)
+            continue
+
+        match = path_line.match(line) or ESLINT_LINE.match(line)
+        if match and ranges is not None and not in_ranges(int(match.group(1)), ranges):
+            continue
+        if line.startswith("--------") and kept and kept[-1] == line:
+            continue  # Separator of a dropped Bandit issue
+        kept.append(line)
+    if bandit_block is not None:
+        keep_bandit_block()
+
+    result = "\n".join(kept)
+
+    # Summaries that count findings must match what is left
+    mypy_errors = sum(": error:" in line for line in kept)
+    if not mypy_errors:
+        result = re.sub(r"Found \d+ errors? in \d+ files? \(checked \d+ source files?\)", "Success: no issues found in 1 source file", result)
+    eslint_findings = [ESLINT_LINE.match(line) for line in kept]
+    eslint_findings = [match for match in eslint_findings if match]
+    if any(ESLINT_TOTAL.match(line) for line in kept):
+        errors = sum(match.group(2) == "error" for match in eslint_findings)
+        warnings = len(eslint_findings) - errors
+        total = errors + warnings
+        summary = (
+            f"✖ {total} problem{'s' if total != 1 else ''} "
+            f"({errors} error{'s' if errors != 1 else ''}, {warnings} warning{'s' if warnings != 1 else ''})"
+            if total else "No problems on changed lines."
+        )
+        result = re.sub(r"✖ \d+ problems? \(\d+ errors?, \d+ warnings?\)", summary, result)
+
+    for path in sorted(paths, key=len, reverse=True):
+        result = result.replace(path, display_path)
+    return result
+
+
+def rate_changed_lines(output, checked_path):
+    """
+    Replace pylint's whole-file rating in filtered output with the rating of the messages left on
+    changed lines, computed as pylint does, so the check's status follows the findings it shows.
+    The whole-file rating is kept beside it.
+    """
+    match = PYLINT_RATING.search(output)
+    if match is None:
+        return output
+    # Imported here, like the other validators, so commits without Python files do not load them
+    from my_code_validator.validators.batch_validator import count_statements, pylint_rating
+
+    messages = [{"type": PYLINT_MESSAGE_TYPES.get(kind, "")} for kind in PYLINT_MESSAGE.findall(output)]
+    rating = pylint_rating(messages, count_statements(checked_path))
+    if rating is None:
+        return output
+    line = f"Your code has been rated at {rating:.2f}/10 on the changed lines (whole file: {match.group(1)}/10)"
+    return output[:match.start()] + line + output[match.end():]
+
+
+class StagedBackend:
+    """
+    Wraps a Python backend so tool output only reports findings on the staged lines of one file.
+    The pylint rating is computed from those findings; file-level metrics (radon) are passed through unchanged.
+    """
+    LINE_LOCAL_METHODS = ("pylint", "mypy", "vulture", "bandit")
+
+    def __init__(self, backend, checked_path, display_path, ranges):
+        self.backend = backend
+        self.checked_path = checked_path
+        self.display_path = display_path
+        self.ranges = ranges
+        digest = hashlib.sha256(repr(ranges).encode()).hexdigest()[:12]
+        # The name is part of cache keys, so filtered results are cached per set of changed lines
+        self.name = f"{backend.name}-staged-{digest}"
+
+    def __getattr__(self, tool):
+        run_tool = getattr(self.backend, tool)
+        if not callable(run_tool):
+            return run_tool
+        # File-level tools keep all their output and only get the snapshot path renamed
+        ranges = self.ranges if tool in self.LINE_LOCAL_METHODS else None
+        return lambda file_path: filter_diagnostics(run_tool(file_path), self.checked_path, self.display_path, ranges)
+
+    def pylint(self, file_path):
+        output = filter_diagnostics(self.backend.pylint(file_path), self.checked_path, self.display_path, self.ranges)
+        return rate_changed_lines(output, self.checked_path)
+
+
+def filtered_check(check, checked_path, display_path, ranges):
+    """Run a check and keep only its findings on changed lines."""
+    result = check()
+    return filter_diagnostics(result, checked_path, display_path, ranges) if result else result
+
+
+def snapshot_staged_file(path, snapshot_root, written):
+    """
+    Write the staged (index) content of a file under the snapshot directory and return its path.
+    A Python file is written with every Python file below its package root (see cache.package_root),
+    so its relative and project imports resolve as in the working tree; `written` holds the roots
+    and files already written in this run.
+    """
+    if path.endswith(".py"):
+        root = os.path.relpath(package_root(path))
+        if root in written:
+            return os.path.join(snapshot_root, path)
+        written.add(root)
+        names = [
+            name for name in git(os.getcwd(), "ls-files", "-z", "--", root).split("\0")
+            if name.endswith((".py", ".pyi")) and name not in written
+        ]
+    else:
+        names = [path]
+    for index in range(0, len(names), SNAPSHOT_CHUNK):
+        chunk = names[index:index + SNAPSHOT_CHUNK]
+        git(os.getcwd(), "checkout-index", "--force", f"--prefix={snapshot_root}{os.sep}", "--", *chunk)
+        written.update(chunk)
+    return os.path.join(snapshot_root, path)
+
+
+def validate_staged(jobs=None, use_cache=True, backend="subprocess", output_format="text", fail_fast=False, budget=None):
+    """
+    Validate the staged content of staged Python and JS files, reporting only findings on
+    changed lines. Files whose staged changes are whitespace or comments only skip the
+    line-level checks. Files that also have unstaged edits are validated from a snapshot of
+    the index, taken with their package, so the result matches what is being committed.
+    `fail_fast` and `budget` (seconds) order and cut short each file's checks, see planner.py;
+    the budget bounds the whole hook, including reading the staged changes.
+    Returns the exit code: 2 if the toolchain manifest is stale, 1 if any file failed validation, otherwise 0.
+    """
+    reporter = get_reporter(output_format)
+    plan = make_plan(os.getcwd(), fail_fast, budget)
+    try:
+        with profiler.span("read staged changes", "phase"):
+            root = git(os.getcwd(), "rev-parse", "--show-toplevel").strip()
+            hunks = parse_staged_hunks(git(root, "diff", "--cached", "-U0", "--no-color", "--diff-filter=ACMR"))
+            unstaged = set(git(root, "diff", "--name-only", "-z").split("\0")) - {""}
+    except GitError:
+        reporter.message("❌ Error: Failed to read staged changes. Ensure you're inside a Git repository.")
+        return 1
+
+    files = [path for path in hunks if path.endswith((".py", ".js"))]
+    if not files:
+        reporter.message("✅ No staged Python or JavaScript files to validate.")
+        return reporter.finish()
+    reporter.message(f"📂 Staged files: {', '.join(files)}")
+    if not prepare_toolchain(reporter):
+        return EXIT_ERROR
+
+    # Imported only now, so a commit without Python or JS files does not load the validators
+    from my_code_validator.validators.backends import get_backend
+    from my_code_validator.validators.coverage_data import CoverageIndex
+    from my_code_validator.validators.js_validator import JSValidator
+    from my_code_validator.validators.js_worker import get_js_worker
+    from my_code_validator.validators.python_validator import PythonValidator
+    from my_code_validator.validators.scheduler import Scheduler
+
+    previous_cwd = os.getcwd()
+    os.chdir(root)
+    snapshot_root = os.path.join(CACHE_DIR_NAME, "staged")
+    shutil.rmtree(snapshot_root, ignore_errors=True)
+    cache = open_cache(root, enabled=use_cache)
+    python_backend = get_backend(backend)
+    coverage = CoverageIndex(root, cache)
+    worker = get_js_worker(root) if backend != "subprocess" else None
+    written = set()
+    try:
+        with Scheduler(jobs, plan=plan) as scheduler:
+            reports = []
+            for path in files:
+                if is_ignored(path):
+                    reports.append(partial(reporter.message, f"⚠️ Skipping ignored file: {path}"))
+                    continue
+
+                ranges = hunks[path]["ranges"]
+                checked_path = snapshot_staged_file(path, snapshot_root, written) if path in unstaged else path
+                skip = LINE_LOCAL_TOOLS if is_trivial_change(path, hunks[path]["changed"]) else set()
+                if skip:
+                    reports.append(partial(reporter.message, f"ℹ️ {path}: only whitespace or comments changed, skipping line-level checks."))
+
+                if path.endswith(".py"):
+                    staged_backend = StagedBackend(python_backend, checked_path, path, ranges)
+                    validator = PythonValidator(os.path.dirname(path), cache=cache, backend=staged_backend, coverage=coverage)
+                    # The tests ran the working tree file, so coverage is looked up under its own path
+                    checks = [
+                        (lambda: None) if tool in skip else display_check if tool == "coverage" else check
+                        for (tool, _, _), check, display_check in zip(
+                            validator.CHECKS, validator.checks(checked_path), validator.checks(path)
+                        )
+                    ]
+                else:
+                    validator = JSValidator(os.path.dirname(path), cache=cache, worker=worker)
+                    checks = [
+                        (lambda: None) if tool in skip else partial(filtered_check, check, checked_path, path, ranges)
+                        for (tool, _), check in zip(validator.CHECKS, validator.checks(checked_path))
+                    ]
+                reports.append(scheduler.validate(validator, path, checks, reporter=reporter))
+
+            for report in reports:
+                report()
+        if plan is not None:
+            plan.finish()
+    finally:
+        os.chdir(previous_cwd)
+    return reporter.finish()
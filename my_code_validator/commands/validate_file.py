@@ -1,29 +1,76 @@
 import os
 import sys
+from functools import partial
 from my_code_validator.validators.python_validator import PythonValidator
 from my_code_validator.validators.js_validator import JSValidator
-from .validate_project import is_ignored 
+from my_code_validator.validators.cache import open_cache
+from my_code_validator.validators.coverage_data import CoverageIndex
+from my_code_validator.validators.backends import get_backend
+from my_code_validator.validators.js_worker import get_js_worker
+from my_code_validator.validators.planner import make_plan
+from my_code_validator.validators.reporters import EXIT_ERROR, get_reporter
+from my_code_validator.validators.requirements import DependencyResolver
+from my_code_validator.validators.scheduler import Scheduler
+from my_code_validator.validators.toolchain import prepare_toolchain
+from .discovery import is_ignored
 
-def validate_files(file_paths):
-    """Validate one or more Python or JS files."""
+def validate_files(
+    file_paths, jobs=None, use_cache=True, backend="subprocess", output_format="text", fail_fast=False, budget=None,
+    directory=None, resolver=None, coverage=None, toolchain_versions=None
+):
+    """
+    Validate one or more Python or JS files, running up to `jobs` checks at once.
+    Results for unchanged files are replayed from the result cache of the current
+    directory unless `use_cache` is False. `backend` selects how tools are run: the
+    in-process backend also lints all JS files in one Node worker.
+    Each file is reported as soon as it is done, as text, NDJSON or SARIF (`output_format`).
+    `fail_fast` and `budget` (seconds) order and cut short each file's checks, see planner.py.
+    `directory` selects the project whose result cache and JS worker are used (the current directory by default).
+    A caller validating again and again (see watch.py) passes the DependencyResolver and CoverageIndex to
+    reuse, and the `toolchain_versions` it got from checking the toolchain itself; otherwise each call
+    creates its own and checks the toolchain.
+    Returns the exit code: 2 if the toolchain manifest is stale, 1 if any file failed validation, otherwise 0.
+    """
+    reporter = get_reporter(output_format)
     if not file_paths:
-        print("❌ Error: No files provided for validation.")
+        reporter.message("❌ Error: No files provided for validation.")
         sys.exit(1)
+    if toolchain_versions is None:
+        if not prepare_toolchain(reporter):
+            return EXIT_ERROR
+    elif toolchain_versions:
+        reporter.run_info["toolchain"] = toolchain_versions
 
-    for file_path in file_paths:
-        if not os.path.isfile(file_path):
-            print(f"❌ Error: {file_path} is not a valid file.")
-            continue  
+    directory = directory or os.getcwd()
+    cache = open_cache(directory, enabled=use_cache)
+    resolver = resolver or DependencyResolver(cache)
+    coverage = coverage or CoverageIndex(directory, cache)
+    python_backend = get_backend(backend)
+    worker = None
+    if backend != "subprocess":
+        worker = get_js_worker(directory)
+        worker.prefetch([path for path in file_paths if path.endswith(".js") and os.path.isfile(path)])
 
+    def start(file_path):
+        """Queue a file's checks and return the callable that reports it."""
+        if not os.path.isfile(file_path):
+            return partial(reporter.error, f"❌ Error: {file_path} is not a valid file.")
         if is_ignored(file_path):
-            print(f"⚠️ Skipping ignored file: {file_path}")
-            continue
-
-        file_dir = os.path.dirname(file_path)  
+            return partial(reporter.message, f"⚠️ Skipping ignored file: {file_path}")
 
+        file_dir = os.path.dirname(file_path)
         if file_path.endswith(".py"):
-            PythonValidator(file_dir).validate_code(file_path)
-        elif file_path.endswith(".js"):
-            JSValidator(file_dir).validate_code(file_path)
-        else:
-            print(f"❌ Error: {file_path} - Only .py and .js files are supported.")
+            validator = PythonValidator(file_dir, cache=cache, backend=python_backend, resolver=resolver, coverage=coverage)
+            return scheduler.validate(validator, file_path, reporter=reporter)
+        if file_path.endswith(".js"):
+            return scheduler.validate(JSValidator(file_dir, cache=cache, worker=worker), file_path, reporter=reporter)
+        return partial(reporter.error, f"❌ Error: {file_path} - Only .py and .js files are supported.")
+
+    plan = make_plan(directory, fail_fast, budget)
+    with Scheduler(jobs, plan=plan) as scheduler:
+        # Checks start as soon as a file is queued; reports are printed in the given order
+        scheduler.stream(partial(start, file_path) for file_path in file_paths)
+
+    if plan is not None:
+        plan.finish()
+    return reporter.finish()
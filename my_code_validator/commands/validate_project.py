@@ -1,74 +1,212 @@
 import os
 import sys
+from functools import partial
+from itertools import islice
+from my_code_validator.validators import profiler
+from my_code_validator.validators.backends import get_backend
+from my_code_validator.validators.batch_validator import BatchPythonValidator
 from my_code_validator.validators.python_validator import PythonValidator
+from my_code_validator.validators.cache import open_cache
+from my_code_validator.validators.classify import FileClassifier, security_checks
+from my_code_validator.validators.coverage_data import CoverageIndex
+from my_code_validator.validators.history import HistoryReporter, record_history
 from my_code_validator.validators.js_validator import JSValidator
+from my_code_validator.validators.js_worker import get_js_worker
+from my_code_validator.validators.planner import make_plan
+from my_code_validator.validators.reporters import EXIT_ERROR, get_reporter
+from my_code_validator.validators.requirements import DependencyResolver, report_requirements
+from my_code_validator.validators.scheduler import Scheduler
+from my_code_validator.validators.sharding import FileTimings, shard_files
+from my_code_validator.validators.toolchain import prepare_toolchain
+from .discovery import iter_project_files
+from .since import GitError, select_since
 
-IGNORE_FILES = {"node_modules", ".git", ".venv", ".vscode", "__pycache__"}
-VENV_INDICATORS = {"bin", "Scripts", "pyvenv.cfg"}  # Common venv structure
+def get_files_by_extension(directory):
+    """Finds all .py and .js files in a given directory, skipping ignored and gitignored paths."""
+    python_files = []
+    js_files = []
 
-def is_virtual_env(path):
-    """Check if the given path belongs to a virtual environment folder."""
-    abs_path = os.path.abspath(path)  # Convert to absolute path
-    folder_name = os.path.basename(abs_path)  # Get the folder name
+    for file_path in iter_project_files(directory):
+        (python_files if file_path.endswith(".py") else js_files).append(file_path)
 
-    # Check if the folder name is commonly used for virtual environments
-    if folder_name in {"venv", ".venv", "env", "myenv"}:
-        return True
+    return python_files, js_files
 
-    # Check if it contains virtual environment indicators
-    return any(os.path.exists(os.path.join(abs_path, indicator)) for indicator in VENV_INDICATORS)
+def timed_checks(validator, file_path, timings):
+    """Returns a validator's checks for a file, timed into the per-file runtimes used for sharding."""
+    return [timings.timed(check, file_path) for check in validator.checks(file_path)]
 
-def is_ignored(path):
-    """Check if the given path is inside any ignored directory."""
-    abs_path = os.path.abspath(path)  # Convert to absolute path
-    path_parts = abs_path.split(os.sep)  # Split path into components
+def validate_project(
+    directory, jobs=None, use_cache=True, backend="subprocess", output_format="text", fail_fast=False, budget=None,
+    shard=None, timings=None, bench=False, since=None, file_limits=None, coverage_options=None
+):
+    """
+    Validate all Python and JS files in the given project directory, running up to `jobs` checks at once.
+    Results for unchanged files are replayed from the project's result cache unless `use_cache` is False.
+    With the default subprocess backend Python tools run in batches over many files; the
+    in-process and native backends validate each file through the tools' Python APIs instead, and
+    lints all JS files in one Node worker.
+    Each file is reported as soon as it is done, as text, NDJSON or SARIF (`output_format`).
+    With `fail_fast` or a `budget` in seconds, each file's checks run cheapest first and are
+    cut short as described in planner.py; Python files are then validated one by one, not batched.
+    With `shard` as an (index, count) tuple, only that shard of the files is validated, split by the
+    per-file runtimes recorded in the `timings` file, or by file size alone without one, so that every
+    node computes the same partition. Sharded runs only read that file; their runtimes and the
+    partition's fingerprint go into the report's summary for merge-results.
+    Unsharded runs record runtimes in `timings` (the project cache's timings.json by default).
+    With `since` set to a Git reference, only the files changed since then and the files importing
+    them are validated, see since.py.
+    Minified, generated and oversized files only get the security checks, or are skipped, as set by
+    `file_limits` (keyword arguments of classify.FileClassifier).
+    Each Python file's test coverage is looked up in the project's coverage data file, if there is
+    one; `coverage_options` (keyword arguments of coverage_data.CoverageIndex) set its path and threshold.
+    Every file's results and findings are recorded in the project's diagnostics history, which
+    `frappe-code report` queries; findings suppressed there are left out of the report (see history.py).
+    The imports of all validated Python files are summed up in one requirements report at the end.
+    With `bench`, the directory is a bench and each of its apps is validated on its own, see bench.py.
+    Tools run as recorded in the toolchain manifest; a stale manifest stops the run (see toolchain.py).
+    Returns the exit code: 2 if the toolchain manifest is stale, 1 if any file failed validation, otherwise 0.
+    """
+    reporter = get_reporter(output_format)
+    if not os.path.isdir(directory):
+        reporter.message(f"❌ Error: {directory} is not a valid directory.")
+        sys.exit(1)
+    if not prepare_toolchain(reporter):
+        return EXIT_ERROR
 
-    # Ignore node_modules, .git, etc.
-    if any(ignored in path_parts for ignored in IGNORE_FILES):
-        return True
+    if bench:
+        # Imported here because bench.py builds on validate_directory
+        from .bench import validate_bench
+        return validate_bench(
+            directory, reporter, jobs, use_cache, backend, fail_fast, budget, since, file_limits, coverage_options
+        )
 
-    # Ignore virtual environments
-    if any(is_virtual_env(os.path.join(*path_parts[:i])) for i in range(1, len(path_parts) + 1)):
-        return True
+    validate_directory(
+        directory, reporter, jobs, use_cache, backend, fail_fast, budget, shard, timings, since, file_limits,
+        coverage_options
+    )
+    return reporter.finish()
 
-    return False
+def validate_directory(
+    directory, reporter, jobs=None, use_cache=True, backend="subprocess", fail_fast=False, budget=None,
+    shard=None, timings=None, since=None, file_limits=None, coverage_options=None
+):
+    """
+    Validate the files of one project directory into `reporter`, with the directory's own result
+    cache, recorded runtimes and JS worker. The arguments are described in validate_project.
+    """
+    with profiler.span("discover files", "phase"):
+        python_files, js_files = get_files_by_extension(directory)
 
-def get_files_by_extension(directory):
-    """Recursively finds all .py and .js files in a given directory."""
-    python_files = []
-    js_files = []
-    
-    for root, _, files in os.walk(directory):
-        if is_ignored(root): 
-            continue
-
-        for file in files:
-            file_path = os.path.join(root, file)
-            if is_ignored(file_path):  
-                continue
-            
-            if file.endswith((".py", ".js")):  
-                (python_files if file.endswith(".py") else js_files).append(file_path)
-                
-    return python_files, js_files
+    if since is not None:
+        total = len(python_files) + len(js_files)
+        try:
+            selected, counts = select_since(directory, python_files + js_files, since)
+        except GitError as e:
+            reporter.error(f"❌ Error: Failed to read the changes since {since}: {e}")
+            return
+        selected = set(selected)
+        python_files = [path for path in python_files if path in selected]
+        js_files = [path for path in js_files if path in selected]
+        if counts["config"]:
+            reporter.message(f"🔀 Since {since}: a configuration file changed, validating all {total} file(s).")
+        else:
+            reporter.message(
+                f"🔀 Since {since}: {counts['changed']} changed file(s) and {counts['dependents']} dependent(s), "
+                f"validating {len(selected)} of {total} file(s) (import graph: parsed {counts['parsed']} file(s))."
+            )
+        reporter.run_info["since"] = since
 
-def validate_project(directory):
-    """Validate all Python and JS files in the given project directory."""
-    if not os.path.isdir(directory):
-        print(f"❌ Error: {directory} is not a valid directory.")
-        sys.exit(1)
+    # Each CI node has its own cache, so shards only use runtimes from a timings file they all share
+    file_timings = FileTimings(directory, timings, load=shard is None or timings is not None)
+    if shard is not None:
+        selected, fingerprint = shard_files(python_files + js_files, shard, file_timings)
+        selected = set(selected)
+        total = len(python_files) + len(js_files)
+        python_files = [path for path in python_files if path in selected]
+        js_files = [path for path in js_files if path in selected]
+        balance = "recorded runtimes" if timings is not None else "file size, as no --timings file was given"
+        reporter.message(f"🧩 Shard {shard[0]}/{shard[1]}: validating {len(selected)} of {total} file(s), balanced by {balance}.")
+        reporter.run_info["shard"] = f"{shard[0]}/{shard[1]}"
+        reporter.run_info["partition"] = fingerprint
+
+    classifier = FileClassifier(**(file_limits or {}))
+    with profiler.span("classify files", "phase"):
+        classified = classifier.classify_files(python_files + js_files)
+    if classified:
+        python_files = [path for path in python_files if path not in classified]
+        js_files = [path for path in js_files if path not in classified]
+        handling = "skipped" if classifier.action == "skip" else "security checks only"
+        reporter.message(
+            f"🗜️ {len(classified)} minified, generated or oversized file(s), {handling}:\n"
+            + "\n".join(f"   {kind}: {path} ({reason})" for path, (kind, reason) in classified.items())
+        )
+        reporter.run_info["classified"] = {path: kind for path, (kind, _) in classified.items()}
+    reduced = [] if classifier.action == "skip" else list(classified)
+
+    if not python_files and not any(path.endswith(".py") for path in reduced):
+        reporter.message("✅ No Python files found for validation.")
+    if not js_files and not any(path.endswith(".js") for path in reduced):
+        reporter.message("✅ No JavaScript files found for validation.")
+
+    reporter = record_history(reporter, directory)
+    cache = open_cache(directory, enabled=use_cache)
+    resolver = DependencyResolver(cache)
+    coverage = CoverageIndex(directory, cache, **(coverage_options or {}))
+    plan = make_plan(directory, fail_fast, budget)
+    with Scheduler(jobs, plan=plan) as scheduler:
+        worker = None
+        if backend != "subprocess" and js_files:
+            worker = get_js_worker(directory)
+            scheduler.submit([partial(worker.prefetch, js_files)])
+
+        def start(validator, file_path):
+            return scheduler.validate(validator, file_path, timed_checks(validator, file_path, file_timings), reporter=reporter)
+
+        def start_reduced(file_path):
+            if file_path.endswith(".py"):
+                validator = PythonValidator(
+                    directory, cache=cache, backend=get_backend(backend), resolver=resolver, coverage=coverage
+                )
+            else:
+                validator = js_validator
+            checks = security_checks(validator, timed_checks(validator, file_path, file_timings))
+            return scheduler.validate(validator, file_path, checks, reporter=reporter)
 
-    python_files, js_files = get_files_by_extension(directory)
+        js_validator = JSValidator(directory, cache=cache, worker=worker)
+        # The first window of JS checks starts right away and runs alongside the batched Python tools
+        js_starts = (partial(start, js_validator, file) for file in js_files)
+        js_reports = [start() for start in islice(js_starts, scheduler.jobs * 4)]
 
-    if not python_files:
-        print("✅ No Python files found for validation.")
-    if not js_files:
-        print("✅ No JavaScript files found for validation.")
+        if backend == "subprocess" and plan is None:
+            BatchPythonValidator(
+                directory, scheduler=scheduler, cache=cache, reporter=reporter, timings=file_timings, resolver=resolver,
+                coverage=coverage
+            ).validate_files(python_files)
+        else:
+            python_backend = get_backend(backend)
+            scheduler.stream(
+                partial(
+                    start,
+                    PythonValidator(directory, cache=cache, backend=python_backend, resolver=resolver, coverage=coverage),
+                    file
+                )
+                for file in python_files
+            )
 
-    python_validator = PythonValidator(directory)
-    for file in python_files:
-        python_validator.validate_code(file)
+        for report in js_reports:
+            report()
+        scheduler.stream(js_starts)
+        scheduler.stream(partial(start_reduced, file) for file in reduced)
 
-    js_validator = JSValidator(directory)
-    for file in js_files:
-        js_validator.validate_code(file)
+    report_requirements(reporter, resolver, python_files)
+    if isinstance(reporter, HistoryReporter):
+        reporter.finish_run()
+    if plan is not None:
+        plan.finish()
+    if shard is None:
+        file_timings.save()
+    else:
+        # Shards must all partition from the same runtimes, so they leave the timings file alone;
+        # merge-results combines what every shard recorded into the next one
+        timings_by_file = file_timings.merged()
+        reporter.run_info["timings"] = {key: timings_by_file[key] for key in file_timings.current}
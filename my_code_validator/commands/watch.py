@@ -0,0 +1,305 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from my_code_validator.validators.backends import get_backend
+from my_code_validator.validators.cache import CONFIG_FILES, open_cache
+from my_code_validator.validators.coverage_data import CoverageIndex
+from my_code_validator.validators.requirements import DependencyResolver
+from my_code_validator.validators.toolchain import ToolchainError, check_toolchain
+from .discovery import (
+    IGNORE_FILES, SOURCE_EXTENSIONS, gitignore_matchers, is_gitignored, is_ignored, walk_files, walk_project
+)
+from .validate_file import validate_files
+from .validate_project import get_files_by_extension
+
+DEBOUNCE = 0.2  # Seconds without new events after which a burst of saves is validated
+MAX_DEBOUNCE_DELAY = 2.0  # Longest a steady stream of events can hold back validation
+POLL_INTERVAL = 1.0  # Seconds between scans when inotify is not available
+
+# inotify(7) event flags
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+EVENT_BUFFER_SIZE = 64 * 1024
+
+
+class InotifyWatcher:
+    """
+    Reports paths changed under a project directory with Linux inotify, watching every
+    directory that discovery would walk. Directories created later are watched as they appear.
+    """
+    name = "inotify"
+
+    def __init__(self, directory):
+        """
+        Starts watching the directory tree. Raises OSError when inotify is not available
+        or the tree needs more watches than the system allows.
+        """
+        self.root = os.path.abspath(directory)
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not supported on this system")
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+        self.directories = {}
+        self.watched = set()
+        try:
+            self.add_tree(self.root)
+        except OSError:
+            self.close()
+            raise
+
+    def add_tree(self, directory):
+        """Watches a directory and its subdirectories, skipping the ones discovery ignores."""
+        for root, _ in walk_project(directory):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error in (errno.ENOENT, errno.ENOTDIR):
+                    continue  # Removed before it could be watched
+                raise OSError(error, f"Cannot watch {root}: {os.strerror(error)}")
+            self.directories[wd] = root
+            self.watched.add(root)
+
+    def read_events(self):
+        """Reads the pending events and returns the paths they concern."""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, EVENT_BUFFER_SIZE)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+                offset += EVENT_HEADER.size + length
+
+                if mask & IN_Q_OVERFLOW:
+                    changed.add(self.root)  # Events were lost, so anything may have changed
+                    continue
+                if mask & IN_IGNORED:
+                    self.watched.discard(self.directories.pop(wd, None))
+                    continue
+                directory = self.directories.get(wd)
+                if directory is None:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name)) if name else directory
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and not is_ignored(path):
+                    try:
+                        self.add_tree(path)
+                    except OSError as e:
+                        print(f"⚠️ {e}; changes below {path} are not watched.", file=sys.stderr)
+                changed.add(path)
+
+    def changes(self, timeout):
+        """
+        Waits up to `timeout` seconds (without limit for None) for events and returns the
+        changed paths. A directory stands for everything below it.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        return self.read_events() if ready else set()
+
+    def tracks(self, path):
+        """Checks whether discovery lists a file: it is in a watched directory and not ignored by name or .gitignore."""
+        directory = os.path.dirname(path)
+        if directory not in self.watched or os.path.basename(path) in IGNORE_FILES:
+            return False
+        return not is_gitignored(path, False, gitignore_matchers(directory, self.root))
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """
+    Reports changed paths by comparing the modification time and size of the project's
+    source and configuration files between scans. Used where inotify is not available.
+    """
+    name = "polling"
+
+    def __init__(self, directory, interval=POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        python_files, js_files = get_files_by_extension(self.directory)
+        config_files = [os.path.join(self.directory, name) for name in CONFIG_FILES]
+        snapshot = {}
+        for path in python_files + js_files + config_files:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[os.path.abspath(path)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def changes(self, timeout):
+        """
+        Scans every interval until something changed or `timeout` seconds (without limit
+        for None) passed, and returns the changed paths.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+            snapshot = self.scan()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys() if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def tracks(self, path):
+        """Checks whether discovery listed a file in the last scan."""
+        return path in self.snapshot
+
+    def close(self):
+        pass
+
+
+def make_watcher(directory, poll=False, poll_interval=POLL_INTERVAL):
+    """Returns an inotify watcher for the directory, or a polling one if inotify is unavailable or `poll` is set."""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except OSError as e:
+            print(f"⚠️ inotify is not available ({e}), polling every {poll_interval:g}s instead.", file=sys.stderr)
+    return PollingWatcher(directory, poll_interval)
+
+
+def wait_for_changes(watcher, debounce=DEBOUNCE, max_delay=MAX_DEBOUNCE_DELAY):
+    """
+    Blocks until something changes, then keeps collecting changes until `debounce` seconds pass
+    without any, so a burst of saves (or an editor's write-and-rename) is validated once.
+    A steady stream of changes is cut off after `max_delay` seconds.
+    """
+    changed = set()
+    while not changed:
+        changed = watcher.changes(None)
+    deadline = time.monotonic() + max_delay
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return changed
+        more = watcher.changes(min(debounce, remaining))
+        if not more:
+            return changed
+        changed |= more
+
+
+def everything_changed(changed, directory):
+    """
+    Checks whether a change affects every file: a configuration file, which is part of each result's
+    cache key, or the project directory itself, which stands for events that were lost.
+    """
+    root = os.path.abspath(directory)
+    config_dirs = {root, os.getcwd()}
+    return root in changed or any(
+        os.path.basename(path) in CONFIG_FILES and os.path.dirname(path) in config_dirs for path in changed
+    )
+
+
+def affected_files(changed, directory, watcher):
+    """
+    Returns the project files to validate again after the given (absolute) paths changed.
+    Changed paths are matched against the watcher's tree and the ignore rules of discovery, so
+    only they are looked at; a changed directory affects the files below it. Only a change that
+    affects every file (see everything_changed) runs the discovery of `validate` over the project.
+    """
+    if everything_changed(changed, directory):
+        python_files, js_files = get_files_by_extension(directory)
+        return python_files + js_files
+
+    root = os.path.abspath(directory)
+    files = []
+    for path in sorted(changed):
+        candidates = walk_files(path) if os.path.isdir(path) else [path]
+        files += [
+            os.path.join(directory, os.path.relpath(candidate, root)) for candidate in candidates
+            if candidate.endswith(SOURCE_EXTENSIONS) and os.path.isfile(candidate) and watcher.tracks(candidate)
+        ]
+    return list(dict.fromkeys(files))
+
+
+def toolchain_versions():
+    """
+    Checks the toolchain for the validations of a watch and returns the recorded tool versions,
+    or None when the manifest is stale or unreadable, so that each validation checks it and reports why.
+    """
+    try:
+        toolchain = check_toolchain()
+    except ToolchainError:
+        return None
+    return toolchain.versions() if toolchain is not None else {}
+
+
+def watch(
+    directory, jobs=None, use_cache=True, backend="inprocess", output_format="text",
+    debounce=None, poll=False, poll_interval=None
+):
+    """
+    Watch a project directory and validate the files changed by each burst of saves, until interrupted.
+    The process stays up between saves, so analyzers (with the in-process and native backends),
+    the JS worker and the result cache are warm, and unchanged checks replay from the cache.
+    The dependency resolver and the coverage index are shared by every validation; the coverage data
+    is read again when its file changes. The toolchain is checked once, and again when a configuration
+    file changes or while the manifest is stale.
+    `debounce` and `poll_interval` default to DEBOUNCE and POLL_INTERVAL.
+    Returns the exit code: 0 when stopped, 1 if the directory does not exist.
+    """
+    debounce = DEBOUNCE if debounce is None else debounce
+    poll_interval = POLL_INTERVAL if poll_interval is None else poll_interval
+    out = sys.stdout if output_format == "text" else sys.stderr
+    if not os.path.isdir(directory):
+        print(f"❌ Error: {directory} is not a valid directory.", file=out)
+        return 1
+
+    watcher = make_watcher(directory, poll, poll_interval)
+    get_backend(backend)  # Import the analyzers now rather than on the first save
+    cache = open_cache(directory, enabled=use_cache)
+    resolver = DependencyResolver(cache)
+    coverage = CoverageIndex(directory, cache)
+    versions = toolchain_versions()
+    print(f"👀 Watching {directory} for changes ({watcher.name}). Press Ctrl+C to stop.", file=out)
+    try:
+        while True:
+            changed = wait_for_changes(watcher, debounce)
+            if versions is None or everything_changed(changed, directory):
+                versions = toolchain_versions()
+            if any(os.path.basename(path) == os.path.basename(coverage.data_file) for path in changed):
+                coverage = CoverageIndex(directory, cache)  # The tests ran again
+            files = affected_files(changed, directory, watcher)
+            if not files:
+                continue
+            resolver.forget(files)
+            print(f"\n🔁 Changed: {', '.join(files)}", file=out)
+            start = time.perf_counter()
+            exit_code = validate_files(
+                files, jobs=jobs, use_cache=use_cache, backend=backend, output_format=output_format, directory=directory,
+                resolver=resolver, coverage=coverage, toolchain_versions=versions
+            )
+            status = "✅" if exit_code == 0 else "❌"
+            print(f"{status} Validated {len(files)} file(s) in {time.perf_counter() - start:.2f}s. 👀 Watching for changes...", file=out)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.", file=out)
+    finally:
+        watcher.close()
+    return 0
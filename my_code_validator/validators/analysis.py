@@ -0,0 +1,555 @@
+import ast
+import importlib.util
+import io
+import math
+import os
+import sys
+import threading
+import sysconfig
+import tokenize
+from collections import OrderedDict
+from functools import lru_cache
+from importlib import metadata
+
+ANALYSIS_CACHE_SIZE = 64  # Parsed files kept so the checks of one file share a single parse
+UNUSED_IMPORT_CONFIDENCE = 90
+UNUSED_DEFINITION_CONFIDENCE = 60
+UNREACHABLE_CONFIDENCE = 100
+UNUSED_ARGUMENT_CONFIDENCE = 100
+
+# Document methods Frappe calls by name; they are never referenced from the file itself
+DOCUMENT_HOOKS = frozenset((
+    "autoname", "before_naming", "before_insert", "after_insert", "before_validate", "validate",
+    "before_save", "after_save", "on_update", "on_update_after_submit", "before_submit", "on_submit",
+    "before_cancel", "on_cancel", "on_trash", "after_delete", "before_rename", "after_rename",
+    "on_change", "onload", "before_print", "db_insert", "db_update", "load_from_db",
+    "get_list", "get_count", "get_stats", "get_feed",
+))
+IGNORED_DECORATORS = ("whitelist", "property", "setter", "getter", "deleter", "fixture")
+TERMINATORS = {ast.Return: "return", ast.Raise: "raise", ast.Continue: "continue", ast.Break: "break"}
+
+ANALYZERS = {}
+
+
+def register_analyzer(analyzer):
+    """Registers an Analyzer subclass under its `name`, so SourceAnalysis.get can run it."""
+    ANALYZERS[analyzer.name] = analyzer
+    return analyzer
+
+
+def cc_rank(complexity):
+    """Maps an average cyclomatic complexity to radon's A-F rank."""
+    for limit, rank in ((5, "A"), (10, "B"), (20, "C"), (30, "D"), (40, "E")):
+        if complexity <= limit:
+            return rank
+    return "F"
+
+
+def mi_rank(score):
+    """Maps a maintainability index to radon's A-C rank."""
+    return "A" if score > 19 else "B" if score > 9 else "C"
+
+
+class SourceAnalysis:
+    """
+    One read and one parse of a Python file, shared by every registered analyzer.
+    Analyzer results are computed on first use and kept with the tree, so the complexity,
+    maintainability, dead code and dependency checks of a file never parse it twice.
+    `error` is set instead of `tree` when the file cannot be read or parsed.
+    """
+
+    def __init__(self, file_path, source=None, tree=None, error=None):
+        self.file_path = file_path
+        self.source = source
+        self.tree = tree
+        self.error = error
+        self.results = {}
+        self.lock = threading.RLock()  # Analyzers may use each other's results
+
+    @classmethod
+    def parse(cls, file_path):
+        try:
+            with open(file_path, "rb") as source_file:
+                source = source_file.read().decode("utf-8")
+            return cls(file_path, source, ast.parse(source, filename=file_path))
+        except (OSError, SyntaxError, ValueError) as e:
+            return cls(file_path, error=e)
+
+    def get(self, name):
+        """Returns the result of the named analyzer, running it over the shared tree once."""
+        with self.lock:
+            if name not in self.results:
+                self.results[name] = ANALYZERS[name](self).run()
+            return self.results[name]
+
+
+class Analyzer(ast.NodeVisitor):
+    """
+    Base class of the analysis plugins. Subclasses set `name`, visit `self.analysis.tree`
+    and return their findings from `result()`. Register them with @register_analyzer.
+    """
+    name = None
+
+    def __init__(self, analysis):
+        self.analysis = analysis
+
+    def run(self):
+        self.visit(self.analysis.tree)
+        return self.result()
+
+    def result(self):
+        raise NotImplementedError
+
+
+class Block:
+    """A function, method or class with its cyclomatic complexity, in the shape radon reports it."""
+    __slots__ = ("letter", "lineno", "col_offset", "fullname", "complexity")
+
+    def __init__(self, letter, node, fullname, complexity):
+        self.letter = letter
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
+        self.fullname = fullname
+        self.complexity = complexity
+
+
+def decisions(node):
+    """Counts the decision points of one node, after radon's main cyclomatic complexity rules."""
+    if isinstance(node, (ast.If, ast.IfExp, ast.Assert)):
+        return 1
+    if isinstance(node, (ast.For, ast.AsyncFor, ast.While)):
+        return 1 + bool(node.orelse)
+    if isinstance(node, ast.Try):
+        return len(node.handlers) + bool(node.orelse)
+    if isinstance(node, ast.BoolOp):
+        return len(node.values) - 1
+    if isinstance(node, ast.comprehension):
+        return 1 + len(node.ifs)
+    if sys.version_info >= (3, 10) and isinstance(node, ast.match_case):
+        return 1
+    return 0
+
+
+def subtree_decisions(node, skip_definitions=False):
+    """Sums the decision points below a node, optionally leaving nested functions and classes out."""
+    total = 0
+    for child in ast.iter_child_nodes(node):
+        if skip_definitions and isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        total += decisions(child) + subtree_decisions(child, skip_definitions)
+    return total
+
+
+@register_analyzer
+class ComplexityAnalyzer(Analyzer):
+    """
+    Cyclomatic complexity of every function, method and class. When radon is installed, its
+    visitor walks the shared tree, so the blocks are those of `radon cc`. Without it, closures
+    are neither listed nor counted in the function that defines them and a class ranks by the
+    average of its methods, which approximates radon: some class ranks differ.
+    The result is (blocks sorted from most to least complex, total module complexity).
+    """
+    name = "complexity"
+
+    def run(self):
+        try:
+            # Imported here, so the other analyzers do not need radon
+            from radon.complexity import sorted_results
+            from radon.visitors import ComplexityVisitor
+        except ImportError:
+            return self.native_blocks()
+        visitor = ComplexityVisitor.from_ast(self.analysis.tree)
+        return sorted_results(visitor.blocks), visitor.total_complexity
+
+    def native_blocks(self):
+        """Returns the blocks and total complexity from this module's own rules, when radon is missing."""
+        self.blocks = []
+        module = subtree_decisions(self.analysis.tree, skip_definitions=True)
+        total = module + self.visit_body(self.analysis.tree.body, "")
+        return sorted(self.blocks, key=lambda block: -block.complexity), total
+
+    def visit_body(self, body, prefix, in_class=False):
+        """Adds the blocks defined in a statement list and returns their summed complexity."""
+        total = 0
+        for node in body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                complexity = 1 + subtree_decisions(node, skip_definitions=True)
+                self.blocks.append(Block("M" if in_class else "F", node, prefix + node.name, complexity))
+                total += complexity
+            elif isinstance(node, ast.ClassDef):
+                total += self.visit_class(node, prefix)
+        return total
+
+    def visit_class(self, node, prefix):
+        index = len(self.blocks)
+        methods_total = self.visit_body(node.body, f"{prefix}{node.name}.", in_class=True)
+        methods = [block for block in self.blocks[index:] if block.letter == "M" and block.fullname.count(".") == prefix.count(".") + 1]
+        body = 1 + subtree_decisions(node, skip_definitions=True)
+        complexity = int(sum(block.complexity for block in methods) / len(methods)) + 1 if methods else body
+        self.blocks.insert(index, Block("C", node, prefix + node.name, complexity))
+        return methods_total + body
+
+
+@register_analyzer
+class HalsteadAnalyzer(Analyzer):
+    """
+    Halstead volume of the module: operator and operand counts of every expression.
+    Operands are counted per expression, so the volume is close to radon's but not equal to it.
+    """
+    name = "halstead"
+
+    def __init__(self, analysis):
+        super().__init__(analysis)
+        self.operators, self.operands = set(), set()
+        self.operator_count = self.operand_count = 0
+
+    def count(self, operators, operands):
+        self.operators.update(type(operator).__name__ for operator in operators)
+        self.operator_count += len(operators)
+        self.operands.update(ast.dump(operand) for operand in operands)
+        self.operand_count += len(operands)
+
+    def visit_BinOp(self, node):
+        self.count([node.op], [node.left, node.right])
+        self.generic_visit(node)
+
+    def visit_UnaryOp(self, node):
+        self.count([node.op], [node.operand])
+        self.generic_visit(node)
+
+    def visit_BoolOp(self, node):
+        self.count([node.op] * (len(node.values) - 1), node.values)
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node):
+        self.count([node.op], [node.target, node.value])
+        self.generic_visit(node)
+
+    def visit_Compare(self, node):
+        self.count(node.ops, [node.left] + node.comparators)
+        self.generic_visit(node)
+
+    def result(self):
+        vocabulary = len(self.operators) + len(self.operands)
+        return (self.operator_count + self.operand_count) * math.log2(vocabulary) if vocabulary else 0.0
+
+
+@register_analyzer
+class MaintainabilityAnalyzer(Analyzer):
+    """
+    Maintainability index with radon's formula, multi-line strings counted as comments:
+    Halstead volume, total complexity, logical lines and the share of comment lines.
+    When radon is installed, its visitors compute these inputs from the shared tree, so the
+    score and rank are those of `radon mi`; without it, they come from the approximations
+    above and the rank can differ.
+    The result is (score, rank).
+    """
+    name = "maintainability"
+
+    def run(self):
+        try:
+            # Imported here, so the other analyzers do not need radon
+            from radon.metrics import h_visit_ast
+            from radon.raw import analyze as raw_analyze
+        except ImportError:
+            volume, complexity, logical_lines, comments = self.native_parameters()
+        else:
+            tree = self.analysis.tree
+            raw = raw_analyze(self.analysis.source)
+            volume = h_visit_ast(tree).total.volume
+            _, complexity = self.analysis.get("complexity")
+            logical_lines = raw.lloc
+            comments = (raw.comments + raw.multi) / raw.sloc * 100 if raw.sloc else 0
+
+        if volume <= 0 or logical_lines <= 0:
+            score = 100.0
+        else:
+            raw_score = 171 - 5.2 * math.log(volume) - 0.23 * complexity - 16.2 * math.log(logical_lines)
+            raw_score += 50 * math.sin(math.sqrt(2.46 * math.radians(comments)))
+            score = min(max(0.0, raw_score * 100 / 171), 100.0)
+        return score, mi_rank(score)
+
+    def native_parameters(self):
+        """Returns the index inputs from this module's own analyzers, when radon is missing."""
+        tree, source = self.analysis.tree, self.analysis.source
+        volume = self.analysis.get("halstead")
+        _, complexity = self.analysis.get("complexity")
+        logical_lines = sum(isinstance(node, ast.stmt) for node in ast.walk(tree))
+
+        # Like radon: multi-line strings count as comments, single-line docstrings do not,
+        # and source lines exclude blank lines, comment-only lines and docstrings
+        comment_lines, single_lines, multi_lines = set(), set(), set()
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(source).readline):
+                if token.type == tokenize.COMMENT:
+                    comment_lines.add(token.start[0])
+                    if not token.line[:token.start[1]].strip():
+                        single_lines.add(token.start[0])
+        except (tokenize.TokenError, SyntaxError):
+            pass
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                lines = range(node.lineno, node.end_lineno + 1)
+                (multi_lines if len(lines) > 1 else single_lines).update(lines)
+        blank = sum(1 for line in source.splitlines() if not line.strip())
+        source_lines = len(source.splitlines()) - blank - len(single_lines | multi_lines)
+        comments = (len(comment_lines) + len(multi_lines)) / source_lines * 100 if source_lines > 0 else 0
+        return volume, complexity, logical_lines, comments
+
+
+@register_analyzer
+class DeadCodeAnalyzer(Analyzer):
+    """
+    Unused imports, functions, classes, methods and variables, and unreachable statements.
+    Like vulture, a definition counts as used when its name is read anywhere in the file.
+    Attributes are left out: on Frappe documents they are fields the framework reads.
+    The rules are simpler than vulture's, so the findings are close to its own but can differ.
+    Frappe document hooks, whitelisted functions and dunder names are never reported.
+    The result is a list of (line, message, confidence) sorted by line.
+    """
+    name = "dead_code"
+
+    def __init__(self, analysis):
+        super().__init__(analysis)
+        self.defined = []  # (name, line, kind, confidence)
+        self.used = set()
+        self.unreachable = []
+        self.class_depth = 0
+
+    def define(self, name, node, kind, confidence=UNUSED_DEFINITION_CONFIDENCE):
+        if name != "_" and not (name.startswith("__") and name.endswith("__")):
+            # Decorated definitions are reported at their first decorator, as vulture does
+            line = min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+            self.defined.append((name, line, kind, confidence))
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.define(alias.asname or alias.name.split(".")[0], node, "import", UNUSED_IMPORT_CONFIDENCE)
+
+    def visit_ImportFrom(self, node):
+        if node.module == "__future__":
+            return
+        for alias in node.names:
+            if alias.name != "*":
+                self.define(alias.asname or alias.name, node, "import", UNUSED_IMPORT_CONFIDENCE)
+
+    def visit_FunctionDef(self, node):
+        decorators = [ast.dump(decorator) for decorator in node.decorator_list]
+        ignored = any(name in decorator for decorator in decorators for name in IGNORED_DECORATORS)
+        if not ignored and not (self.class_depth and node.name in DOCUMENT_HOOKS):
+            self.define(node.name, node, "method" if self.class_depth else "function")
+        for arg in node.args.posonlyargs + node.args.args + node.args.kwonlyargs + [node.args.vararg, node.args.kwarg]:
+            if arg is not None and arg.arg not in ("self", "cls") and not ignored:
+                self.define(arg.arg, arg, "variable", UNUSED_ARGUMENT_CONFIDENCE)
+        depth, self.class_depth = self.class_depth, 0
+        self.generic_visit(node)
+        self.class_depth = depth
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.define(node.name, node, "class")
+        self.class_depth += 1
+        self.generic_visit(node)
+        self.class_depth -= 1
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Store):
+            self.define(node.id, node, "variable")
+        else:
+            self.used.add(node.id)
+
+    def visit_AugAssign(self, node):
+        # `total += 1` reads the name as well as writing it
+        if isinstance(node.target, ast.Name):
+            self.used.add(node.target.id)
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        self.used.add(node.attr)
+        self.generic_visit(node)
+
+    def visit_Assign(self, node):
+        if any(isinstance(target, ast.Name) and target.id == "__all__" for target in node.targets):
+            self.used.update(
+                element.value for element in ast.walk(node.value)
+                if isinstance(element, ast.Constant) and isinstance(element.value, str)
+            )
+        self.generic_visit(node)
+
+    def generic_visit(self, node):
+        for field in ("body", "orelse", "finalbody"):
+            self.check_reachable(getattr(node, field, None))
+        super().generic_visit(node)
+
+    def check_reachable(self, statements):
+        if not isinstance(statements, list):
+            return
+        for statement, following in zip(statements, statements[1:]):
+            if type(statement) in TERMINATORS:
+                self.unreachable.append((following.lineno, f"unreachable code after '{TERMINATORS[type(statement)]}'", UNREACHABLE_CONFIDENCE))
+                return
+
+    def result(self):
+        # Imports in a package's __init__.py are re-exports
+        is_package = os.path.basename(self.analysis.file_path) == "__init__.py"
+        unused = [
+            (line, f"unused {kind} '{name}'", confidence)
+            for name, line, kind, confidence in self.defined
+            if name not in self.used and not (is_package and kind == "import")
+        ]
+        return sorted(dict.fromkeys(unused + self.unreachable), key=lambda finding: finding[0])
+
+
+@register_analyzer
+class ImportsAnalyzer(Analyzer):
+    """
+    Absolute imports of the file, including those inside functions and try blocks.
+    The result maps each top-level module name to the first line importing it.
+    """
+    name = "imports"
+
+    def __init__(self, analysis):
+        super().__init__(analysis)
+        self.modules = {}
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.modules.setdefault(alias.name.split(".")[0], node.lineno)
+
+    def visit_ImportFrom(self, node):
+        if node.level == 0 and node.module and node.module != "__future__":
+            self.modules.setdefault(node.module.split(".")[0], node.lineno)
+
+    def result(self):
+        return dict(sorted(self.modules.items()))
+
+
+@register_analyzer
+class ModuleImportsAnalyzer(Analyzer):
+    """
+    Every module the file imports, by full dotted name, for the import graph (see import_graph.py).
+    `from a.b import c` is recorded as "a.b.c", since c may be a submodule. Relative imports keep
+    their leading dots; they are resolved against the file's package when the graph is queried.
+    """
+    name = "module_imports"
+
+    def __init__(self, analysis):
+        super().__init__(analysis)
+        self.modules = set()
+
+    def visit_Import(self, node):
+        self.modules.update(alias.name for alias in node.names)
+
+    def visit_ImportFrom(self, node):
+        base = "." * node.level + (node.module or "")
+        if base == "__future__":
+            return
+        for alias in node.names:
+            if alias.name == "*":
+                self.modules.add(base)
+            else:
+                self.modules.add(f"{base}.{alias.name}" if node.module else base + alias.name)
+
+    def result(self):
+        return sorted(self.modules)
+
+
+@lru_cache(maxsize=None)
+def installed_distributions():
+    """Maps top-level module names to the installed distributions providing them."""
+    if hasattr(metadata, "packages_distributions"):
+        return {name: tuple(dict.fromkeys(dists)) for name, dists in metadata.packages_distributions().items()}
+    modules = {}
+    for distribution in metadata.distributions():
+        for name in (distribution.read_text("top_level.txt") or "").split():
+            modules.setdefault(name, ())
+            modules[name] += (distribution.metadata["Name"],)
+    return modules
+
+
+@lru_cache(maxsize=None)
+def is_standard_library(module):
+    """Checks whether a top-level module name belongs to the standard library."""
+    if hasattr(sys, "stdlib_module_names"):
+        return module in sys.stdlib_module_names
+    if module in sys.builtin_module_names:
+        return True
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        return False
+    origin = spec.origin if spec and spec.origin else ""
+    return origin.startswith(sysconfig.get_paths()["stdlib"]) and "site-packages" not in origin
+
+
+def import_roots(file_path):
+    """Returns the directories a file's absolute imports can resolve to local code from."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    roots = [directory]
+    # The directory above the outermost package holding the file is its import root
+    while os.path.exists(os.path.join(directory, "__init__.py")):
+        directory = os.path.dirname(directory)
+        roots.append(directory)
+    roots.append(os.getcwd())
+    return roots
+
+
+def local_module_files(file_path, specifier):
+    """
+    Returns the project files a Python import of a file loads, for an import as the module_imports
+    analyzer records it: the __init__.py of each package on the way and the module itself.
+    Modules that are not found from the file's import roots (installed packages) resolve to nothing.
+    """
+    if specifier.startswith("."):
+        level = len(specifier) - len(specifier.lstrip("."))
+        base = os.path.dirname(os.path.abspath(file_path))
+        for _ in range(level - 1):
+            base = os.path.dirname(base)
+        bases, parts = [base], [part for part in specifier[level:].split(".") if part]
+    else:
+        bases, parts = import_roots(file_path), specifier.split(".")
+
+    for base in bases:
+        files = []
+        for end in range(1, len(parts) + 1):
+            path = os.path.join(base, *parts[:end])
+            if os.path.isfile(path + ".py"):
+                files.append(path + ".py")
+                break
+            if not os.path.isfile(os.path.join(path, "__init__.py")):
+                break
+            files.append(os.path.join(path, "__init__.py"))
+        if files:
+            return files
+    # `from . import name` where the name is defined in the package itself
+    package = os.path.join(bases[0], "__init__.py")
+    return [package] if specifier.startswith(".") and os.path.isfile(package) else []
+
+
+ANALYSES = OrderedDict()
+ANALYSES_LOCK = threading.Lock()
+
+
+def analyze(file_path):
+    """
+    Returns the SourceAnalysis of a file, parsing it only if it changed since the last call.
+    The most recently used analyses are kept, so all checks of a file share one parse.
+    """
+    try:
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return SourceAnalysis.parse(file_path)
+
+    with ANALYSES_LOCK:
+        analysis = ANALYSES.get(key)
+        if analysis is not None:
+            ANALYSES.move_to_end(key)
+            return analysis
+    analysis = SourceAnalysis.parse(file_path)
+    with ANALYSES_LOCK:
+        ANALYSES[key] = analysis
+        while len(ANALYSES) > ANALYSIS_CACHE_SIZE:
+            ANALYSES.popitem(last=False)
+    return analysis
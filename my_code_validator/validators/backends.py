@@ -0,0 +1,258 @@
+import importlib
+import io
+import os
+import sys
+import threading
+from contextlib import redirect_stderr
+from . import analysis
+from .cache import mypy_cache_args
+from .toolchain import tool_command
+from .utils import run_command
+
+# sys.stdout and sys.stderr are swapped for the whole process, by our redirects and by the tools
+# themselves (astroid while pylint runs, dmypy), so every tool that swaps or writes them holds this
+# one lock: streams swapped by two threads in turn leave a discarded buffer in place, and bandit's
+# report compares its output file with sys.stdout
+STREAMS_LOCK = threading.Lock()
+
+
+class OutputCapture(io.StringIO):
+    """A text buffer for tool reporters that write to a named file and close it afterwards."""
+    name = "<capture>"
+
+    def close(self):
+        pass
+
+
+class SubprocessBackend:
+    """
+    Runs each analysis tool as a separate command, exactly as it would be run from a shell.
+    Every method returns the tool's combined text output (see process.ProcessResult.output).
+    """
+    name = "subprocess"
+
+    def pylint(self, file_path):
+        return run_command(tool_command("pylint", file_path)).output
+
+    def mypy(self, file_path):
+        return run_command(tool_command("mypy", *mypy_cache_args(file_path), file_path)).output
+
+    def vulture(self, file_path):
+        return run_command(tool_command("vulture", file_path)).output
+
+    def radon_cc(self, file_path):
+        return run_command(tool_command("radon", "cc", file_path, "-a")).output
+
+    def radon_mi(self, file_path):
+        return run_command(tool_command("radon", "mi", file_path)).output
+
+    def bandit(self, file_path):
+        return run_command(tool_command("bandit", "-r", file_path)).output
+
+
+class InProcessBackend(SubprocessBackend):
+    """
+    Drives pylint, mypy, vulture, radon and bandit through their Python APIs inside the
+    current process, so each tool is imported once instead of once per check.
+    Output mirrors the command-line tools so the validators parse it the same way.
+    Tools that cannot be imported fall back to running as a subprocess.
+    """
+    name = "inprocess"
+
+    MODULES = {
+        "pylint": ("pylint.lint", "pylint.reporters.text", "astroid"),
+        "mypy": ("mypy.api",),
+        "vulture": ("vulture",),
+        "radon": ("radon.complexity", "radon.metrics"),
+        "bandit": ("bandit.core.config", "bandit.core.manager", "bandit.core.constants"),
+    }
+
+    def __init__(self, mypy_daemon=False):
+        """
+        Imports every available analyzer up front. Most analyzers keep global state,
+        so each one gets a lock and runs one file at a time.
+        With `mypy_daemon`, mypy runs through dmypy so its incremental state stays in memory.
+        """
+        self.mypy_daemon = mypy_daemon
+        self.modules = {}
+        self.locks = {}
+        for tool, module_names in self.MODULES.items():
+            try:
+                self.modules[tool] = [importlib.import_module(name) for name in module_names]
+            except ImportError:
+                print(f"⚠️ {tool} could not be imported, it will run as a subprocess.", file=sys.stderr)
+                continue
+            self.locks[tool] = threading.Lock()
+
+    def pylint(self, file_path):
+        if "pylint" not in self.modules:
+            return super().pylint(file_path)
+
+        lint, text_reporter, astroid = self.modules["pylint"]
+        output = io.StringIO()
+        with self.locks["pylint"], STREAMS_LOCK:
+            # Project modules may have changed since the last run; library modules are kept warm
+            for name, module in list(astroid.MANAGER.astroid_cache.items()):
+                if module.file and not is_library_path(module.file):
+                    del astroid.MANAGER.astroid_cache[name]
+            try:
+                lint.Run([file_path], reporter=text_reporter.TextReporter(output), exit=False)
+            except Exception as e:  # pylint reports crashes in its own output, this catches the rest
+                output.write(str(e))
+        return output.getvalue().strip() + "\n"
+
+    def mypy(self, file_path):
+        if "mypy" not in self.modules:
+            return super().mypy(file_path)
+
+        (api,) = self.modules["mypy"]
+        with self.locks["mypy"]:
+            if self.mypy_daemon:
+                with STREAMS_LOCK:  # run_dmypy captures its output by swapping sys.stdout and sys.stderr
+                    stdout, stderr, status = api.run_dmypy(["run", "--", file_path])
+                if status in (0, 1):
+                    return stdout.strip() + "\n" + stderr.strip()
+            stdout, stderr, _ = api.run([*mypy_cache_args(file_path), file_path])
+        return stdout.strip() + "\n" + stderr.strip()
+
+    def close(self):
+        """
+        Stops the mypy daemon if this backend started one.
+        """
+        if self.mypy_daemon and "mypy" in self.modules:
+            (api,) = self.modules["mypy"]
+            with STREAMS_LOCK:
+                api.run_dmypy(["stop"])
+
+    def vulture(self, file_path):
+        if "vulture" not in self.modules:
+            return super().vulture(file_path)
+
+        (vulture,) = self.modules["vulture"]
+        with self.locks["vulture"]:
+            scavenger = vulture.Vulture()
+            errors = io.StringIO()
+            with STREAMS_LOCK, redirect_stderr(errors):
+                scavenger.scavenge([file_path])
+            lines = [item.get_report() for item in scavenger.get_unused_code()]
+        return "\n".join(lines) + "\n" + errors.getvalue().strip()
+
+    def radon_cc(self, file_path):
+        if "radon" not in self.modules:
+            return super().radon_cc(file_path)
+
+        complexity, _ = self.modules["radon"]
+        try:
+            with open(file_path, encoding="utf-8") as source:
+                blocks = complexity.sorted_results(complexity.cc_visit(source.read()))
+        except (OSError, SyntaxError, ValueError) as e:
+            return f"{file_path}\n    ERROR: {e}\n"
+        if not blocks:
+            return "\n"
+
+        lines = [file_path] + [
+            f"    {block.letter} {block.lineno}:{block.col_offset} {block.fullname} - "
+            f"{complexity.cc_rank(block.complexity)}"
+            for block in blocks
+        ]
+        average = sum(block.complexity for block in blocks) / len(blocks)
+        lines.append(f"\n{len(blocks)} blocks (classes, functions, methods) analyzed.")
+        lines.append(f"Average complexity: {complexity.cc_rank(average)} ({average})")
+        return "\n".join(lines) + "\n"
+
+    def radon_mi(self, file_path):
+        if "radon" not in self.modules:
+            return super().radon_mi(file_path)
+
+        _, metrics = self.modules["radon"]
+        try:
+            with open(file_path, encoding="utf-8") as source:
+                score = metrics.mi_visit(source.read(), True)
+        except (OSError, SyntaxError, ValueError) as e:
+            return f"{file_path} - ERROR: {e}\n"
+        return f"{file_path} - {metrics.mi_rank(score)}\n"
+
+    def bandit(self, file_path):
+        if "bandit" not in self.modules:
+            return super().bandit(file_path)
+
+        config, manager, constants = self.modules["bandit"]
+        output = OutputCapture()
+        with self.locks["bandit"], STREAMS_LOCK, redirect_stderr(io.StringIO()):
+            bandit_manager = manager.BanditManager(config.BanditConfig(), "file", quiet=True)
+            bandit_manager.discover_files([file_path], True)
+            bandit_manager.run_tests()
+            bandit_manager.output_results(3, constants.RANKING[0], constants.RANKING[0], output, "txt")
+        return output.getvalue().strip() + "\n"
+
+
+class NativeBackend(InProcessBackend):
+    """
+    Computes complexity, maintainability and dead code from a single parse of each file
+    (see analysis.py), instead of running radon twice and vulture.
+    Output mirrors those tools, so the validators parse it the same way. Radon's visitors walk
+    the shared tree, so the ranks are radon's own (approximated only if radon is missing);
+    dead code findings approximate vulture's and can differ on real code.
+    Pylint, mypy and bandit run in-process as with InProcessBackend.
+    """
+    name = "native"
+
+    MODULES = {tool: modules for tool, modules in InProcessBackend.MODULES.items() if tool in ("pylint", "mypy", "bandit")}
+
+    def vulture(self, file_path):
+        source = analysis.analyze(file_path)
+        if source.error is not None:
+            return f"{file_path}:{getattr(source.error, 'lineno', None) or 0}: {source.error}\n"
+        return "\n".join(
+            f"{file_path}:{line}: {message} ({confidence}% confidence)"
+            for line, message, confidence in source.get("dead_code")
+        ) + "\n"
+
+    def radon_cc(self, file_path):
+        source = analysis.analyze(file_path)
+        if source.error is not None:
+            return f"{file_path}\n    ERROR: {source.error}\n"
+        blocks, _ = source.get("complexity")
+        if not blocks:
+            return "\n"
+
+        lines = [file_path] + [
+            f"    {block.letter} {block.lineno}:{block.col_offset} {block.fullname} - {analysis.cc_rank(block.complexity)}"
+            for block in blocks
+        ]
+        average = sum(block.complexity for block in blocks) / len(blocks)
+        lines.append(f"\n{len(blocks)} blocks (classes, functions, methods) analyzed.")
+        lines.append(f"Average complexity: {analysis.cc_rank(average)} ({average})")
+        return "\n".join(lines) + "\n"
+
+    def radon_mi(self, file_path):
+        source = analysis.analyze(file_path)
+        if source.error is not None:
+            return f"{file_path} - ERROR: {source.error}\n"
+        _, rank = source.get("maintainability")
+        return f"{file_path} - {rank}\n"
+
+
+def is_library_path(path):
+    """Checks whether a module path belongs to the standard library or installed packages."""
+    path = os.path.abspath(path)
+    prefixes = {os.path.abspath(prefix) for prefix in (sys.prefix, sys.base_prefix, sys.exec_prefix)}
+    return any(path.startswith(prefix + os.sep) for prefix in prefixes) or "site-packages" in path
+
+
+BACKENDS = {
+    SubprocessBackend.name: SubprocessBackend,
+    InProcessBackend.name: InProcessBackend,
+    NativeBackend.name: NativeBackend,
+}
+BACKEND_INSTANCES = {}
+
+
+def get_backend(name):
+    """
+    Returns the backend instance for a name ("subprocess", "inprocess" or "native").
+    Instances are shared for the life of the process, so analyzers stay loaded.
+    """
+    if name not in BACKEND_INSTANCES:
+        BACKEND_INSTANCES[name] = BACKENDS[name]()
+    return BACKEND_INSTANCES[name]
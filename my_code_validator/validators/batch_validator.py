@@ -0,0 +1,429 @@
+import ast
+import json
+import math
+import os
+import re
+import time
+from functools import partial
+from . import profiler
+from .analysis import cc_rank
+from .cache import config_fingerprint, mypy_cache_args, package_root
+from .coverage_data import CoverageIndex
+from .python_validator import PythonValidator
+from .reporters import TextReporter
+from .toolchain import tool_command
+from .scheduler import Scheduler
+from .requirements import DependencyResolver
+from .process import run
+
+CHUNK_SIZE = 200  # Files per tool invocation, keeps argv well below the OS limit
+MYPY_CHUNK_SIZE = 2000  # Files per mypy invocation within one package root; chunks share the warm cache
+MIN_CHUNK_SIZE = 25  # Below this, extra interpreter start-ups cost more than the parallelism gains
+PYLINT_MESSAGE_WEIGHTS = {"error": 5, "fatal": 5, "warning": 1, "refactor": 1, "convention": 1}
+MYPY_LINE = re.compile(r"^(?P<path>[^:\n]+\.py):(?P<line>\d+):(?:\d+:)? (?P<kind>error|note|warning): ")
+VULTURE_LINE = re.compile(r"^(?P<path>[^:\n]+\.py):(?P<line>\d+): ")
+# pylint messages that compare the files of one run with each other, which a run on one file never reports
+PYLINT_CROSS_FILE_MESSAGES = ("duplicate-code", "cyclic-import")
+
+
+def normalize_path(path):
+    """Returns the key used to match tool output back to the requested files."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def chunked(items, size):
+    """Splits a list into consecutive chunks of at most `size` items."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def group_by_package_root(file_paths):
+    """Groups files by the directory their module names are resolved from, keeping their order."""
+    groups = {}
+    for file_path in file_paths:
+        groups.setdefault(package_root(file_path), []).append(file_path)
+    return list(groups.values())
+
+
+def count_statements(file_path):
+    """
+    Counts the statements in a Python file, as pylint does when computing its rating: astroid
+    keeps docstrings out of the statements and counts each except clause as one.
+    """
+    try:
+        with open(file_path, encoding="utf-8") as source:
+            tree = ast.parse(source.read(), filename=file_path)
+    except (OSError, SyntaxError, ValueError):
+        return 0
+    statements = 0
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and is_docstring(node):
+            statements -= 1
+        statements += isinstance(node, (ast.stmt, ast.ExceptHandler))
+    return statements
+
+
+def is_docstring(node):
+    """Checks whether a module, class or function body starts with a docstring."""
+    first = node.body[0] if node.body else None
+    return isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) and isinstance(first.value.value, str)
+
+
+def pylint_rating(messages, statements):
+    """
+    Computes the pylint score from a file's messages using pylint's default evaluation.
+    Like pylint, files without statements get no rating (None).
+    """
+    if not statements:
+        return None
+    if any(message["type"] == "fatal" for message in messages):
+        return 0.0
+    weighted = sum(PYLINT_MESSAGE_WEIGHTS.get(message["type"], 0) for message in messages)
+    return round(max(0.0, 10.0 - (weighted / statements) * 10), 2)
+
+
+def load_json(output):
+    """Parses a tool's JSON output, returning None when it is not valid JSON."""
+    try:
+        return json.loads(output)
+    except ValueError:
+        return None
+
+
+def print_file_header(file_path):
+    """Prints the line shown before each file's results in a batched run."""
+    print(f"Validating: {file_path}\n{'-'*50}")
+
+
+class BatchPythonValidator:
+    """
+    Validates many Python files at once by running each tool a single time per
+    chunk of files, using the tools' machine-readable output, and then splitting
+    the results back into one PythonValidator summary per file.
+    """
+    TOOLS = ("pylint", "mypy", "vulture", "radon", "bandit")
+    # Tools run once over all files of a package root, rather than per chunk of the current window
+    PROJECT_TOOLS = ("mypy",)
+
+    def __init__(
+        self, directory, chunk_size=CHUNK_SIZE, scheduler=None, cache=None, reporter=None, timings=None, resolver=None,
+        coverage=None
+    ):
+        """
+        Initializes the batch validator for a project directory.
+        Tool runs are spread over the scheduler's workers when one is given, and
+        files with a cached result for a tool are left out of that tool's runs.
+        Reports go through `reporter` (see reporters.py), the text reporter by default.
+        With FileTimings (see sharding.py), each run's duration is split over the files of its chunk.
+        Imports are resolved by `resolver` and test coverage looked up in `coverage`, both shared
+        with the rest of the run (see requirements.py and coverage_data.py).
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.scheduler = scheduler or Scheduler(jobs=1)
+        self.cache = cache
+        self.reporter = reporter or TextReporter()
+        self.timings = timings
+        self.resolver = resolver or DependencyResolver(cache)
+        self.coverage = coverage or CoverageIndex(directory, cache)
+
+    def run_pylint(self, chunk):
+        """
+        Runs pylint with JSON output on a chunk and returns per-file report text and rating.
+        Messages only a run over several files reports are disabled, so results match per-file runs.
+        """
+        results = {}
+        disabled = ",".join(PYLINT_CROSS_FILE_MESSAGES)
+        result = run(tool_command("pylint", "--output-format=json", f"--disable={disabled}", *chunk))
+        messages = load_json(result.stdout)
+        if not isinstance(messages, list):
+            for file_path in chunk:
+                results[normalize_path(file_path)] = (result.output.strip(), 0)
+            return results
+
+        by_file = {}
+        for message in messages:
+            by_file.setdefault(normalize_path(message["path"]), []).append(message)
+
+        for file_path in chunk:
+            file_messages = by_file.get(normalize_path(file_path), [])
+            rating = pylint_rating(file_messages, count_statements(file_path))
+            lines = [
+                f"{file_path}:{m['line']}:{m['column']}: {m['message-id']}: {m['message']} ({m['symbol']})"
+                for m in file_messages
+            ]
+            if rating is not None:
+                lines.append(f"Your code has been rated at {rating:.2f}/10")
+            results[normalize_path(file_path)] = ("\n".join(lines), rating or 0)
+        return results
+
+    def run_mypy(self, chunk):
+        """
+        Runs mypy over the files of one package root together, in as few invocations as
+        possible so imports are analyzed once, and splits its error lines per file.
+        Every invocation uses the root's persistent incremental cache (see cache.py).
+        """
+        results = {}
+        for part in chunked(chunk, MYPY_CHUNK_SIZE):
+            results.update(self.run_mypy_files(part))
+        return results
+
+    def run_mypy_files(self, chunk):
+        """
+        Runs one mypy invocation over files of the same package root.
+        """
+        results = {}
+        result = run(tool_command(
+            "mypy", *mypy_cache_args(chunk[0]), "--show-error-codes", "--no-error-summary", "--no-color-output", *chunk
+        ))
+        if result.returncode not in (0, 1):
+            for file_path in chunk:
+                results[normalize_path(file_path)] = result.output.strip()
+            return results
+
+        by_file = {}
+        for line in result.stdout.splitlines():
+            match = MYPY_LINE.match(line)
+            if match:
+                by_file.setdefault(normalize_path(match.group("path")), []).append(line)
+
+        for file_path in chunk:
+            lines = by_file.get(normalize_path(file_path), [])
+            errors = sum(" error: " in line for line in lines)
+            if errors:
+                lines.append(f"Found {errors} error{'s' if errors != 1 else ''} in 1 file (checked 1 source file)")
+            else:
+                lines.append("Success: no issues found in 1 source file")
+            results[normalize_path(file_path)] = "\n".join(lines)
+        return results
+
+    def run_vulture(self, chunk):
+        """
+        Runs vulture on each file of a chunk separately. Run over several files, vulture counts a
+        name used in one of them as used in all of them, which would change the per-file results.
+        """
+        results = {}
+        for file_path in chunk:
+            stdout = run(tool_command("vulture", file_path)).stdout
+            lines = [line for line in stdout.splitlines() if VULTURE_LINE.match(line)]
+            results[normalize_path(file_path)] = "\n".join(lines)
+        return results
+
+    def run_radon(self, chunk):
+        """
+        Runs `radon cc -j` and `radon mi -j` on a chunk and returns per-file report text and ranks.
+        """
+        results = {}
+        cc_data = load_json(run(tool_command("radon", "cc", "-j", *chunk)).stdout) or {}
+        mi_data = load_json(run(tool_command("radon", "mi", "-j", *chunk)).stdout) or {}
+        cc_by_file = {normalize_path(path): blocks for path, blocks in cc_data.items()}
+        mi_by_file = {normalize_path(path): value for path, value in mi_data.items()}
+
+        for file_path in chunk:
+            key = normalize_path(file_path)
+            blocks = cc_by_file.get(key)
+            if isinstance(blocks, list) and blocks:
+                average = sum(block["complexity"] for block in blocks) / len(blocks)
+                cc_rank_value = cc_rank(average)
+                cc_lines = [file_path] + [
+                    f"    {block['type'][0].upper()} {block['lineno']}:{block['col_offset']} "
+                    f"{block.get('classname', '') + '.' if block.get('classname') else ''}{block['name']} "
+                    f"- {block['rank']}"
+                    for block in blocks
+                ]
+                cc_lines.append(f"\n{len(blocks)} blocks (classes, functions, methods) analyzed.")
+                cc_lines.append(f"Average complexity: {cc_rank_value} ({average})")
+                cc_result = "\n".join(cc_lines)
+            elif isinstance(blocks, dict) and "error" in blocks:
+                cc_result, cc_rank_value = f"{file_path}\n    ERROR: {blocks['error']}", "N/A"
+            else:
+                cc_result, cc_rank_value = "", "N/A"
+
+            mi = mi_by_file.get(key)
+            if isinstance(mi, dict) and "rank" in mi:
+                mi_result, mi_rank_value = f"{file_path} - {mi['rank']}", mi["rank"]
+            elif isinstance(mi, dict) and "error" in mi:
+                mi_result, mi_rank_value = f"{file_path} - ERROR: {mi['error']}", "N/A"
+            else:
+                mi_result, mi_rank_value = "", "N/A"
+
+            results[key] = (cc_result, cc_rank_value, mi_result, mi_rank_value)
+        return results
+
+    def run_bandit(self, chunk):
+        """
+        Runs bandit with JSON output on a chunk and returns per-file report text and high-severity count.
+        """
+        results = {}
+        result = run(tool_command("bandit", "-f", "json", "-q", *chunk))
+        data = load_json(result.stdout)
+        if not isinstance(data, dict):
+            for file_path in chunk:
+                results[normalize_path(file_path)] = (result.output.strip(), 0)
+            return results
+
+        by_file = {}
+        for issue in data.get("results", []):
+            by_file.setdefault(normalize_path(issue["filename"]), []).append(issue)
+
+        for file_path in chunk:
+            issues = by_file.get(normalize_path(file_path), [])
+            lines = [
+                f">> Issue: [{issue['test_id']}:{issue['test_name']}] {issue['issue_text']}\n"
+                f"   Severity: {issue['issue_severity'].title()}   "
+                f"Confidence: {issue['issue_confidence'].title()}\n"
+                f"   Location: {file_path}:{issue['line_number']}:{issue.get('col_offset', 0)}"
+                for issue in issues
+            ]
+            high_issues = sum(issue["issue_severity"] == "HIGH" for issue in issues)
+            results[normalize_path(file_path)] = ("\n".join(lines) or "No issues identified.", high_issues)
+        return results
+
+    def resolve_dependencies(self, chunk):
+        """
+        Resolves the imports of a chunk of files in-process (see requirements.py).
+        """
+        with profiler.span("requirements batch", "batch", tool="requirements", files=chunk):
+            for file_path in chunk:
+                self.resolver.resolve(file_path)
+
+    def run_chunk(self, tool, run_tool, chunk):
+        """
+        Runs one tool over one chunk, timed as a batch when profiling.
+        """
+        start = time.perf_counter()
+        with profiler.span(f"{tool} batch", "batch", tool=tool, files=chunk):
+            results = run_tool(chunk)
+        if self.timings is not None:
+            elapsed = time.perf_counter() - start
+            for file_path in chunk:
+                self.timings.add(file_path, elapsed / len(chunk))
+        return results
+
+    def cache_key(self, tool, file_path, fingerprint):
+        """
+        Returns the cache key of a tool's result on a file. Like PythonValidator.replay_check, results of
+        tools that read imported modules are keyed on their content too, so the importers of a changed
+        module (such as the dependents `--since` selects) run again instead of replaying old results.
+        """
+        if tool in PythonValidator.IMPORT_DEPENDENT_TOOLS:
+            fingerprint += self.resolver.dependency_digest(file_path)
+        return self.cache.key(file_path, f"batch:{tool}", fingerprint)
+
+    def cached_results(self, tool, file_paths, fingerprint):
+        """
+        Splits files into cached per-file results for a tool and the files that still need a run.
+        """
+        cached, missing = {}, []
+        for file_path in file_paths:
+            entry = self.cache.get(self.cache_key(tool, file_path, fingerprint)) if self.cache else None
+            if entry is None:
+                missing.append(file_path)
+            else:
+                cached[normalize_path(file_path)] = entry["result"]
+        if self.cache and self.cache.enabled:
+            profiler.record_cache("hit", len(cached), tool=tool)
+            profiler.record_cache("miss", len(missing), tool=tool)
+        return cached, missing
+
+    def start_tools(self, file_paths, tools):
+        """
+        Submits the runs of the given tools over the files that have no cached result.
+        Project tools get one task per package root, the others one task per chunk.
+        Returns the pending runs, to be passed to finish_tools.
+        """
+        fingerprint = config_fingerprint(self.directory, PythonValidator.settings())
+        # Split large runs into at least one chunk per worker so every worker stays busy
+        chunk_size = min(self.chunk_size, max(MIN_CHUNK_SIZE, math.ceil(len(file_paths) / self.scheduler.jobs)))
+
+        pending = []
+        for tool in tools:
+            cached, missing = self.cached_results(tool, file_paths, fingerprint)
+            run_tool = getattr(self, f"run_{tool}")
+            groups = group_by_package_root(missing) if tool in self.PROJECT_TOOLS else chunked(missing, chunk_size)
+            handle = self.scheduler.submit([partial(self.run_chunk, tool, run_tool, group) for group in groups])
+            pending.append((tool, cached, missing, handle))
+        return fingerprint, pending
+
+    def finish_tools(self, started):
+        """
+        Waits for the runs submitted by start_tools and merges the per-file results.
+        Returns one dictionary per tool, keyed by normalized file path.
+        """
+        fingerprint, pending = started
+        merged = []
+        for tool, tool_results, missing, handle in pending:
+            for chunk_results in self.scheduler.results(handle):
+                tool_results.update(chunk_results)
+            if self.cache:
+                for file_path in missing:
+                    key = self.cache_key(tool, file_path, fingerprint)
+                    self.cache.put(key, {"result": tool_results[normalize_path(file_path)]})
+            merged.append(tool_results)
+        return merged
+
+    def run_tools(self, file_paths, tools=None):
+        """
+        Runs the tools (every tool by default) over the files concurrently and merges the per-file results.
+        Returns one dictionary per tool, keyed by normalized file path.
+        """
+        return self.finish_tools(self.start_tools(file_paths, tools or self.TOOLS))
+
+    def collect(self, file_paths, project_results=None):
+        """
+        Runs every tool once over the file list and returns a PythonValidator per file,
+        together with the formatted check results in the order validate_code prints them.
+        When the project tools already run over the whole project, `project_results` is a
+        callable returning their results by tool; only the other tools run on the list.
+        """
+        tools = self.TOOLS if project_results is None else [tool for tool in self.TOOLS if tool not in self.PROJECT_TOOLS]
+        started = self.start_tools(file_paths, tools)
+        dependency_handle = self.scheduler.submit([partial(self.resolve_dependencies, file_paths)])
+        results = dict(project_results()) if project_results else {}
+        results.update(zip(tools, self.finish_tools(started)))
+        pylint_results, mypy_results, vulture_results, radon_results, bandit_results = (results[tool] for tool in self.TOOLS)
+        self.scheduler.results(dependency_handle)
+
+        reports = []
+        for file_path in file_paths:
+            key = normalize_path(file_path)
+            validator = PythonValidator(file_path, resolver=self.resolver, coverage=self.coverage)
+            checks = [
+                validator.record_pylint(*pylint_results[key]) if pylint_results[key][0].strip() else None,
+                validator.record_mypy(mypy_results[key]),
+                validator.record_dead_code(vulture_results[key]),
+                validator.record_dependencies(self.resolver.check_file(file_path)),
+                validator.record_complexity(*radon_results[key]) if any(radon_results[key][::2]) else None,
+                validator.record_security(*bandit_results[key]),
+                validator.record_coverage(*self.coverage.check_file(file_path)),
+            ]
+            reports.append((file_path, validator, checks))
+        return reports
+
+    def validate_files(self, file_paths):
+        """
+        Validates all files in batches and reports each file as soon as its batch is done.
+        Files are processed in windows of one chunk per worker, so the results held in
+        memory do not grow with the number of files. Mypy runs once per package root over
+        all files instead, since it analyzes every imported module anyway; only its
+        per-file error lines are kept.
+        Returns the number of files that failed validation.
+        """
+        if not file_paths:
+            return 0
+
+        self.reporter.message(f"\n🔍 Running batched Python Code Validation on {len(file_paths)} file(s)...\n")
+        project_runs = self.start_tools(file_paths, self.PROJECT_TOOLS)
+        finished = {}
+
+        def project_results():
+            if not finished:
+                finished.update(zip(self.PROJECT_TOOLS, self.finish_tools(project_runs)))
+            return finished
+
+        failed = 0
+        window = self.chunk_size * self.scheduler.jobs
+        for index in range(0, len(file_paths), window):
+            reports = self.collect(file_paths[index:index + window], project_results)
+            for file_path, validator, checks in reports:
+                failed += self.reporter.report(validator, file_path, checks, header=print_file_header)
+        return failed
@@ -0,0 +1,307 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from . import profiler
+from .diagnostics import TOOL_ERROR
+from .process import current_directory
+
+CACHE_DIR_NAME = ".frappe_code_cache"
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024  # Bytes kept on disk before the oldest entries are evicted
+MEMORY_ENTRIES = 4096  # Entries and file hashes kept in memory; long-running processes drop the least recently used
+MYPY_CACHE_DIR = "mypy"  # Persistent incremental mypy caches, one per package root
+TOOLCHAIN_FILE = "toolchain.json"  # Tools recorded by `frappe-code install`, see toolchain.py; kept by clear()
+HISTORY_FILE = "history.sqlite"  # Diagnostics of past runs, see history.py; kept by clear()
+CONFIG_FILES = ("eslint.config.cjs", "eslint.config.js", ".prettierrc", ".prettierrc.json", "pyproject.toml", "setup.cfg", ".pylintrc", "mypy.ini")
+
+
+def file_hash(file_path):
+    """Returns the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as source:
+        for block in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def tool_version(tool):
+    """Returns the version of a tool for cache keys, as recorded in the toolchain manifest (see toolchain.py)."""
+    if tool == "requirements":  # Resolved in-process, see requirements.py
+        from .requirements import resolver_version
+        return resolver_version()
+    from .toolchain import tool_version as recorded_version
+    return recorded_version(tool)
+
+
+def config_fingerprint(directory, settings=()):
+    """
+    Returns a digest of the tool configuration files found in the directory or the
+    current working directory, combined with the validator settings (thresholds).
+    """
+    digest = hashlib.sha256(repr(settings).encode())
+    for base in dict.fromkeys((os.path.abspath(directory), os.getcwd())):
+        for name in CONFIG_FILES:
+            config_path = os.path.join(base, name)
+            if os.path.isfile(config_path):
+                digest.update(config_path.encode())
+                digest.update(file_hash(config_path).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    A persistent, content-addressed store of check results kept in a project-local directory.
+    Entries are keyed on the file's content hash, the tool and its version, and the active
+    configuration, so any change to one of them simply misses the cache. Checks that read the
+    modules a file imports add their content to the configuration part of the key
+    (see PythonValidator.replay_check). The most recently used entries are also kept in memory.
+    """
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE, enabled=True):
+        """
+        Initializes the cache under `<directory>/.frappe_code_cache`.
+        A disabled cache never returns or stores anything.
+        """
+        self.root = os.path.join(os.path.abspath(directory), CACHE_DIR_NAME)
+        self.max_size = max_size
+        self.enabled = enabled
+        self.memory = OrderedDict()
+        self.size = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.hashes = OrderedDict()
+
+    def key(self, file_path, tool, fingerprint):
+        """
+        Builds the cache key for a tool's result on a file. The path is part of the key
+        because tool output refers to the file by name.
+        """
+        parts = [os.path.abspath(file_path), self.content_hash(file_path), tool, tool_version(tool.split(":")[-1]), fingerprint]
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def content_hash(self, file_path):
+        """
+        Returns a file's content hash, re-reading the file only when its size or mtime changed.
+        """
+        stat = os.stat(file_path)
+        signature = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        digest = self.hashes.get(signature)
+        if digest is None:
+            digest = file_hash(file_path)
+            with self.lock:
+                self.hashes[signature] = digest
+                remember(self.hashes, signature)
+        return digest
+
+    def entry_path(self, key):
+        """
+        Returns the on-disk location of an entry.
+        """
+        return os.path.join(self.root, key[:2], key + ".json")
+
+    def get(self, key):
+        """
+        Returns the stored entry for a key, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+
+        entry = self.memory.get(key)
+        if entry is None:
+            path = self.entry_path(key)
+            try:
+                with open(path, encoding="utf-8") as entry_file:
+                    entry = json.load(entry_file)
+                os.utime(path)  # Keeps recently used entries at the back of the eviction queue
+            except (OSError, ValueError):
+                entry = None
+
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.memory[key] = entry
+            remember(self.memory, key)
+        return entry
+
+    def put(self, key, entry):
+        """
+        Stores an entry, evicting the least recently used entries if the cache grows too large.
+        """
+        if not self.enabled:
+            return
+
+        path = self.entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ensure_gitignore()
+        data = json.dumps(entry)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as entry_file:
+            entry_file.write(data)
+        os.replace(temp_path, path)
+
+        with self.lock:
+            self.memory[key] = entry
+            remember(self.memory, key)
+            if self.size is None:
+                self.size = self.disk_size()
+            else:
+                self.size += len(data)
+            if self.size > self.max_size:
+                self.evict()
+
+    def cached(self, file_path, tool, fingerprint, compute, keep=None):
+        """
+        Returns the cached result of `compute()` for a file, computing and storing it on a miss.
+        The result must be JSON serializable. With `keep`, only results it accepts are stored.
+        """
+        if not self.enabled:
+            return compute()
+
+        key = self.key(file_path, tool, fingerprint)
+        entry = self.get(key)
+        if entry is not None:
+            profiler.record_cache("hit")
+            return entry["result"]
+
+        profiler.record_cache("miss")
+        result = compute()
+        if keep is None or keep(result):
+            self.put(key, {"result": result})
+        return result
+
+    def replay_check(self, file_path, tool, fingerprint, check, summary=None, keys=()):
+        """
+        Runs a validator check through the cache. The check's formatted output and the
+        summary statuses it owns (`keys`) are stored, and restored into `summary` on a hit.
+        """
+        def compute():
+            output = check(file_path)
+            return {"output": output, "summary": {key: summary[key] for key in keys}}
+
+        # A tool that could not run is tried again on the next run
+        result = self.cached(file_path, tool, fingerprint, compute, lambda result: TOOL_ERROR not in (result["output"] or ""))
+        if summary is not None:
+            summary.update(result["summary"])
+        return result["output"]
+
+    def entries(self):
+        """
+        Returns (path, size, mtime) for every entry on disk.
+        """
+        found = []
+        try:
+            shards = os.listdir(self.root)
+        except OSError:
+            return found
+        # Entries live in two-character shard directories; tool caches and run data sit beside them
+        for shard in shards:
+            if len(shard) != 2 or not os.path.isdir(os.path.join(self.root, shard)):
+                continue
+            for name in os.listdir(os.path.join(self.root, shard)):
+                if name.endswith(".json"):
+                    path = os.path.join(self.root, shard, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    found.append((path, stat.st_size, stat.st_mtime))
+        return found
+
+    def disk_size(self):
+        """
+        Returns the total size of all entries on disk.
+        """
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache is below 80% of its maximum size.
+        """
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        self.size = sum(size for _, size, _ in entries)
+        target = self.max_size * 0.8
+        for path, size, _ in entries:
+            if self.size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.size -= size
+        self.memory.clear()
+
+    def ensure_gitignore(self):
+        """
+        Keeps the cache directory out of version control.
+        """
+        gitignore = os.path.join(self.root, ".gitignore")
+        if not os.path.exists(gitignore):
+            os.makedirs(self.root, exist_ok=True)
+            with open(gitignore, "w", encoding="utf-8") as ignore_file:
+                ignore_file.write("*\n")
+
+    def clear(self):
+        """
+        Deletes every cached entry. The toolchain manifest and the diagnostics history are not
+        cached results and are kept, together with the .gitignore that keeps them out of version control.
+        """
+        self.memory.clear()
+        self.size = 0
+        if not os.path.isdir(self.root):
+            return
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name in (TOOLCHAIN_FILE, HISTORY_FILE, ".gitignore"):
+                continue
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+
+
+def remember(entries, key):
+    """Marks a key of an in-memory LRU as the most recently used, dropping the oldest beyond MEMORY_ENTRIES."""
+    entries.move_to_end(key)
+    while len(entries) > MEMORY_ENTRIES:
+        entries.popitem(last=False)
+
+
+OPEN_CACHES = {}
+
+
+def open_cache(directory, enabled=True):
+    """
+    Returns the result cache of a project directory. Enabled caches are shared for the
+    life of the process, so a long-running process keeps their entries in memory.
+    """
+    if not enabled:
+        return ResultCache(directory, enabled=False)
+    root = os.path.abspath(directory)
+    if root not in OPEN_CACHES:
+        OPEN_CACHES[root] = ResultCache(root)
+    return OPEN_CACHES[root]
+
+
+def package_root(file_path):
+    """Returns the directory a file's module name is resolved from: the parent of its outermost package."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    while os.path.exists(os.path.join(directory, "__init__.py")):
+        directory = os.path.dirname(directory)
+    return directory
+
+
+def mypy_cache_args(file_path):
+    """
+    Returns the mypy arguments selecting the persistent incremental cache of the file's
+    package root, kept in the cache directory of the directory tools run in. Project runs and
+    single-file runs of the same root share it, so each one starts from the other's work.
+    Roots get separate caches because module names are only unique within one root.
+    """
+    name = hashlib.sha256(package_root(file_path).encode()).hexdigest()[:16]
+    cache = ResultCache(current_directory())
+    cache.ensure_gitignore()
+    return ["--incremental", "--cache-dir", os.path.join(cache.root, MYPY_CACHE_DIR, name)]
@@ -0,0 +1,67 @@
+import os
+import re
+
+MAX_FILE_SIZE = 1024 * 1024  # Bytes above which a file is oversized
+MAX_LINE_LENGTH = 1000  # Characters in one line above which a file is taken as minified
+SAMPLE_SIZE = 8 * 1024  # Bytes read from the start of a file to classify it
+MARKER_LINES = 5  # Generated-file markers are only looked for in a file's first lines
+GENERATED_MARKER = re.compile(r"@generated|do not edit|auto-?generated|generated by", re.IGNORECASE)
+# File names and directories of build output
+GENERATED_SUFFIXES = (".min.js", ".bundle.js", "-bundle.js")
+GENERATED_DIRS = {"dist"}
+# What is done with classified files: only the security checks, no checks, or all of them
+ACTIONS = ("security", "skip", "all")
+SECURITY_TOOLS = {"bandit", "retire"}
+
+
+class FileClassifier:
+    """
+    Spots minified, generated and oversized files from their size, name and first SAMPLE_SIZE
+    bytes, so they are never read in full. Such files can keep a linter busy for minutes and
+    print huge reports, so they get a reduced check profile (`action`, see ACTIONS).
+    """
+
+    def __init__(self, max_size=MAX_FILE_SIZE, max_line_length=MAX_LINE_LENGTH, action="security"):
+        self.max_size = max_size
+        self.max_line_length = max_line_length
+        self.action = action
+
+    def classify(self, file_path):
+        """Returns ("oversized" | "generated" | "minified", reason) for a file, or None for source code."""
+        try:
+            size = os.path.getsize(file_path)
+            with open(file_path, "rb") as source_file:
+                # A line is only known to be too long if the sample holds more than it
+                sample = source_file.read(max(SAMPLE_SIZE, self.max_line_length + 1))
+        except OSError:
+            return None
+        if size > self.max_size:
+            return "oversized", f"{size / 1024:.0f} KB, over the {self.max_size / 1024:.0f} KB limit"
+
+        parts = file_path.replace(os.sep, "/").split("/")
+        if file_path.endswith(GENERATED_SUFFIXES) or GENERATED_DIRS.intersection(parts[:-1]):
+            return "generated", "build output"
+        text = sample.decode("utf-8", errors="replace")
+        lines = text.split("\n")
+        marker = GENERATED_MARKER.search("\n".join(lines[:MARKER_LINES]))
+        if marker:
+            return "generated", f"marked as generated ({marker.group(0)!r})"
+        if max(len(line) for line in lines) > self.max_line_length:
+            return "minified", f"a line over {self.max_line_length} characters"
+        return None
+
+    def classify_files(self, file_paths):
+        """Returns {path: (kind, reason)} for the classified files among `file_paths`; none with the "all" action."""
+        if self.action == "all":
+            return {}
+        classified = {}
+        for file_path in file_paths:
+            classification = self.classify(file_path)
+            if classification is not None:
+                classified[file_path] = classification
+        return classified
+
+
+def security_checks(validator, checks):
+    """Returns a file's checks with all but the security checks left out, as checks that return None."""
+    return [check if entry[0] in SECURITY_TOOLS else (lambda: None) for entry, check in zip(validator.CHECKS, checks)]
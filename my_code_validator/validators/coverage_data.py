@@ -0,0 +1,157 @@
+import hashlib
+import os
+import sys
+import threading
+from .cache import file_hash
+from .process import current_directory
+
+DEFAULT_DATA_FILE = ".coverage"  # Where `coverage run` writes, unless COVERAGE_FILE says otherwise
+COVERAGE_CONFIG = ".coveragerc"  # Read from the project directory; setup.cfg and pyproject.toml from the working directory
+PRECISION = 1  # Decimals shown in percentages
+
+
+def percent(covered, total):
+    return 100.0 * covered / total if total else 100.0
+
+
+class CoverageIndex:
+    """
+    Per-file test coverage from the data file a test run left behind (`coverage run`), read once
+    per validation run through coverage's data API instead of generating a report per check.
+    Each file's numbers come from coverage's own analysis of the file, so they match `coverage report`.
+    Analyses are cached by the file's content and the lines and arcs the tests executed in it,
+    so a file is only analyzed again when it or its tests' execution of it changed.
+    With a `threshold` (percent), a file whose total coverage is below it fails the check.
+    """
+
+    def __init__(self, directory=None, cache=None, data_file=None, threshold=None):
+        """
+        Initializes the index for one run. The data file is `data_file`, COVERAGE_FILE or .coverage,
+        looked up in `directory` and then in the working directory. Nothing is read until the first check.
+        """
+        self.directory = os.path.abspath(directory or current_directory())
+        self.cache = cache
+        self.data_file = data_file or os.environ.get("COVERAGE_FILE", DEFAULT_DATA_FILE)
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.coverage = None
+        self.data = None
+        self.measured = {}  # Normalized absolute path -> path as recorded in the data file
+        self.config = ""
+
+    def find_data_file(self):
+        for base in dict.fromkeys((self.directory, os.getcwd())):
+            path = os.path.join(base, self.data_file)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def load(self):
+        """Reads the data file on first use. Returns False if there is no coverage data to report."""
+        with self.lock:
+            if self.loaded:
+                return self.data is not None
+            self.loaded = True
+            path = self.find_data_file()
+            if path is None:
+                return False
+            try:
+                # Imported here, so runs without coverage data never load coverage
+                import coverage
+            except ImportError:
+                print("⚠️ coverage could not be imported, the coverage check is skipped.", file=sys.stderr)
+                return False
+            config_path = os.path.join(self.directory, COVERAGE_CONFIG)
+            config = config_path if os.path.isfile(config_path) else True
+            try:
+                self.coverage = coverage.Coverage(data_file=path, config_file=config)
+                self.coverage.load()
+                data = self.coverage.get_data()
+            except coverage.CoverageException as e:
+                print(f"⚠️ {path} cannot be read, the coverage check is skipped: {e}", file=sys.stderr)
+                return False
+            base = os.path.dirname(path)  # Files are recorded relative to it with relative_files
+            self.measured = {
+                os.path.normcase(os.path.abspath(os.path.join(base, name))): name for name in data.measured_files()
+            }
+            self.config = f"{coverage.__version__}\0{file_hash(config_path) if config is not True else ''}"
+            self.data = data
+            return True
+
+    def analyze(self, name, file_path):
+        """Returns a file's coverage numbers and missing lines, from the cache if it and its execution did not change."""
+        with self.lock:
+            executed = (sorted(self.data.lines(name) or ()), sorted(self.data.arcs(name) or ()))
+        key = None
+        if self.cache is not None and self.cache.enabled:
+            try:
+                content_hash = self.cache.content_hash(file_path)
+            except OSError:
+                content_hash = None
+            if content_hash:
+                key = hashlib.sha256(f"coverage\0{content_hash}\0{executed!r}\0{self.config}".encode()).hexdigest()
+                entry = self.cache.get(key)
+                if entry is not None:
+                    return entry["coverage"]
+
+        with self.lock:
+            try:
+                result = self.branch_analysis(name)
+            except (AttributeError, TypeError):
+                result = self.line_analysis(name)
+        if key is not None:
+            self.cache.put(key, {"coverage": result})
+        return result
+
+    def branch_analysis(self, name):
+        """
+        Returns a file's numbers from the analysis behind Coverage.analysis2, which also has the
+        branch counts. It is private API, tested with the coverage versions requirements.txt allows.
+        """
+        analysis = self.coverage._analyze(name)
+        numbers = analysis.numbers
+        return {
+            "statements": numbers.n_statements, "missing": numbers.n_missing,
+            "branches": numbers.n_branches, "missing_branches": numbers.n_missing_branches,
+            "percent": numbers.pc_covered, "missing_lines": analysis.missing_formatted(branches=True),
+        }
+
+    def line_analysis(self, name):
+        """Returns a file's line numbers from the public Coverage.analysis2, for coverage versions without `_analyze`."""
+        _, statements, _, missing, missing_lines = self.coverage.analysis2(name)
+        return {
+            "statements": len(statements), "missing": len(missing), "branches": 0, "missing_branches": 0,
+            "percent": percent(len(statements) - len(missing), len(statements)), "missing_lines": missing_lines,
+        }
+
+    def check_file(self, file_path):
+        """
+        Returns the coverage check output of one file and its status ("Passed", "Failed" or
+        "Warning" for a file the tests never ran), or (None, None) without coverage data.
+        """
+        if not self.load():
+            return None, None
+        data_name = os.path.basename(self.data_file)
+        name = self.measured.get(os.path.normcase(os.path.abspath(file_path)))
+        if name is None:
+            status = "Warning" if self.threshold is None else "Failed"
+            return f"Not run by the tests recorded in {data_name}.", status
+        try:
+            result = self.analyze(name, file_path)
+        except Exception as e:  # coverage raises its own errors for files it cannot parse
+            return f"ERROR: Coverage of {file_path} cannot be analyzed: {e}", "Warning"
+
+        lines = [
+            f"Lines:    {result['statements'] - result['missing']}/{result['statements']} "
+            f"({percent(result['statements'] - result['missing'], result['statements']):.{PRECISION}f}%)"
+        ]
+        if result["branches"]:
+            covered = result["branches"] - result["missing_branches"]
+            lines.append(f"Branches: {covered}/{result['branches']} ({percent(covered, result['branches']):.{PRECISION}f}%)")
+        total = f"Total:    {result['percent']:.{PRECISION}f}%"
+        lines.append(total if self.threshold is None else f"{total} (minimum {self.threshold:g}%)")
+        if result["missing_lines"]:
+            lines.append(f"Missing:  {result['missing_lines']}")
+        failed = self.threshold is not None and result["percent"] < self.threshold
+        return "\n".join(lines), "Failed" if failed else "Passed"
@@ -0,0 +1,238 @@
+import re
+
+SEVERITIES = ("error", "warning", "note")  # SARIF result levels
+
+# Report sections are recognized by the title format_output gives them
+SECTION_TITLE = re.compile(r"^📌 (?P<title>.+)$", re.MULTILINE)
+SECTION_TOOLS = {
+    "Pylint Check": "pylint",
+    "Mypy Type Check": "mypy",
+    "Dead Code Analysis": "vulture",
+    "Dependency Check": "requirements",
+    "Complexity & Maintainability Check": "radon",
+    "Security Check": "bandit",
+    "Test Coverage": "coverage",
+    "ESLint Code Quality": "eslint",
+    "Prettier Formatting": "prettier",
+    "Retire.js Security Check": "retire",
+    "Skipped Checks": "frappe-code",
+}
+
+PYLINT_LINE = re.compile(r"^(?P<path>.+?):(?P<line>\d+):(?P<column>\d+): (?P<code>[A-Z]\d{4}): (?P<message>.*?)(?: \((?P<symbol>[\w-]+)\))?$")
+PYLINT_SEVERITIES = {"C": "note", "R": "note", "W": "warning", "E": "error", "F": "error", "I": "note"}
+MYPY_LINE = re.compile(r"^(?P<path>.+?\.py):(?P<line>\d+):(?:(?P<column>\d+):)? (?P<kind>error|warning|note): (?P<message>.*?)(?:  \[(?P<code>[\w-]+)\])?$")
+VULTURE_LINE = re.compile(r"^(?P<path>.+?\.py):(?P<line>\d+): (?P<message>.*?)(?: \((?P<confidence>\d+)% confidence\))?$")
+VULTURE_KIND = re.compile(r"unused (\w+)|unreachable code|redundant if-condition")
+RADON_BLOCK = re.compile(r"^\s+(?P<type>[FMC]) (?P<line>\d+):(?P<column>\d+) (?P<name>\S+) - (?P<rank>[A-F])")
+RADON_MI = re.compile(r"^\S.* - (?P<rank>[A-F])\s*$", re.MULTILINE)
+BANDIT_ISSUE = re.compile(r"^>> Issue: \[(?P<code>\w+):(?P<name>\w+)\] (?P<message>.*)$")
+BANDIT_SEVERITY = re.compile(r"Severity: (?P<severity>\w+)")
+BANDIT_LOCATION = re.compile(r"Location: .*:(?P<line>\d+):(?P<column>\d+)")
+BANDIT_SEVERITIES = {"HIGH": "error", "MEDIUM": "warning", "LOW": "note", "UNDEFINED": "note"}
+ESLINT_LINE = re.compile(r"^\s+(?P<line>\d+):(?P<column>\d+)\s+(?P<severity>error|warning)\s+(?P<message>.*?)(?:\s{2,}(?P<rule>[@\w/-]+))?$")
+RETIRE_FINDING = re.compile(r"(?P<component>\S+ \S+) has known vulnerabilities: severity: (?P<severity>\w+);?(?P<details>.*)")
+SKIPPED_CHECK = re.compile(r"^⏭️ (?P<tool>[\w.-]+): (?P<reason>.*)$")
+RETIRE_SEVERITIES = {"critical": "error", "high": "error", "medium": "warning", "low": "note"}
+TOOL_ERROR = "❌ Tool error:"  # Starts the output of a tool that could not be started or timed out
+TOOL_FAILURES = (TOOL_ERROR, "Oops! Something went wrong", "npm ERR!", "command not found", "Cannot find module")
+PASSING_RANKS = ("A", "B")
+
+
+class Diagnostic:
+    """
+    One finding of one tool. Lines and columns are 1-based; 0 means the finding applies
+    to the whole file (or line). Severity is one of SEVERITIES.
+    """
+    __slots__ = ("file", "line", "column", "tool", "rule", "severity", "message")
+
+    def __init__(self, file_path, line, column, tool, rule, severity, message):
+        self.file = file_path
+        self.line = line
+        self.column = column
+        self.tool = tool
+        self.rule = rule
+        self.severity = severity
+        self.message = message
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def split_sections(results):
+    """Yield (tool, body) for each formatted check result; results without a known title are skipped."""
+    for result in results:
+        if not result:
+            continue
+        match = SECTION_TITLE.search(result)
+        tool = SECTION_TOOLS.get(match.group("title").strip()) if match else None
+        if tool is None:
+            continue
+        # The body starts after the border line that closes the title block
+        body = result[match.end():].split("\n", 2)
+        yield tool, body[2] if len(body) > 2 else ""
+
+
+def parse_pylint(file_path, text):
+    diagnostics = []
+    for line in text.splitlines():
+        match = PYLINT_LINE.match(line)
+        if match:
+            code = match.group("code")
+            rule = f"{code}:{match.group('symbol')}" if match.group("symbol") else code
+            diagnostics.append(Diagnostic(
+                file_path, int(match.group("line")), int(match.group("column")) + 1, "pylint",
+                rule, PYLINT_SEVERITIES.get(code[0], "warning"), match.group("message")
+            ))
+    return diagnostics
+
+
+def parse_mypy(file_path, text):
+    diagnostics = []
+    for line in text.splitlines():
+        match = MYPY_LINE.match(line)
+        if match:
+            diagnostics.append(Diagnostic(
+                file_path, int(match.group("line")), int(match.group("column") or 0), "mypy",
+                match.group("code") or "mypy", match.group("kind"), match.group("message")
+            ))
+    return diagnostics
+
+
+def parse_vulture(file_path, text):
+    diagnostics = []
+    for line in text.splitlines():
+        match = VULTURE_LINE.match(line)
+        if match:
+            kind = VULTURE_KIND.search(match.group("message"))
+            rule = (f"unused-{kind.group(1)}" if kind.group(1) else kind.group(0).replace(" ", "-")) if kind else "dead-code"
+            diagnostics.append(Diagnostic(
+                file_path, int(match.group("line")), 0, "vulture", rule, "warning", match.group("message")
+            ))
+    return diagnostics
+
+
+def parse_radon(file_path, text):
+    """Report blocks, and a file maintainability index, ranked below the passing ranks."""
+    diagnostics = []
+    for line in text.splitlines():
+        match = RADON_BLOCK.match(line)
+        if match and match.group("rank") not in PASSING_RANKS:
+            diagnostics.append(Diagnostic(
+                file_path, int(match.group("line")), int(match.group("column")) + 1, "radon", "cyclomatic-complexity",
+                "warning", f"{match.group('name')} has cyclomatic complexity rank {match.group('rank')}"
+            ))
+    maintainability = text.partition("Maintainability Index (MI)")[2]
+    match = RADON_MI.search(maintainability)
+    if match and match.group("rank") not in PASSING_RANKS:
+        diagnostics.append(Diagnostic(
+            file_path, 0, 0, "radon", "maintainability-index", "warning",
+            f"Maintainability index rank {match.group('rank')}"
+        ))
+    return diagnostics
+
+
+def parse_bandit(file_path, text):
+    diagnostics = []
+    issue = None
+    for line in text.splitlines() + [""]:
+        match = BANDIT_ISSUE.match(line)
+        if match or line.startswith(("--------", "Code scanned:")) or not line:
+            if issue and "line" in issue:
+                diagnostics.append(Diagnostic(file_path, **issue))
+            issue = None
+        if match:
+            issue = {"tool": "bandit", "rule": f"{match.group('code')}:{match.group('name')}", "message": match.group("message"), "severity": "note", "column": 0}
+            continue
+        if issue is None:
+            continue
+        severity = BANDIT_SEVERITY.search(line)
+        if severity:
+            issue["severity"] = BANDIT_SEVERITIES.get(severity.group("severity").upper(), "note")
+        location = BANDIT_LOCATION.search(line)
+        if location:
+            issue["line"] = int(location.group("line"))
+            issue["column"] = int(location.group("column")) + 1
+    return diagnostics
+
+
+def parse_eslint(file_path, text):
+    diagnostics = []
+    for line in text.splitlines():
+        match = ESLINT_LINE.match(line)
+        if match:
+            diagnostics.append(Diagnostic(
+                file_path, int(match.group("line")), int(match.group("column")), "eslint",
+                match.group("rule") or "eslint", match.group("severity"), match.group("message")
+            ))
+    return diagnostics
+
+
+def parse_prettier(file_path, text):
+    diagnostics = []
+    for line in text.splitlines():
+        if line.startswith("[error]"):
+            diagnostics.append(Diagnostic(file_path, 0, 0, "prettier", "prettier-error", "error", line[len("[error]"):].strip()))
+        elif line.startswith("[warn] Code style issues"):
+            diagnostics.append(Diagnostic(file_path, 0, 0, "prettier", "formatting", "warning", "Code style issues found, run Prettier to fix"))
+    return diagnostics
+
+
+def parse_retire(file_path, text):
+    diagnostics = []
+    for match in RETIRE_FINDING.finditer(text):
+        severity = RETIRE_SEVERITIES.get(match.group("severity").lower(), "warning")
+        message = f"{match.group('component')} has known vulnerabilities{match.group('details').rstrip()}"
+        diagnostics.append(Diagnostic(file_path, 0, 0, "retire", "vulnerable-component", severity, message))
+    return diagnostics
+
+
+def parse_skipped(file_path, text):
+    """Checks left out by --fail-fast or --budget, so structured reports do not pass them silently."""
+    diagnostics = []
+    for line in text.splitlines():
+        match = SKIPPED_CHECK.match(line)
+        if match:
+            diagnostics.append(Diagnostic(
+                file_path, 0, 0, "frappe-code", "skipped-check", "note",
+                f"{match.group('tool')} check skipped: {match.group('reason')}"
+            ))
+    return diagnostics
+
+
+PARSERS = {
+    "pylint": parse_pylint,
+    "mypy": parse_mypy,
+    "vulture": parse_vulture,
+    "radon": parse_radon,
+    "bandit": parse_bandit,
+    "eslint": parse_eslint,
+    "prettier": parse_prettier,
+    "retire": parse_retire,
+    "frappe-code": parse_skipped,
+}
+
+
+def tool_failure(file_path, tool, text):
+    """Return an error diagnostic when a JS tool could not run at all (crash, missing package)."""
+    for marker in TOOL_FAILURES:
+        if marker in text:
+            # The line after the marker usually carries the actual reason
+            lines = [line.strip() for line in text[text.index(marker):].splitlines() if line.strip()]
+            return Diagnostic(file_path, 0, 0, tool, "tool-error", "error", " ".join(lines[:2]))
+    return None
+
+
+def parse_results(file_path, results):
+    """
+    Turn a file's formatted check results (as returned by a validator's checks) into diagnostics.
+    Sections without line-level findings, such as the dependency check, produce none.
+    """
+    diagnostics = []
+    for tool, body in split_sections(results):
+        parser = PARSERS.get(tool)
+        if parser is None:
+            continue
+        found = parser(file_path, body)
+        failure = tool_failure(file_path, tool, body) if tool in ("eslint", "prettier", "retire") else None
+        diagnostics.extend(found if failure is None else found + [failure])
+    return diagnostics
@@ -0,0 +1,380 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import threading
+import time
+from .cache import CACHE_DIR_NAME, HISTORY_FILE, ResultCache
+from .diagnostics import PARSERS, SECTION_TITLE, SECTION_TOOLS, parse_results
+
+SCHEMA_VERSION = 1
+HISTORY_RUNS = 200  # Runs kept; a file's latest state is lost once no kept run validated it
+PYLINT_RATING = re.compile(r"📊 \*\*Rating:\*\* (-?\d+(?:\.\d+)?)/10")
+RADON_RANK = re.compile(r"➡️ \*\*Rank: (\w+)\*\*")  # Cyclomatic complexity first, then maintainability
+BANDIT_BLOCK_END = ("--------", ">> Issue:", "Code scanned:")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, started REAL NOT NULL, finished REAL, commit_sha TEXT, files INTEGER, failed INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL, file TEXT NOT NULL, status TEXT NOT NULL, summary TEXT,
+    pylint_rating REAL, cc_rank TEXT, mi_rank TEXT
+);
+CREATE TABLE IF NOT EXISTS diagnostics (
+    run_id INTEGER NOT NULL, file TEXT NOT NULL, tool TEXT NOT NULL, rule TEXT NOT NULL, line INTEGER,
+    severity TEXT, message TEXT, fingerprint TEXT NOT NULL, suppressed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS suppressions (
+    fingerprint TEXT PRIMARY KEY, file TEXT NOT NULL, tool TEXT, rule TEXT, message TEXT, reason TEXT, created REAL
+);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs (commit_sha);
+CREATE INDEX IF NOT EXISTS results_file ON results (file, run_id);
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id);
+CREATE INDEX IF NOT EXISTS diagnostics_file ON diagnostics (file, run_id);
+CREATE INDEX IF NOT EXISTS diagnostics_rule ON diagnostics (tool, rule);
+CREATE INDEX IF NOT EXISTS diagnostics_fingerprint ON diagnostics (fingerprint);
+CREATE INDEX IF NOT EXISTS suppressions_file ON suppressions (file);
+"""
+# The file's state as of its last validation in the selected runs: (file, run_id) rows
+LATEST_RESULTS = "SELECT file, MAX(run_id) AS run_id FROM results WHERE run_id IN ({runs}) GROUP BY file"
+
+
+def fingerprint(file_key, tool, rule, message):
+    """Identifies a finding independently of its line, so it stays known while code moves around it."""
+    return hashlib.sha256(f"{file_key}\0{tool}\0{rule}\0{message}".encode()).hexdigest()[:20]
+
+
+def head_commit(directory):
+    """Returns the commit checked out in a directory, or None outside a Git repository."""
+    try:
+        result = subprocess.run(["git", "-C", directory, "rev-parse", "HEAD"], capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None if result.returncode == 0 else None
+
+
+def section_tool(result):
+    """Returns the tool whose formatted check result this is, or None."""
+    match = SECTION_TITLE.search(result)
+    return SECTION_TOOLS.get(match.group("title").strip()) if match else None
+
+
+class History:
+    """
+    The diagnostics store: every run's per-file check summaries, pylint ratings, radon ranks and
+    findings in a SQLite database in the project's cache directory, indexed by file, tool, rule
+    and commit, so `frappe-code report` answers questions about past runs without running a tool.
+    Runs that only validate some files (--since, --shard) leave the other files' last state alone.
+    Findings listed in the suppressions table are known ones: they are recorded, but left out of reports.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self.path = os.path.join(self.directory, CACHE_DIR_NAME, HISTORY_FILE)
+        ResultCache(self.directory).ensure_gitignore()
+        # Reports of one run may come from scheduler threads; writes are serialized by the lock
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.run_id = None
+        self.suppressed = {row[0] for row in self.connection.execute("SELECT fingerprint FROM suppressions")}
+
+    def key(self, file_path):
+        return os.path.relpath(os.path.abspath(file_path), self.directory).replace(os.sep, "/")
+
+    def start_run(self):
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started, commit_sha) VALUES (?, ?)", (time.time(), head_commit(self.directory))
+            )
+        self.run_id = cursor.lastrowid
+
+    def fingerprints(self, file_path, results):
+        """Returns the findings in a file's results, each with its fingerprint."""
+        key = self.key(file_path)
+        return [
+            (diagnostic, fingerprint(key, diagnostic.tool, diagnostic.rule, diagnostic.message))
+            for diagnostic in parse_results(file_path, results)
+        ]
+
+    def record(self, validator, file_path, results, findings, failed):
+        """Records one file's results and findings (see fingerprints) in the current run."""
+        key = self.key(file_path)
+        text = "\n".join(result for result in results if result)
+        rating = PYLINT_RATING.search(text)
+        ranks = RADON_RANK.findall(text) + [None, None]
+        summary = getattr(validator, "summary", None)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.run_id, key, "failed" if failed else "passed", summary and json.dumps(summary),
+                    float(rating.group(1)) if rating else None, ranks[0], ranks[1]
+                )
+            )
+            self.connection.executemany(
+                "INSERT INTO diagnostics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        self.run_id, key, diagnostic.tool, diagnostic.rule, diagnostic.line, diagnostic.severity,
+                        diagnostic.message, found, found in self.suppressed
+                    )
+                    for diagnostic, found in findings
+                ]
+            )
+
+    def finish_run(self, files, failed):
+        """Closes the current run with its totals and drops the runs beyond HISTORY_RUNS."""
+        with self.lock, self.connection:
+            self.connection.execute(
+                "UPDATE runs SET finished = ?, files = ?, failed = ? WHERE id = ?", (time.time(), files, failed, self.run_id)
+            )
+            oldest = self.connection.execute(
+                "SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?", (HISTORY_RUNS - 1,)
+            ).fetchone()
+            if oldest is not None:
+                for table, column in (("diagnostics", "run_id"), ("results", "run_id"), ("runs", "id")):
+                    self.connection.execute(f"DELETE FROM {table} WHERE {column} < ?", (oldest[0],))
+
+    def close(self):
+        self.connection.close()
+
+    def latest(self, run_ids=None):
+        """
+        Returns the SQL selecting each file's (file, run_id) as of its last validation, among
+        `run_ids` or all runs.
+        """
+        runs = "SELECT id FROM runs" if run_ids is None else ", ".join(str(int(run_id)) for run_id in run_ids) or "NULL"
+        return LATEST_RESULTS.format(runs=runs)
+
+    def top_offenders(self, tool=None, limit=20):
+        """Returns the files with the most unsuppressed findings in their latest state, worst first."""
+        return [dict(row) for row in self.connection.execute(
+            f"""
+            SELECT d.file, COUNT(*) AS findings, SUM(d.severity = 'error') AS errors,
+                   r.pylint_rating, r.cc_rank, r.mi_rank, r.status
+            FROM ({self.latest()}) l
+            JOIN diagnostics d ON d.file = l.file AND d.run_id = l.run_id
+            JOIN results r ON r.file = l.file AND r.run_id = l.run_id
+            WHERE d.suppressed = 0 AND (? IS NULL OR d.tool = ?)
+            GROUP BY d.file ORDER BY errors DESC, findings DESC, d.file LIMIT ?
+            """,
+            (tool, tool, limit)
+        )]
+
+    def runs_at(self, commits):
+        """Returns the ids of the runs made at any of the given commits."""
+        commits = list(commits)
+        ids = []
+        # Chunks keep the query under SQLite's limit on bound parameters
+        for start in range(0, len(commits), 500):
+            chunk = commits[start:start + 500]
+            ids += [row[0] for row in self.connection.execute(
+                f"SELECT id FROM runs WHERE commit_sha IN ({', '.join('?' * len(chunk))})", chunk
+            )]
+        return ids
+
+    def findings(self, run_ids=None, suppressed=False):
+        """Returns the findings of each file's latest state among `run_ids` (all runs by default)."""
+        return [dict(row) for row in self.connection.execute(
+            f"""
+            SELECT d.file, d.tool, d.rule, d.line, d.severity, d.message, d.fingerprint
+            FROM ({self.latest(run_ids)}) l JOIN diagnostics d ON d.file = l.file AND d.run_id = l.run_id
+            WHERE ? OR d.suppressed = 0 ORDER BY d.file, d.line
+            """,
+            (suppressed,)
+        )]
+
+    def new_findings(self, base_runs):
+        """
+        Returns the current findings that the files did not have as of `base_runs` (the runs made
+        at the base commit and its ancestors). Files not validated in those runs count as new.
+        """
+        known = {row["fingerprint"] for row in self.findings(base_runs, suppressed=True)}
+        return [finding for finding in self.findings() if finding["fingerprint"] not in known]
+
+    def trends(self, since, file_pattern=None):
+        """
+        Returns each file's pylint rating and radon ranks as of `since` (a timestamp) and now,
+        for the files whose values changed, largest rating drop first.
+        """
+        before = [row[0] for row in self.connection.execute("SELECT id FROM runs WHERE started <= ?", (since,))]
+        query = """
+            SELECT r.file, r.pylint_rating, r.cc_rank, r.mi_rank FROM ({latest}) l
+            JOIN results r ON r.file = l.file AND r.run_id = l.run_id WHERE ? IS NULL OR r.file GLOB ?
+        """
+        then = {row["file"]: row for row in self.connection.execute(
+            query.format(latest=self.latest(before)), (file_pattern, file_pattern)
+        )}
+        changes = []
+        for row in self.connection.execute(query.format(latest=self.latest()), (file_pattern, file_pattern)):
+            old = then.get(row["file"])
+            if old is None:
+                continue
+            values = ("pylint_rating", "cc_rank", "mi_rank")
+            if any(old[value] != row[value] for value in values):
+                change = {"file": row["file"]}
+                for value in values:
+                    change[f"{value}_before"], change[value] = old[value], row[value]
+                changes.append(change)
+        drop = lambda change: (change["pylint_rating_before"] or 0) - (change["pylint_rating"] or 0)
+        return sorted(changes, key=lambda change: (-drop(change), change["file"]))
+
+    def run_totals(self, since):
+        """Returns the runs started after `since` with their totals, oldest first."""
+        return [dict(row) for row in self.connection.execute(
+            """
+            SELECT runs.id, runs.started, runs.commit_sha, runs.files, runs.failed,
+                   (SELECT COUNT(*) FROM diagnostics WHERE run_id = runs.id AND suppressed = 0) AS findings,
+                   (SELECT AVG(pylint_rating) FROM results WHERE run_id = runs.id) AS pylint_rating
+            FROM runs WHERE started > ? AND finished IS NOT NULL ORDER BY runs.id
+            """,
+            (since,)
+        )]
+
+    def suppressions(self):
+        """Returns the suppressed findings, by file."""
+        return [dict(row) for row in self.connection.execute(
+            "SELECT file, tool, rule, message, reason, created FROM suppressions ORDER BY file, tool, rule"
+        )]
+
+    def suppress(self, files=None, tool=None, reason=None):
+        """
+        Marks the current findings of `files` (all files by default) as known, optionally only
+        those of one tool. Returns the number of findings newly suppressed.
+        """
+        findings = [
+            finding for finding in self.findings()
+            if (files is None or finding["file"] in files) and (tool is None or finding["tool"] == tool)
+        ]
+        with self.lock, self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO suppressions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (finding["fingerprint"], finding["file"], finding["tool"], finding["rule"], finding["message"], reason, time.time())
+                    for finding in findings
+                ]
+            )
+            added = self.connection.total_changes - before
+            self.mark_suppressed()
+        return added
+
+    def unsuppress(self, files=None, tool=None):
+        """Forgets the suppressed findings of `files` (all files by default). Returns how many were removed."""
+        conditions, parameters = [], []
+        if files is not None:
+            conditions.append(f"file IN ({', '.join('?' * len(files))})")
+            parameters += list(files)
+        if tool is not None:
+            conditions.append("tool = ?")
+            parameters.append(tool)
+        with self.lock, self.connection:
+            removed = self.connection.execute(
+                "DELETE FROM suppressions" + (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+            ).rowcount
+            self.mark_suppressed()
+        return removed
+
+    def mark_suppressed(self):
+        """Brings the recorded findings in line with the suppressions table."""
+        self.connection.execute(
+            "UPDATE diagnostics SET suppressed = fingerprint IN (SELECT fingerprint FROM suppressions)"
+        )
+        self.suppressed = {row[0] for row in self.connection.execute("SELECT fingerprint FROM suppressions")}
+
+
+def drop_findings(file_path, key, result, suppressed):
+    """
+    Returns a formatted check result without the lines (or Bandit issue blocks) of suppressed
+    findings. Sections that findings are not parsed from are returned unchanged.
+    """
+    tool = section_tool(result) if result else None
+    parser = PARSERS.get(tool)
+    if parser is None:
+        return result
+
+    def is_suppressed(text):
+        found = parser(file_path, text)
+        return bool(found) and all(
+            fingerprint(key, diagnostic.tool, diagnostic.rule, diagnostic.message) in suppressed for diagnostic in found
+        )
+
+    kept, block = [], None
+    for line in result.split("\n") + [None]:
+        # Bandit reports each issue as a multi-line block
+        if block is not None and (line is None or line.startswith(BANDIT_BLOCK_END)):
+            if not is_suppressed("\n".join(block)):
+                kept.extend(block)
+            block = None
+        if line is None:
+            break
+        if tool == "bandit" and line.startswith(">> Issue:"):
+            block = [line]
+        elif block is not None:
+            block.append(line)
+        elif tool == "bandit" or not is_suppressed(line):
+            kept.append(line)
+    return "\n".join(kept)
+
+
+class HistoryReporter:
+    """
+    Wraps a run's reporter so each file's results are recorded in the History before they are
+    reported, with suppressed findings left out of the report. A file still fails on the
+    thresholds of its checks (such as the pylint rating) whatever is suppressed.
+    Everything else goes to the wrapped reporter.
+    """
+
+    def __init__(self, reporter, history):
+        self.reporter = reporter
+        self.history = history
+        self.files = 0
+        self.failed_files = 0
+        self.suppressed = 0
+
+    def __getattr__(self, name):
+        return getattr(self.reporter, name)
+
+    def report(self, validator, file_path, results, header=None):
+        findings = self.history.fingerprints(file_path, results)
+        suppressed = {found for _, found in findings if found in self.history.suppressed}
+        reported = results
+        if suppressed:
+            self.suppressed += sum(found in suppressed for _, found in findings)
+            key = self.history.key(file_path)
+            reported = [drop_findings(file_path, key, result, suppressed) for result in results]
+        failed = self.reporter.report(validator, file_path, reported, header)
+        self.history.record(validator, file_path, results, findings, failed)
+        self.files += 1
+        self.failed_files += failed
+        return failed
+
+    def finish_run(self):
+        """Closes the run in the History and notes how many known findings were left out."""
+        self.history.finish_run(self.files, self.failed_files)
+        self.history.close()
+        if self.suppressed:
+            self.reporter.message(f"🔕 {self.suppressed} known finding(s) suppressed, see `frappe-code report suppressions`.")
+            self.reporter.run_info["suppressed"] = self.suppressed
+
+
+def record_history(reporter, directory):
+    """
+    Starts recording a run of a project directory in its History and returns the reporter to
+    report its files through (see HistoryReporter). If the database cannot be opened (e.g. it
+    is locked by another run for too long), the run goes unrecorded and `reporter` is returned.
+    """
+    try:
+        history = History(directory)
+        history.start_run()
+    except sqlite3.Error as e:
+        reporter.message(f"⚠️ Warning: Not recording this run in the diagnostics history: {e}")
+        return reporter
+    return HistoryReporter(reporter, history)
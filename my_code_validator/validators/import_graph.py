@@ -0,0 +1,188 @@
+import json
+import os
+import re
+from my_code_validator import __version__
+from . import analysis
+from .cache import CACHE_DIR_NAME, ResultCache, file_hash
+
+GRAPH_FILE = "import_graph.json"
+# ES module imports and re-exports, CommonJS requires and dynamic imports
+JS_IMPORT = re.compile(r"""\b(?:import|export)\s+(?:[^'";]*?\bfrom\s*)?["']([^"'\n]+)["']""")
+JS_CALL = re.compile(r"""\b(?:require|import)\(\s*["']([^"'\n]+)["']\s*\)""")
+# frappe.require("/assets/app/js/x.js") or frappe.require(["a.js", "b.js"], callback)
+FRAPPE_REQUIRE = re.compile(r"""\bfrappe\.require\(\s*(\[[^\]]*\]|["'][^"'\n]+["'])""")
+JS_STRING = re.compile(r"""["']([^"'\n]+)["']""")
+ASSETS_PREFIX = "/assets/"  # Frappe serves apps/<app>/<app>/public/ under /assets/<app>/
+
+
+def js_imports(file_path):
+    """Returns the module specifiers a JS file imports or requires, in source order."""
+    with open(file_path, encoding="utf-8", errors="replace") as source_file:
+        source = source_file.read()
+    specifiers = [match.group(1) for match in JS_IMPORT.finditer(source)]
+    specifiers += [match.group(1) for match in JS_CALL.finditer(source)]
+    for match in FRAPPE_REQUIRE.finditer(source):
+        specifiers += JS_STRING.findall(match.group(1))
+    return list(dict.fromkeys(specifiers))
+
+
+def extract_imports(file_path):
+    """Returns a file's import specifiers: dotted module names for Python, module paths for JS."""
+    if file_path.endswith(".py"):
+        source = analysis.analyze(file_path)
+        return source.get("module_imports") if source.error is None else []
+    try:
+        return js_imports(file_path)
+    except OSError:
+        return []
+
+
+class ImportGraph:
+    """
+    The import edges between a project's Python and JS files, kept in the project's cache
+    directory between runs. Each update only hashes files whose size or mtime changed and
+    only parses files whose content hash changed, so keeping it current costs a stat per file.
+    Edges are stored as written in the source and resolved when the graph is queried, so
+    adding, moving or deleting a module never leaves stale edges behind.
+    """
+
+    def __init__(self, directory):
+        """Loads the graph of a project directory, or starts an empty one."""
+        self.directory = os.path.abspath(directory)
+        self.path = os.path.join(self.directory, CACHE_DIR_NAME, GRAPH_FILE)
+        self.files = {}  # Path relative to the directory -> {"signature", "hash", "imports"}
+        try:
+            with open(self.path, encoding="utf-8") as graph_file:
+                graph = json.load(graph_file)
+            if graph.get("version") == __version__:
+                self.files = graph["files"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def key(self, file_path):
+        return os.path.relpath(os.path.abspath(file_path), self.directory).replace(os.sep, "/")
+
+    def update(self, file_paths):
+        """
+        Brings the graph up to date with the project's current files; files that are gone are dropped.
+        Returns the number of files that were parsed again.
+        """
+        files, parsed = {}, 0
+        for file_path in file_paths:
+            key = self.key(file_path)
+            entry = self.files.get(key)
+            try:
+                stat = os.stat(file_path)
+                signature = [stat.st_size, stat.st_mtime_ns]
+                if entry is not None and entry["signature"] == signature:
+                    files[key] = entry
+                    continue
+                content_hash = file_hash(file_path)
+            except OSError:
+                continue
+            if entry is None or entry["hash"] != content_hash:
+                entry = {"hash": content_hash, "imports": extract_imports(file_path)}
+                parsed += 1
+            files[key] = dict(entry, signature=signature)
+        self.files = files
+        return parsed
+
+    def save(self):
+        """Writes the graph atomically, keeping the cache directory out of version control."""
+        ResultCache(self.directory).ensure_gitignore()
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as graph_file:
+            json.dump({"version": __version__, "files": self.files}, graph_file, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+    def module_names(self, keys):
+        """Maps each Python file to its dotted module name, relative to the outermost package holding it."""
+        packages = {}
+
+        def package(directory):
+            if directory not in packages:
+                if directory and os.path.exists(os.path.join(self.directory, directory, "__init__.py")):
+                    parent = package(os.path.dirname(directory))
+                    name = os.path.basename(directory)
+                    packages[directory] = f"{parent}.{name}" if parent else name
+                else:
+                    packages[directory] = ""
+            return packages[directory]
+
+        names = {}
+        for key in keys:
+            if not key.endswith(".py"):
+                continue
+            directory, file_name = os.path.split(key)
+            stem, parent = file_name[:-3], package(directory)
+            names[key] = parent if stem == "__init__" else f"{parent}.{stem}" if parent else stem
+        return names
+
+    def resolve_python(self, key, module, specifier, modules):
+        """Returns the file a Python import resolves to, or None for modules outside the project."""
+        if specifier.startswith("."):
+            level = len(specifier) - len(specifier.lstrip("."))
+            # The package of an __init__.py is its own module; other modules belong to their parent
+            parts = module.split(".") if key.endswith("__init__.py") else module.split(".")[:-1]
+            if level - 1 > len(parts):
+                return None
+            parts = parts[:len(parts) - (level - 1)] + [part for part in specifier[level:].split(".") if part]
+        else:
+            parts = specifier.split(".")
+        # The longest prefix naming a project module: `from a.b import c` is a.b.c if c is a module, else a.b
+        for end in range(len(parts), 0, -1):
+            target = modules.get(".".join(parts[:end]))
+            if target is not None:
+                return target
+        return None
+
+    def resolve_js(self, key, specifier, known):
+        """Returns the file a JS import resolves to, or None for packages and files outside the project."""
+        if specifier.startswith(("./", "../")):
+            base = os.path.normpath(os.path.join(os.path.dirname(key), specifier))
+            candidates = [base, base + ".js", os.path.join(base, "index.js")]
+        elif specifier.startswith(ASSETS_PREFIX):
+            app, _, path = specifier[len(ASSETS_PREFIX):].partition("/")
+            # The project may be the app, the directory holding apps, or a bench
+            candidates = [
+                os.path.normpath(os.path.join(prefix, "public", path))
+                for prefix in (app, os.path.join(app, app), os.path.join("apps", app, app))
+            ]
+            if os.path.basename(self.directory) == app:
+                candidates.append(os.path.normpath(os.path.join(app, "public", path)))
+        else:
+            return None
+        for candidate in candidates:
+            candidate = candidate.replace(os.sep, "/")
+            if candidate in known:
+                return candidate
+        return None
+
+    def dependents(self, changed):
+        """
+        Returns the files that import any of the `changed` files, directly or through other files,
+        as paths relative to the directory, without the changed files themselves. Changed files
+        may have been deleted: the files still importing them are dependents too.
+        """
+        changed = {self.key(path) for path in changed}
+        known = set(self.files) | changed
+        names = self.module_names(known)
+        modules = {name: key for key, name in names.items() if name}
+
+        importers = {}
+        for key, entry in self.files.items():
+            for specifier in entry["imports"]:
+                if key.endswith(".py"):
+                    target = self.resolve_python(key, names[key], specifier, modules)
+                else:
+                    target = self.resolve_js(key, specifier, known)
+                if target is not None and target != key:
+                    importers.setdefault(target, set()).add(key)
+
+        found, pending = set(), list(changed)
+        while pending:
+            for importer in importers.get(pending.pop(), ()):
+                if importer not in found and importer not in changed:
+                    found.add(importer)
+                    pending.append(importer)
+        return found
@@ -1,48 +1,101 @@
+from functools import partial
+from .cache import config_fingerprint
+from .diagnostics import TOOL_ERROR, parse_results
+from .profiler import profiled
+from .js_worker import format_eslint, format_prettier
+from .toolchain import tool_command
 from .utils import run_command, format_output
 
 class JSValidator:
-    def __init__(self, directory):
-        """Initialize the JSValidator with the directory."""
+    # (tool, check method), in report order
+    CHECKS = (
+        ("eslint", "check_eslint"),
+        ("prettier", "check_prettier"),
+        ("retire", "check_retire"),
+    )
+
+    def __init__(self, directory, cache=None, worker=None):
+        """
+        Initialize the JSValidator with the directory, an optional ResultCache and an optional
+        JSWorker that runs ESLint and Prettier in one Node process instead of one process per file.
+        """
         self.directory = directory  
+        self.cache = cache
+        self.worker = worker
         self.run_command = run_command
         self.format_output = format_output
 
+    def run_tool(self, tool, *args):
+        """
+        Run a tool and return its output. A tool that could not be started (not installed) or
+        timed out is reported as a tool error, which fails the file.
+        """
+        result = self.run_command(tool_command(tool, *args))
+        if result.returncode == 127 or result.timed_out:
+            problem = "timed out" if result.timed_out else "could not be started"
+            return f"{TOOL_ERROR} {tool} {problem}.\n{result.output.strip()}"
+        return result.output
+
     def check_eslint(self, file_path):
-        """Check JavaScript code quality with globally installed ESLint."""
-        result = self.run_command(f"npx eslint \"{file_path}\"")
+        """Check JavaScript code quality with ESLint."""
+        worker_result = self.worker.result(file_path) if self.worker else None
+        if worker_result is not None:
+            result = format_eslint(file_path, worker_result)
+        else:
+            result = self.run_tool("eslint", file_path)
         return self.format_output("ESLint Code Quality", result) if result else None
 
     def check_prettier(self, file_path):
         """Check JavaScript code formatting with Prettier."""
-        result = self.run_command(f"npx prettier --check {file_path}")
+        worker_result = self.worker.result(file_path) if self.worker else None
+        if worker_result is not None:
+            result = format_prettier(file_path, worker_result)
+        else:
+            result = self.run_tool("prettier", "--check", file_path)
         return self.format_output("Prettier Formatting", result) if result else None
 
     def check_retire(self, file_path):
         """Check for security vulnerabilities using Retire.js."""
-        result = self.run_command(f"npx retire {file_path}")  # Removed --js flag
+        result = self.run_tool("retire", file_path)  # Removed --js flag
         return self.format_output("Retire.js Security Check", result) if result else None
     
-    def validate_code(self, file_path):
-        """Run validation checks only for the specified JavaScript file."""
+    def checks(self, file_path):
+        """Return the validation checks for a file as independent callables, in report order."""
+        if self.cache is None:
+            return [profiled(partial(getattr(self, method), file_path), tool, file_path) for tool, method in self.CHECKS]
+
+        fingerprint = config_fingerprint(self.directory)
+        prefix = "worker:" if self.worker else ""
+        return [
+            profiled(partial(self.cache.replay_check, file_path, prefix + tool, fingerprint, getattr(self, method)), tool, file_path)
+            for tool, method in self.CHECKS
+        ]
+
+    def print_header(self, file_path):
+        """Print the banner shown before a file's validation results."""
         print("\n🔍 Running JavaScript Code Validation...\n")
         print(f"Validating: {file_path}\n{'-'*50}")
 
-        eslint_result = self.check_eslint(file_path)
-        prettier_result = self.check_prettier(file_path)
-        retire_result = self.check_retire(file_path)
+    def validate_code(self, file_path, scheduler=None):
+        """Run validation checks only for the specified JavaScript file."""
+        checks = self.checks(file_path)
+        results = scheduler.run(checks) if scheduler else [check() for check in checks]
+
+        self.print_header(file_path)
+        return self.print_report(results)
 
-        checks = [eslint_result, prettier_result, retire_result]
+    def failed(self, checks):
+        """Return True if any check reported an error-level diagnostic, or a tool could not run."""
+        return any(diagnostic.severity == "error" for diagnostic in parse_results("", checks))
 
-        has_errors = False  # Track if any error is found
-        
-        # Print only non-None results and check for errors
+    def print_report(self, checks):
+        """Print the non-empty check results and the overall status, which is returned."""
+        # Print only non-None results
         for result in checks:
             if result is not None:
                 print(result)
-                if "error" in result.lower() or "failed" in result.lower():
-                    has_errors = True
 
-        overall_status = "❌ Failed" if has_errors else "✅ Passed"
+        overall_status = "❌ Failed" if self.failed(checks) else "✅ Passed"
         print("\n============================================================")
         print(f"📌 Overall Status: {overall_status}")
         print("============================================================\n")
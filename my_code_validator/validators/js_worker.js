@@ -0,0 +1,94 @@
+// Long-lived ESLint and Prettier worker used by my_code_validator/validators/js_worker.py.
+// Reads one JSON request per line on stdin: {"id": 1, "files": ["a.js", ...]}
+// and writes one JSON response per line on stdout:
+// {"id": 1, "results": {"a.js": {"eslint": [...], "eslintError": null, "prettier": true, "prettierError": null}}}
+// ESLint and Prettier are resolved from the project directory (the worker's cwd).
+'use strict';
+
+const fs = require('fs');
+const path = require('path');
+const readline = require('readline');
+
+function load(name) {
+  try {
+    return require(require.resolve(name, { paths: [process.cwd()] }));
+  } catch (error) {
+    return null;
+  }
+}
+
+const eslintModule = load('eslint');
+const prettier = load('prettier');
+const eslint = eslintModule ? new eslintModule.ESLint({ cwd: process.cwd() }) : null;
+
+async function lint(files) {
+  const results = {};
+  for (const file of files) {
+    results[file] = { eslint: null, eslintError: null, prettier: null, prettierError: null };
+  }
+
+  if (eslint) {
+    try {
+      // lintFiles throws for an explicitly given file that is ignored, failing the whole batch;
+      // ignored files have nothing to report, as with the ESLint command line
+      const linted = [];
+      for (const file of files) {
+        if (await eslint.isPathIgnored(file)) {
+          results[file].eslint = [];
+        } else {
+          linted.push(file);
+        }
+      }
+      const byPath = new Map(linted.map((file) => [path.resolve(file), file]));
+      const reports = linted.length ? await eslint.lintFiles(linted) : [];
+      for (const report of reports) {
+        const file = byPath.get(report.filePath);
+        if (file === undefined) {
+          continue;
+        }
+        results[file].eslint = report.messages.map((message) => ({
+          line: message.line || 0,
+          column: message.column || 0,
+          severity: message.severity === 2 ? 'error' : 'warning',
+          message: message.message,
+          ruleId: message.ruleId || ''
+        }));
+      }
+    } catch (error) {
+      for (const file of files) {
+        if (results[file].eslint === null) {
+          results[file].eslintError = String(error.message || error);
+        }
+      }
+    }
+  } else {
+    for (const file of files) {
+      results[file].eslintError = 'eslint is not installed in this project';
+    }
+  }
+
+  for (const file of files) {
+    if (!prettier) {
+      results[file].prettierError = 'prettier is not installed in this project';
+      continue;
+    }
+    try {
+      const options = (await prettier.resolveConfig(file)) || {};
+      const source = fs.readFileSync(file, 'utf8');
+      results[file].prettier = await prettier.check(source, { ...options, filepath: path.resolve(file) });
+    } catch (error) {
+      results[file].prettierError = String(error.message || error);
+    }
+  }
+  return results;
+}
+
+// Requests are handled strictly in order so responses match the order of requests
+let queue = Promise.resolve();
+readline.createInterface({ input: process.stdin }).on('line', (line) => {
+  queue = queue.then(async () => {
+    const request = JSON.parse(line);
+    const results = await lint(request.files);
+    process.stdout.write(JSON.stringify({ id: request.id, results }) + '\n');
+  });
+});
@@ -0,0 +1,198 @@
+import atexit
+import json
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from . import process, profiler
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js_worker.js")
+BATCH_SIZE = 50  # Files sent to the worker per request
+REQUEST_TIMEOUT = process.TOOL_TIMEOUTS["eslint"]  # Seconds a batch may take before the worker is restarted
+
+
+class JSWorker:
+    """
+    A single long-lived Node process that lints and format-checks JavaScript files with
+    the ESLint and Prettier APIs, so Node, the packages and the ESLint config load once per run.
+    Results are kept per file, together with the file's size and mtime so edits are re-linted.
+    """
+    def __init__(self, directory):
+        """
+        Initializes the worker for a project directory; the Node process starts on first use.
+        """
+        self.directory = os.path.abspath(directory)
+        self.process = None
+        self.responses = None
+        self.results = {}
+        self.next_id = 0
+        self.lock = threading.Lock()
+
+    def start(self):
+        """
+        Starts the Node process. Returns False if Node is not available.
+        """
+        if self.process is not None:
+            return self.process.poll() is None
+        node = shutil.which("node")
+        if node is None:
+            return False
+        self.process = subprocess.Popen(
+            [node, WORKER_SCRIPT], cwd=self.directory, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        # Responses are read on a thread of their own, so waiting for one can time out
+        self.responses = queue.Queue()
+        threading.Thread(target=read_lines, args=(self.process.stdout, self.responses), daemon=True).start()
+        return True
+
+    def request(self, files):
+        """
+        Sends one batch of files to the worker and stores the per-file results.
+        A worker that does not answer within REQUEST_TIMEOUT is killed (OSError), and so is one
+        still busy when the thread's limits are reached (CommandStopped, see process.limits);
+        the next request starts a new one.
+        """
+        signatures = {path: file_signature(path) for path in files}
+        self.next_id += 1
+        self.process.stdin.write(json.dumps({"id": self.next_id, "files": files}) + "\n")
+        self.process.stdin.flush()
+        line = self.read_response()
+        if not line:
+            raise OSError("JavaScript worker exited unexpectedly")
+        for path, result in json.loads(line)["results"].items():
+            self.results[path] = (signatures[path], result)
+
+    def read_response(self):
+        """Waits for the worker's next response line (empty once it exited), killing it on a timeout or limit."""
+        timeout_at = time.monotonic() + REQUEST_TIMEOUT
+        deadline, cancel = getattr(process.LIMITS, "value", None) or (None, None)
+        while True:
+            try:
+                return self.responses.get(timeout=process.LIMIT_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+            reason = process.limit_reached(deadline, cancel)
+            if reason:
+                self.close(kill=True)
+                raise process.CommandStopped(reason)
+            if time.monotonic() >= timeout_at:
+                self.close(kill=True)
+                raise OSError(f"JavaScript worker did not answer within {REQUEST_TIMEOUT}s")
+
+    def prefetch(self, file_paths):
+        """
+        Lints a list of files in batches ahead of the per-file checks.
+        """
+        with self.lock:
+            if not self.start():
+                return
+            missing = [
+                path for path in map(os.path.abspath, file_paths)
+                if self.results.get(path, (None,))[0] != file_signature(path)
+            ]
+            try:
+                for index in range(0, len(missing), BATCH_SIZE):
+                    batch = missing[index:index + BATCH_SIZE]
+                    with profiler.span("js-worker", "batch", tool="js-worker", files=batch):
+                        self.request(batch)
+            except (OSError, ValueError):
+                self.close()
+
+    def result(self, file_path):
+        """
+        Returns the worker's result for a file (linting it now if it was not prefetched),
+        or None if the worker is unavailable.
+        """
+        self.prefetch([file_path])
+        return self.results.get(os.path.abspath(file_path), (None, None))[1]
+
+    def close(self, kill=False):
+        """
+        Stops the Node process, right away with `kill`.
+        """
+        if self.process is not None:
+            if self.process.poll() is None:
+                if kill:
+                    self.process.kill()
+                try:
+                    self.process.stdin.close()
+                except OSError:
+                    pass
+                try:
+                    self.process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self.process.kill()
+            self.process = None
+
+
+def read_lines(stream, lines):
+    """Queues each line a worker writes, then an empty string once it closed its output."""
+    for line in stream:
+        lines.put(line)
+    lines.put("")
+
+
+def file_signature(file_path):
+    """Returns (size, mtime) of a file, used to detect edits since it was linted."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def format_eslint(file_path, result):
+    """Formats ESLint messages the way ESLint's default (stylish) formatter prints them."""
+    if result["eslintError"]:
+        return f"Oops! Something went wrong! :(\n\n{result['eslintError']}"
+    messages = result["eslint"] or []
+    if not messages:
+        return ""
+
+    errors = sum(message["severity"] == "error" for message in messages)
+    warnings = len(messages) - errors
+    lines = [os.path.abspath(file_path)] + [
+        f"  {message['line']}:{message['column']}  {message['severity']}  {message['message']}  {message['ruleId']}"
+        for message in messages
+    ]
+    total = len(messages)
+    lines.append(
+        f"\n✖ {total} problem{'s' if total != 1 else ''} "
+        f"({errors} error{'s' if errors != 1 else ''}, {warnings} warning{'s' if warnings != 1 else ''})"
+    )
+    return "\n".join(lines)
+
+
+def format_prettier(file_path, result):
+    """Formats a Prettier check result the way `prettier --check` prints it."""
+    if result["prettierError"]:
+        return f"Checking formatting...\n[error] {file_path}: {result['prettierError']}"
+    if result["prettier"]:
+        return "Checking formatting...\nAll matched files use Prettier code style!"
+    return (
+        f"Checking formatting...\n[warn] {file_path}\n"
+        "[warn] Code style issues found in the above file. Run Prettier to fix."
+    )
+
+
+WORKERS = {}
+
+
+def get_js_worker(directory):
+    """
+    Returns the JavaScript worker of a project directory, shared for the life of the process.
+    """
+    root = os.path.abspath(directory)
+    if root not in WORKERS:
+        WORKERS[root] = JSWorker(root)
+    return WORKERS[root]
+
+
+@atexit.register
+def close_workers():
+    """Stops every worker when the process exits."""
+    for worker in WORKERS.values():
+        worker.close()
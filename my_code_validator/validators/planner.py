@@ -0,0 +1,199 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from . import process
+from .cache import CACHE_DIR_NAME, ResultCache
+from .process import CommandStopped, limits
+from .utils import format_output
+
+COSTS_FILE = "costs.json"
+COST_SMOOTHING = 0.3  # Weight of the latest run in a tool's running average cost
+# Seconds per file assumed for a tool until it has been measured in this project
+DEFAULT_COSTS = {
+    "vulture": 0.5, "radon": 0.8, "requirements": 0.05, "bandit": 1.0, "pylint": 4.0, "mypy": 5.0,
+    "prettier": 1.0, "eslint": 2.0, "retire": 3.0,
+}
+UNKNOWN_COST = 1.0
+ABANDON_GRACE = 0.5  # Seconds past the deadline given to killed tools to wind down
+SKIPPED_TITLE = "Skipped Checks"
+
+
+class CostModel:
+    """
+    The measured cost of each tool's check on one file, as a running average kept next to
+    the project's result cache, so later runs can order checks cheapest first.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self.path = os.path.join(self.directory, CACHE_DIR_NAME, COSTS_FILE)
+        self.lock = threading.Lock()
+        self.changed = False
+        try:
+            with open(self.path, encoding="utf-8") as costs_file:
+                self.costs = json.load(costs_file)
+        except (OSError, ValueError):
+            self.costs = {}
+
+    def cost(self, tool):
+        """Returns the expected seconds of a tool's check on one file."""
+        return self.costs.get(tool, DEFAULT_COSTS.get(tool, UNKNOWN_COST))
+
+    def record(self, tool, seconds):
+        """Folds one measured check duration into the tool's running average."""
+        with self.lock:
+            previous = self.costs.get(tool)
+            self.costs[tool] = seconds if previous is None else previous + COST_SMOOTHING * (seconds - previous)
+            self.changed = True
+
+    def save(self):
+        """Writes the costs back if any were measured in this run."""
+        if not self.changed:
+            return
+        ResultCache(self.directory).ensure_gitignore()
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as costs_file:
+            json.dump(self.costs, costs_file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+        self.changed = False
+
+
+class CheckPlan:
+    """
+    Runs each file's checks cheapest first by measured cost, instead of all at once in report order.
+    With `fail_fast`, a file's remaining checks are stopped as soon as it has definitively failed.
+    With a `budget` in seconds, the whole run gets a wall-clock deadline: checks that are not
+    expected to finish in time are deferred, running tools are killed when it passes and
+    in-process checks that cannot be killed are abandoned, so the budget is a hard ceiling.
+    Checks left out are reported as skipped, with the reason, after the file's other results.
+    """
+
+    def __init__(self, directory, fail_fast=False, budget=None):
+        self.costs = CostModel(directory)
+        self.fail_fast = fail_fast
+        self.budget = budget
+        self.deadline = time.monotonic() + budget if budget is not None else None
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def run_check(self, tool, check, cancel, skipped):
+        """
+        Runs one check unless the file already failed or the check does not fit the budget.
+        Returns the check's result, or None when it was skipped (the reason goes to `skipped`).
+        """
+        if cancel.is_set():
+            skipped[tool] = "not started, the file had already failed (--fail-fast)"
+            return None
+        cost = self.costs.cost(tool)
+        if self.deadline is not None and cost > self.remaining():
+            skipped[tool] = (
+                f"deferred, expected to take {cost:.1f}s with {max(0.0, self.remaining()):.1f}s "
+                f"of the {self.budget:g}s budget left"
+            )
+            return None
+
+        start = time.perf_counter()
+        try:
+            if self.deadline is None:
+                with limits(None, cancel):
+                    result = check()
+            else:
+                result = self.run_bounded(check, cancel)
+        except CommandStopped as e:
+            skipped[tool] = {
+                "cancelled": "stopped, the file had already failed (--fail-fast)",
+                "deadline": f"stopped, the {self.budget:g}s budget ran out",
+                "abandoned": f"abandoned, the {self.budget:g}s budget ran out",
+            }[e.reason]
+            return None
+        if result is not None:  # Checks left out by the caller return None at no cost
+            self.costs.record(tool, time.perf_counter() - start)
+        return result
+
+    def run_bounded(self, check, cancel):
+        """
+        Runs a check under the budget on a daemon thread, waiting for it until the deadline
+        (and ABANDON_GRACE). Tools are killed at the deadline, but in-process tools cannot be:
+        a check still running then is abandoned, so neither the scheduler's workers nor the end
+        of the run wait for it. Raises CommandStopped("abandoned") for an abandoned check.
+        """
+        outcome = {}
+        directory = getattr(process.DIRECTORY, "value", None)
+
+        def run():
+            process.set_directory(directory)
+            try:
+                with limits(self.deadline, cancel):
+                    outcome["result"] = check()
+            except BaseException as e:  # Re-raised in the waiting thread, or dropped with the check
+                outcome["error"] = e
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(max(0.0, self.remaining()) + ABANDON_GRACE)
+        if thread.is_alive():
+            raise CommandStopped("abandoned")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def start(self, scheduler, validator, checks):
+        """
+        Submits a file's checks in cost order and returns a callable that waits for them and
+        returns their results in report order, followed by the skipped-checks section if any.
+        """
+        tools = [entry[0] for entry in validator.CHECKS]
+        order = sorted(range(len(checks)), key=lambda index: self.costs.cost(tools[index]))
+        cancel, skipped = threading.Event(), {}
+        handle = scheduler.submit([
+            lambda index=index: self.run_check(tools[index], checks[index], cancel, skipped) for index in order
+        ])
+
+        def collect():
+            results = [None] * len(checks)
+            if scheduler.executor is None:
+                for index, task in zip(order, handle):
+                    results[index] = task()
+                    if self.fail_fast and validator.failed(results):
+                        cancel.set()
+            else:
+                self.wait(handle, order, results, validator, cancel, skipped, tools)
+            if skipped:
+                lines = [f"⏭️ {tool}: {skipped[tool]}" for tool in tools if tool in skipped]
+                results.append(format_output(SKIPPED_TITLE, "\n".join(lines)))
+            return results
+
+        return collect
+
+    def wait(self, futures, order, results, validator, cancel, skipped, tools):
+        """
+        Collects results as checks finish, cancelling the rest once the file has failed.
+        Checks that cannot be killed (in-process tools) are abandoned when the budget runs out.
+        """
+        indexes = dict(zip(futures, order))
+        pending = set(futures)
+        while pending:
+            timeout = max(0.0, self.remaining()) + ABANDON_GRACE if self.deadline is not None else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[indexes[future]] = future.result()
+            if self.fail_fast and validator.failed(results):
+                cancel.set()
+            if not done:
+                for future in pending:
+                    skipped.setdefault(tools[indexes[future]], f"abandoned, the {self.budget:g}s budget ran out")
+                return
+
+    def finish(self):
+        """Saves the costs measured during the run."""
+        self.costs.save()
+
+
+def make_plan(directory, fail_fast=False, budget=None):
+    """Returns a CheckPlan when fail-fast or a budget is requested, otherwise None."""
+    if not fail_fast and budget is None:
+        return None
+    return CheckPlan(directory, fail_fast, budget)
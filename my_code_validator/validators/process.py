@@ -0,0 +1,312 @@
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from . import profiler
+
+RSS_SAMPLE_INTERVAL = 0.02  # Seconds between peak RSS samples of a profiled child process
+LIMIT_POLL_INTERVAL = 0.05  # Seconds between checks of a running command's timeout, deadline and cancel event
+DEFAULT_TIMEOUT = 600  # Seconds a tool without its own timeout may run before it is killed
+# Seconds each tool may run before it is killed, by executable name
+TOOL_TIMEOUTS = {
+    "vulture": 120, "radon": 120, "coverage": 120, "bandit": 300, "pylint": 600, "mypy": 900,
+    "eslint": 300, "prettier": 120, "retire": 300, "git": 120,
+}
+# Tool processes running at once across all threads, so nested or concurrent runs cannot fork-bomb the machine
+MAX_PROCESSES = max(2, 2 * (os.cpu_count() or 1))
+MAX_OUTPUT = 8 * 1024 * 1024  # Bytes kept from the start of each output stream
+OUTPUT_TAIL = 64 * 1024  # Bytes kept from the end of a stream longer than MAX_OUTPUT, where tools print summaries
+SPOOL_SIZE = 1024 * 1024  # Bytes of a stream held in memory before it spills to a temporary file
+READ_SIZE = 64 * 1024
+
+LIMITS = threading.local()
+DIRECTORY = threading.local()
+PROCESS_SLOTS = threading.BoundedSemaphore(MAX_PROCESSES)
+
+
+class CommandStopped(Exception):
+    """
+    Raised when a command started under `limits` is killed before it finished.
+    `reason` is "deadline" or "cancelled"; the planner also raises it with "abandoned" for a
+    check it stopped waiting for (see planner.CheckPlan.run_bounded).
+    """
+    def __init__(self, reason):
+        super().__init__(f"Command stopped: {reason}")
+        self.reason = reason
+
+
+class ProcessResult:
+    """
+    The outcome of a command run with `run`: its exit code (127 if it could not be started,
+    negative if killed by a signal), decoded output, wall-clock duration in seconds, and
+    whether the output was truncated or the command was killed for running past its timeout.
+    """
+
+    def __init__(self, args, returncode, stdout="", stderr="", duration=0.0, truncated=False, timed_out=False):
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.duration = duration
+        self.truncated = truncated
+        self.timed_out = timed_out
+
+    @property
+    def output(self):
+        """Returns stdout and stderr joined, as the text-based checks parse them, noting a timeout."""
+        output = self.stdout.strip() + "\n" + self.stderr.strip()
+        if self.timed_out:
+            output += f"\n⏱️ {tool_name(self.args)} was killed after running for {self.duration:.1f}s"
+        return output
+
+
+class BoundedOutput:
+    """
+    Captures an output stream in bounded space: the first MAX_OUTPUT bytes are kept, in memory
+    up to SPOOL_SIZE and in a temporary file beyond, and of the rest only the last OUTPUT_TAIL bytes.
+    """
+
+    def __init__(self, limit=MAX_OUTPUT, spool_size=SPOOL_SIZE, tail_size=OUTPUT_TAIL):
+        self.head = tempfile.SpooledTemporaryFile(max_size=spool_size)
+        self.room = limit
+        self.tail = bytearray()
+        self.tail_size = tail_size
+        self.dropped = 0
+
+    def write(self, data):
+        if self.room > 0:
+            kept = data[:self.room]
+            self.head.write(kept)
+            self.room -= len(kept)
+            data = data[len(kept):]
+        if data:
+            self.tail += data
+            if len(self.tail) > self.tail_size:
+                self.dropped += len(self.tail) - self.tail_size
+                del self.tail[:-self.tail_size]
+
+    @property
+    def truncated(self):
+        return self.dropped > 0
+
+    def text(self):
+        """Returns the captured output, marking where bytes were dropped, and releases the buffer."""
+        self.head.seek(0)
+        data = self.head.read()
+        self.head.close()
+        if self.dropped:
+            data += f"\n[... {self.dropped} bytes of output truncated ...]\n".encode()
+        data += bytes(self.tail)
+        return data.decode("utf-8", errors="replace").replace("\r\n", "\n")
+
+
+@contextmanager
+def limits(deadline=None, cancel=None):
+    """
+    Kills the commands this thread starts once `deadline` (a time.monotonic() value) passes
+    or the `cancel` event is set, and raises CommandStopped instead of returning their output.
+    """
+    previous = getattr(LIMITS, "value", None)
+    LIMITS.value = (deadline, cancel)
+    try:
+        yield
+    finally:
+        LIMITS.value = previous
+
+
+def set_directory(directory):
+    """
+    Makes the commands this thread starts run in `directory`, so tools read that directory's
+    configuration; None restores the process's working directory.
+    """
+    DIRECTORY.value = directory
+
+
+@contextmanager
+def in_directory(directory):
+    """Runs the commands this thread starts in `directory` for the duration of the block."""
+    previous = getattr(DIRECTORY, "value", None)
+    set_directory(directory)
+    try:
+        yield
+    finally:
+        set_directory(previous)
+
+
+def current_directory():
+    """Returns the directory the commands this thread starts run in."""
+    return getattr(DIRECTORY, "value", None) or os.getcwd()
+
+
+def limit_reached(deadline, cancel):
+    """Returns why a limited command must stop ("cancelled" or "deadline"), or None."""
+    if cancel is not None and cancel.is_set():
+        return "cancelled"
+    if deadline is not None and time.monotonic() >= deadline:
+        return "deadline"
+    return None
+
+
+def tool_name(args):
+    """Returns the tool a command runs: the executable's name."""
+    return os.path.basename(args[0]) if args else "process"
+
+
+def kill_group(proc):
+    """Kills a command started in its own session together with everything it spawned."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except OSError:
+        pass
+
+
+def watch_process(proc, timeout_at, deadline, cancel, finished, stopped):
+    """Kills a command once its timeout or a limit is reached, unless it finishes first."""
+    while not finished.wait(LIMIT_POLL_INTERVAL):
+        reason = limit_reached(deadline, cancel) or ("timeout" if time.monotonic() >= timeout_at else None)
+        if reason:
+            stopped.append(reason)
+            kill_group(proc)
+            return
+
+
+def acquire_slot(deadline, cancel):
+    """Waits for one of the MAX_PROCESSES process slots, giving up when a limit is reached."""
+    if deadline is None and cancel is None:
+        PROCESS_SLOTS.acquire()
+        return
+    while not PROCESS_SLOTS.acquire(timeout=LIMIT_POLL_INTERVAL):
+        reason = limit_reached(deadline, cancel)
+        if reason:
+            raise CommandStopped(reason)
+
+
+def drain(stream, output):
+    """Copies a pipe into a BoundedOutput until the command closes it."""
+    for chunk in iter(partial(stream.read1, READ_SIZE), b""):
+        output.write(chunk)
+    stream.close()
+
+
+def run(args, cwd=None, timeout=None):
+    """
+    Runs a command given as an argument list, without a shell, and returns a ProcessResult.
+    It runs in `cwd`, or in this thread's directory (see in_directory).
+    The command is killed after `timeout` seconds (by default the tool's entry in TOOL_TIMEOUTS).
+    At most MAX_PROCESSES commands run at once; output is captured as described in BoundedOutput.
+    When profiling, the child's CPU time and peak RSS are recorded from its resource usage.
+    Inside `limits`, the command is killed when a limit is reached and CommandStopped is raised.
+    """
+    args = [str(arg) for arg in args]
+    cwd = getattr(DIRECTORY, "value", None) if cwd is None else cwd
+    name = tool_name(args)
+    timeout = TOOL_TIMEOUTS.get(name, DEFAULT_TIMEOUT) if timeout is None else timeout
+    deadline, cancel = getattr(LIMITS, "value", None) or (None, None)
+    reason = limit_reached(deadline, cancel)
+    if reason:
+        raise CommandStopped(reason)
+
+    acquire_slot(deadline, cancel)
+    try:
+        with profiler.span(name, "process", tool=name):
+            result, stopped = execute(args, cwd, timeout, deadline, cancel)
+    finally:
+        PROCESS_SLOTS.release()
+    if stopped in ("deadline", "cancelled"):
+        raise CommandStopped(stopped)
+    return result
+
+
+def execute(args, cwd, timeout, deadline, cancel):
+    """
+    Starts a command in its own session and waits for it, returning its ProcessResult and the
+    reason it was killed, if it was.
+    """
+    start = time.monotonic()
+    try:
+        proc = subprocess.Popen(
+            args, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            start_new_session=True
+        )
+    except OSError as e:
+        return ProcessResult(args, 127, stderr=str(e)), None
+
+    stdout, stderr = BoundedOutput(), BoundedOutput()
+    readers = [
+        threading.Thread(target=drain, args=(proc.stdout, stdout), daemon=True),
+        threading.Thread(target=drain, args=(proc.stderr, stderr), daemon=True),
+    ]
+    finished, stopped = threading.Event(), []
+    watcher = threading.Thread(
+        target=watch_process, args=(proc, start + timeout, deadline, cancel, finished, stopped), daemon=True
+    )
+    profiled = profiler.PROFILER is not None and hasattr(os, "wait4")
+    done, peak_rss, sampler = threading.Event(), [0], None
+    if profiled and os.path.exists(f"/proc/{proc.pid}/status"):
+        sampler = threading.Thread(target=sample_peak_rss, args=(proc.pid, done, peak_rss), daemon=True)
+
+    try:
+        for thread in readers + [watcher] + ([sampler] if sampler else []):
+            thread.start()
+        for reader in readers:
+            reader.join()
+        if profiled:
+            # Reap the child with wait4 to get its resource usage
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") else status >> 8
+        else:
+            proc.wait()
+    except BaseException:
+        kill_group(proc)  # The command runs in its own session, so an interrupt does not reach it
+        raise
+    finally:
+        finished.set()
+        done.set()
+        watcher.join()
+        if sampler is not None:
+            sampler.join()
+
+    if profiled:
+        if sampler is None:
+            # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+            peak_rss[0] = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        profiler.record_child(usage.ru_utime + usage.ru_stime, peak_rss[0])
+
+    reason = stopped[0] if stopped else None
+    return ProcessResult(
+        args, proc.returncode, stdout.text(), stderr.text(), time.monotonic() - start,
+        truncated=stdout.truncated or stderr.truncated, timed_out=reason == "timeout"
+    ), reason
+
+
+def sample_peak_rss(pid, done, peak_rss):
+    """
+    Samples a running child's peak RSS (VmHWM, in kB) from /proc until `done` is set.
+    wait4's ru_maxrss cannot be used on Linux: it keeps the parent's peak across fork and exec.
+    """
+    while True:
+        # A tool started through a launcher script usually runs as its child
+        try:
+            with open(f"/proc/{pid}/task/{pid}/children", encoding="utf-8") as children:
+                pids = [pid] + children.read().split()
+        except OSError:
+            pids = [pid]
+        for process_id in pids:
+            try:
+                with open(f"/proc/{process_id}/status", encoding="utf-8") as status:
+                    for line in status:
+                        if line.startswith("VmHWM:"):
+                            peak_rss[0] = max(peak_rss[0], int(line.split()[1]))
+                            break
+            except (OSError, ValueError):
+                pass
+        if done.wait(RSS_SAMPLE_INTERVAL):
+            return
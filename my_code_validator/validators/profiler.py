@@ -0,0 +1,234 @@
+import json
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_TOP = 10  # Rows shown per table of the --profile summary
+
+
+class Span:
+    """
+    One timed unit of work: a phase, a check, a batch run or a child process.
+    CPU time covers the span's own thread plus the child processes started inside it.
+    """
+    __slots__ = ("name", "category", "tool", "files", "start", "cpu_start", "end", "cpu", "child_cpu", "max_rss_kb", "cache", "thread")
+
+    def __init__(self, name, category, tool=None, files=()):
+        self.name = name
+        self.category = category
+        self.tool = tool
+        self.files = list(files)
+        self.start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        self.end = None
+        self.cpu = 0.0
+        self.child_cpu = 0.0
+        self.max_rss_kb = 0
+        self.cache = {}
+        self.thread = threading.get_ident()
+
+    @property
+    def wall(self):
+        return self.end - self.start
+
+    @property
+    def total_cpu(self):
+        return self.cpu + self.child_cpu
+
+
+class Profiler:
+    """
+    Collects spans from every thread of a run. Spans nest per thread, so child process usage
+    and cache hits are credited to the check or batch that caused them.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.origin = time.perf_counter()
+        self.tool_cache = {}
+
+    def stack(self):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    @contextmanager
+    def span(self, name, category, tool=None, files=()):
+        span = Span(name, category, tool, files)
+        stack = self.stack()
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            stack.pop()
+            span.end = time.perf_counter()
+            span.cpu = time.thread_time() - span.cpu_start
+            if stack:
+                parent = stack[-1]
+                parent.child_cpu += span.child_cpu
+                parent.max_rss_kb = max(parent.max_rss_kb, span.max_rss_kb)
+                for outcome, count in span.cache.items():
+                    parent.cache[outcome] = parent.cache.get(outcome, 0) + count
+            with self.lock:
+                self.spans.append(span)
+
+    def record_child(self, cpu, max_rss_kb):
+        """Credits a finished child process's CPU time and peak RSS to the current span."""
+        stack = self.stack()
+        if stack:
+            stack[-1].child_cpu += cpu
+            stack[-1].max_rss_kb = max(stack[-1].max_rss_kb, max_rss_kb)
+
+    def record_cache(self, outcome, count=1, tool=None):
+        """
+        Counts cache hits or misses ("hit" / "miss") against a tool when given (for lookups made
+        outside any check, like the batch validator's), otherwise against the current span.
+        """
+        if tool is not None:
+            with self.lock:
+                self.tool_cache[(tool, outcome)] = self.tool_cache.get((tool, outcome), 0) + count
+            return
+        stack = self.stack()
+        if stack:
+            stack[-1].cache[outcome] = stack[-1].cache.get(outcome, 0) + count
+
+    def trace_events(self):
+        """Returns the spans as Chrome trace events (complete "X" events, microseconds)."""
+        pid = os.getpid()
+        threads = {}
+        events = []
+        for span in sorted(self.spans, key=lambda span: span.start):
+            tid = threads.setdefault(span.thread, len(threads) + 1)
+            args = {"cpu_ms": round(span.total_cpu * 1000, 3)}
+            if span.tool:
+                args["tool"] = span.tool
+            if span.files:
+                args["files"] = span.files if len(span.files) <= 20 else len(span.files)
+            if span.max_rss_kb:
+                args["max_rss_kb"] = span.max_rss_kb
+            if span.cache:
+                args["cache"] = dict(span.cache)
+            events.append({
+                "name": span.name, "cat": span.category, "ph": "X", "pid": pid, "tid": tid,
+                "ts": round((span.start - self.origin) * 1e6), "dur": round(span.wall * 1e6), "args": args,
+            })
+        for tid in threads.values():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": f"worker {tid}"}})
+        return events
+
+    def write_trace(self, path):
+        """Writes a Chrome trace-event JSON file, loadable in chrome://tracing or Perfetto."""
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, trace_file)
+
+    def summary(self):
+        """Returns the --profile report: phases, slowest tools (with p50/p95) and slowest files."""
+        phases = [span for span in self.spans if span.category == "phase"]
+        checks = [span for span in self.spans if span.category in ("check", "batch")]
+
+        lines = ["", "⏱️ Profile", "-" * 96]
+        if phases:
+            lines.append(f"{'Phase':<30} {'wall':>9} {'cpu':>9}")
+            for span in sorted(phases, key=lambda span: span.start):
+                lines.append(f"{span.name:<30} {span.wall:>8.2f}s {span.total_cpu:>8.2f}s")
+            lines.append("")
+
+        by_tool = {}
+        for span in checks:
+            by_tool.setdefault(span.tool or span.name, []).append(span)
+        lines.append(
+            f"{'Tool':<18} {'calls':>6} {'total':>9} {'p50':>8} {'p95':>8} {'cpu':>9} {'peak RSS':>10} {'cache hit/miss':>15}"
+        )
+        for tool, spans in sorted(by_tool.items(), key=lambda item: -sum(span.wall for span in item[1]))[:PROFILE_TOP]:
+            walls = sorted(span.wall for span in spans)
+            rss = max(span.max_rss_kb for span in spans)
+            hits = sum(span.cache.get("hit", 0) for span in spans) + self.tool_cache.get((tool, "hit"), 0)
+            misses = sum(span.cache.get("miss", 0) for span in spans) + self.tool_cache.get((tool, "miss"), 0)
+            lines.append(
+                f"{tool:<18} {len(spans):>6} {sum(walls):>8.2f}s {percentile(walls, 50):>7.3f}s "
+                f"{percentile(walls, 95):>7.3f}s {sum(span.total_cpu for span in spans):>8.2f}s "
+                f"{(f'{rss / 1024:.0f} MB' if rss else '-'):>10} {f'{hits}/{misses}':>15}"
+            )
+
+        # Batched runs cover many files; their time is split evenly across the files of the batch
+        by_file = {}
+        for span in checks:
+            for file_path in span.files:
+                by_file[file_path] = by_file.get(file_path, 0.0) + span.wall / len(span.files)
+        if by_file:
+            lines.append("")
+            lines.append(f"{'Slowest files':<84} {'wall':>9}")
+            for file_path, wall in sorted(by_file.items(), key=lambda item: -item[1])[:PROFILE_TOP]:
+                lines.append(f"{shorten(file_path, 84):<84} {wall:>8.2f}s")
+        lines.append("-" * 96)
+        return "\n".join(lines)
+
+
+def percentile(values, percent):
+    """Returns the nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def shorten(text, width):
+    return text if len(text) <= width else "…" + text[-(width - 1):]
+
+
+PROFILER = None
+
+
+@contextmanager
+def span(name, category, tool=None, files=()):
+    """Times a block with the active profiler; does nothing when profiling is off."""
+    if PROFILER is None:
+        yield None
+        return
+    with PROFILER.span(name, category, tool, files) as current:
+        yield current
+
+
+def record_child(cpu, max_rss_kb):
+    if PROFILER is not None:
+        PROFILER.record_child(cpu, max_rss_kb)
+
+
+def record_cache(outcome, count=1, tool=None):
+    if PROFILER is not None and count:
+        PROFILER.record_cache(outcome, count, tool)
+
+
+def profiled(check, tool, file_path):
+    """Wraps a zero-argument check so it runs inside a "check" span for one tool and file."""
+    def run():
+        with span(tool, "check", tool=tool, files=[file_path]):
+            return check()
+    return run
+
+
+@contextmanager
+def profiling(profile=False, trace=None, report=None):
+    """
+    Profiles the enclosed run when `profile` or `trace` is set: prints the summary table through
+    `report` (stderr by default) and/or writes a Chrome trace to the `trace` path.
+    """
+    global PROFILER
+    if not profile and not trace:
+        yield None
+        return
+
+    PROFILER = profiler = Profiler()
+    try:
+        with profiler.span("total", "phase"):
+            yield profiler
+    finally:
+        PROFILER = None
+        if profile:
+            (report or (lambda text: print(text, file=sys.stderr)))(profiler.summary())
+        if trace:
+            profiler.write_trace(trace)
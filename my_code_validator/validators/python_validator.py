@@ -1,5 +1,27 @@
 import re
-from .utils import run_command, format_output
+from functools import partial
+from .backends import SubprocessBackend
+from .cache import config_fingerprint
+from .coverage_data import CoverageIndex
+from .profiler import profiled
+from .requirements import DependencyResolver
+from .utils import format_output
+
+class Summary(dict):
+    """
+    A file's check statuses. Once frozen, when the file has been reported, writes are ignored,
+    so a check abandoned when the time budget ran out cannot change them afterwards.
+    """
+    frozen = False
+
+    def __setitem__(self, key, value):
+        if not self.frozen:
+            super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        if not self.frozen:
+            super().update(*args, **kwargs)
+
 
 class PythonValidator:
     """
@@ -7,12 +29,40 @@ class PythonValidator:
     It checks for code quality, type safety, dead code, dependency management,
     complexity, maintainability, and security vulnerabilities.
     """
-    def __init__(self, file_path):
+    PYLINT_PASS_RATING = 7
+    PYLINT_FAIL_RATING = 5
+    MAX_DEAD_CODE = 3
+    PASSING_RANKS = ("A", "B")
+
+    # (tool, check method, summary entries the check sets), in report order
+    CHECKS = (
+        ("pylint", "check_pylint", ("Pylint",)),
+        ("mypy", "check_mypy", ("Mypy",)),
+        ("vulture", "check_dead_code", ("Dead Code",)),
+        ("requirements", "check_dependencies", ("Dependencies",)),
+        ("radon", "check_complexity", ("Complexity", "Maintainability")),
+        ("bandit", "check_security", ("Security",)),
+        ("coverage", "check_coverage", ("Coverage",)),
+    )
+    # Checks whose results depend on more than the file; the coverage index caches its own
+    UNCACHED_TOOLS = ("coverage",)
+    # Checks that read the project modules a file imports; their results are keyed on those too
+    IMPORT_DEPENDENT_TOOLS = ("pylint", "mypy")
+
+    def __init__(self, file_path, cache=None, backend=None, resolver=None, coverage=None):
         """
         Initializes the PythonValidator with a file path and default validation summary.
+        When a ResultCache is given, check results are replayed from it for unchanged files.
+        The backend runs the analysis tools (subprocesses by default, see backends.py).
+        Imports are resolved by `resolver`, which validators of the same run share (see requirements.py),
+        and test coverage is looked up in `coverage`, likewise shared (see coverage_data.py).
         """
         self.file_path = file_path
-        self.summary = {
+        self.cache = cache
+        self.backend = backend or SubprocessBackend()
+        self.resolver = resolver or DependencyResolver(cache)
+        self.coverage = coverage or CoverageIndex(cache=cache)
+        self.summary = Summary({
             "Pylint": "Skipped",
             "Mypy": "Skipped",
             "Dead Code": "Skipped",
@@ -20,8 +70,9 @@ class PythonValidator:
             "Complexity": "Skipped",
             "Maintainability": "Skipped",
             "Security": "Skipped",
+            "Coverage": "Skipped",
             "Overall Status": "Pass"
-        }
+        })
         self.failed_checks = 0  
 
     def check_pylint(self, file_path):
@@ -29,16 +80,22 @@ class PythonValidator:
         Runs pylint on the given file and evaluates the code quality rating.
         Fails the check if the rating is below 5.
         """
-        raw_output = run_command(f"pylint {file_path}")
+        raw_output = self.backend.pylint(file_path)
         if not raw_output.strip():
             return None  
 
         match = re.search(r"Your code has been rated at (-?\d+\.\d+)/10", raw_output)
         rating = float(match.group(1)) if match else 0
 
-        self.summary["Pylint"] = "Passed" if rating >= 7 else "Failed"
+        return self.record_pylint(raw_output, rating)
+
+    def record_pylint(self, raw_output, rating):
+        """
+        Updates the summary from a pylint rating and formats the pylint report.
+        """
+        self.summary["Pylint"] = "Passed" if rating >= self.PYLINT_PASS_RATING else "Failed"
 
-        if rating < 5:
+        if rating < self.PYLINT_FAIL_RATING:
             self.fail_check("Pylint")
 
         formatted_result = f"""
@@ -53,7 +110,13 @@ class PythonValidator:
         """
         Runs mypy for static type checking and updates the summary based on results.
         """
-        output = run_command(f"mypy {file_path}")
+        output = self.backend.mypy(file_path)
+        return self.record_mypy(output)
+
+    def record_mypy(self, output):
+        """
+        Updates the summary from mypy output and formats the mypy report.
+        """
         self.summary["Mypy"] = "Passed" if "Success" in output else "Failed"
 
         if "Success" not in output:
@@ -65,39 +128,61 @@ class PythonValidator:
         """
         Runs vulture to detect unused code. If more than 3 unused elements are found, it fails the check.
         """
-        output = run_command(f"vulture {file_path}")
+        output = self.backend.vulture(file_path)
+        return self.record_dead_code(output)
+
+    def record_dead_code(self, output):
+        """
+        Updates the summary from vulture output and formats the dead code report.
+        """
         dead_code_count = len(re.findall(r"unused", output))
-        self.summary["Dead Code"] = "Passed" if dead_code_count <= 3 else "Failed"
+        self.summary["Dead Code"] = "Passed" if dead_code_count <= self.MAX_DEAD_CODE else "Failed"
 
-        if dead_code_count > 3:
+        if dead_code_count > self.MAX_DEAD_CODE:
             self.fail_check("Dead Code")
 
         return format_output("Dead Code Analysis", output) if output.strip() else None
 
     def check_dependencies(self, file_path):
         """
-        Runs pipreqs to analyze dependencies required by the script.
+        Resolves the script's imports to installed distributions, offline.
         """
-        output = run_command(f"pipreqs --print {file_path}")
+        output = self.resolver.check_file(file_path)
+        return self.record_dependencies(output)
+
+    def record_dependencies(self, output):
+        """
+        Updates the summary from the dependency check output and formats the dependency report.
+        Imports that no installed package provides are a warning, not a failure.
+        """
+        unresolved = re.search(r"not found locally|^ERROR", output, re.MULTILINE)
+        self.summary["Dependencies"] = "Warning" if unresolved else "Passed"
 
         return format_output("Dependency Check", output) if output.strip() else None
-    
+
 
     def check_complexity(self, file_path):
         """
         Uses radon to check cyclomatic complexity and maintainability index.
         If either metric falls below an acceptable threshold, it fails the check.
         """
-        cc_result = run_command(f"radon cc {file_path} -a")
-        mi_result = run_command(f"radon mi {file_path}")
+        cc_result = self.backend.radon_cc(file_path)
+        mi_result = self.backend.radon_mi(file_path)
         if not cc_result.strip() and not mi_result.strip():
             return None  
 
         cc_rank = self.extract_rank(cc_result, r"Average complexity: (\w)")
-        mi_rank = self.extract_rank(mi_result, rf"{file_path} - (\w)")
+        # radon mi reports one line for the file, under whichever path the backend shows it as
+        mi_rank = self.extract_rank(mi_result, r"(?m)^.+ - ([A-F])\b")
 
-        self.summary["Complexity"] = "Passed" if cc_rank in ["A", "B"] else "Failed"
-        self.summary["Maintainability"] = "Passed" if mi_rank in ["A", "B"] else "Failed"
+        return self.record_complexity(cc_result, cc_rank, mi_result, mi_rank)
+
+    def record_complexity(self, cc_result, cc_rank, mi_result, mi_rank):
+        """
+        Updates the summary from radon ranks and formats the complexity report.
+        """
+        self.summary["Complexity"] = "Passed" if cc_rank in self.PASSING_RANKS else "Failed"
+        self.summary["Maintainability"] = "Passed" if mi_rank in self.PASSING_RANKS else "Failed"
 
         formatted_result = f"""
 🛠 **Cyclomatic Complexity (CC)**
@@ -115,8 +200,14 @@ class PythonValidator:
         Runs Bandit to analyze security vulnerabilities in the script.
         If any high-severity issue is found, it fails the check.
         """
-        output = run_command(f"bandit -r {file_path}")
+        output = self.backend.bandit(file_path)
         high_issues = len(re.findall(r"Severity: High", output))
+        return self.record_security(output, high_issues)
+
+    def record_security(self, output, high_issues):
+        """
+        Updates the summary from the number of high-severity Bandit issues.
+        """
         self.summary["Security"] = "Passed" if high_issues == 0 else "Failed"
 
         if high_issues > 0:
@@ -124,12 +215,26 @@ class PythonValidator:
 
         return format_output("Security Check", output) if output.strip() else None
 
-    def check_coverage(self):
+    def check_coverage(self, file_path):
         """
-        Runs coverage tool to generate a test coverage report.
+        Looks the file up in the run's coverage data. Fails the check if its coverage is below
+        the threshold; files the tests never ran are a warning unless a threshold is set.
         """
-        output = run_command("coverage report -m")
-        return format_output("Test Coverage", output) if output.strip() else None
+        output, status = self.coverage.check_file(file_path)
+        return self.record_coverage(output, status)
+
+    def record_coverage(self, output, status):
+        """
+        Updates the summary from the coverage status and formats the coverage report.
+        Without coverage data the check stays skipped.
+        """
+        if output is None:
+            return None
+        self.summary["Coverage"] = status
+        if status == "Failed":
+            self.fail_check("Coverage")
+
+        return format_output("Test Coverage", output)
 
     def extract_rank(self, output, pattern):
         """
@@ -159,27 +264,85 @@ class PythonValidator:
         else:
             return "❌ Poor Code Quality. Major improvements needed!"
 
-    def validate_code(self, file_path):
+    @classmethod
+    def settings(cls):
         """
-        Runs all validation checks and prints a summary of the results.
+        Returns the thresholds that influence check results, used to key cached results.
+        """
+        return (cls.PYLINT_PASS_RATING, cls.PYLINT_FAIL_RATING, cls.MAX_DEAD_CODE, cls.PASSING_RANKS)
+
+    def checks(self, file_path):
+        """
+        Returns the validation checks for a file as independent callables, in report order.
+        """
+        if self.cache is None:
+            return [profiled(partial(getattr(self, method), file_path), tool, file_path) for tool, method, _ in self.CHECKS]
+
+        fingerprint = config_fingerprint(self.file_path, self.settings())
+        prefix = "" if self.backend.name == SubprocessBackend.name else f"{self.backend.name}:"
+        return [
+            profiled(
+                partial(getattr(self, method), file_path) if tool in self.UNCACHED_TOOLS else
+                partial(self.replay_check, file_path, prefix + tool, fingerprint, getattr(self, method), keys),
+                tool, file_path
+            )
+            for tool, method, keys in self.CHECKS
+        ]
+
+    def replay_check(self, file_path, tool, fingerprint, check, keys):
+        """
+        Runs a check through the cache. Results of checks that read imported modules are also keyed
+        on those modules' content, so they run again when a module the file imports changed.
+        """
+        if tool.split(":")[-1] in self.IMPORT_DEPENDENT_TOOLS:
+            fingerprint += self.resolver.dependency_digest(file_path)
+        return self.cache.replay_check(file_path, tool, fingerprint, check, self.summary, keys)
+
+    def freeze(self):
+        """
+        Fixes the summary as reported; checks still running past the budget no longer change it.
+        """
+        self.summary.frozen = True
+
+    def print_header(self, file_path):
+        """
+        Prints the banner shown before a file's validation results.
         """
         print("\n🔍 Running Python Code Validation...\n")
         print(f"Validating: {file_path}\n{'-'*50}")
 
-        checks = [
-            self.check_pylint(file_path),
-            self.check_mypy(file_path),
-            self.check_dead_code(file_path),
-            self.check_dependencies(file_path),
-            self.check_complexity(file_path),
-            self.check_security(file_path)
+    def validate_code(self, file_path, scheduler=None):
+        """
+        Runs all validation checks and prints a summary of the results.
+        When a scheduler is given, the checks run concurrently.
+        """
+        checks = self.checks(file_path)
+        results = scheduler.run(checks) if scheduler else [check() for check in checks]
+
+        self.print_header(file_path)
+        self.print_report(results)
+
+    def failed(self, checks):
+        """
+        Sets the overall status from the statuses of the checks that returned a result and returns
+        True if it is Fail. `checks` holds the results in CHECKS order; a check still running
+        under --fail-fast, or with nothing to report, has no result and leaves its entries out.
+        """
+        statuses = [
+            self.summary[key] for (_, _, keys), result in zip(self.CHECKS, checks) if result is not None for key in keys
         ]
+        self.summary["Overall Status"] = "Fail" if "Failed" in statuses else "Pass"
+        return self.summary["Overall Status"] == "Fail"
 
+    def print_report(self, checks):
+        """
+        Prints the non-empty check results followed by the validation summary.
+        """
         for result in checks:
             if result:
                 print(result)
 
-        self.summary["Overall Status"] = "Fail" if any(status == "Failed" for status in self.summary.values()) else "Pass"
+        self.failed(checks)
         print("\n📊 Validation Summary\n" + "-"*30)
         for check, status in self.summary.items():
             print(f"{check:<20} {status}")
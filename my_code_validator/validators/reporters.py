@@ -0,0 +1,176 @@
+import json
+import os
+import sys
+from my_code_validator import __version__
+from .diagnostics import parse_results
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+EXIT_PASSED = 0
+EXIT_FAILED = 1
+EXIT_ERROR = 2
+
+
+class TextReporter:
+    """
+    Prints each file's human-readable report as soon as its checks finish.
+    Reporters only see one file's results at a time, so memory stays flat however large the run is.
+    """
+    name = "text"
+
+    def __init__(self, stream=None):
+        """
+        Initializes the reporter. Output goes to `stream`, or to whatever sys.stdout is at the time of writing.
+        """
+        self.stream = stream
+        self.files = 0
+        self.failed_files = 0
+        self.errors = 0
+        self.run_info = {}  # Extra fields for the summary of structured reports, like the shard
+
+    @property
+    def out(self):
+        return self.stream or sys.stdout
+
+    def message(self, text):
+        """Prints a progress or status message that is not tied to a file's results."""
+        print(text, file=self.out)
+
+    def error(self, text):
+        """Reports an input that could not be validated (e.g. a missing file)."""
+        self.errors += 1
+        self.message(text)
+
+    def exit_code(self):
+        """Returns 2 if some input could not be validated, 1 if any file failed, otherwise 0."""
+        if self.errors:
+            return EXIT_ERROR
+        return EXIT_FAILED if self.failed_files else EXIT_PASSED
+
+    def report(self, validator, file_path, results, header=None):
+        """
+        Reports one file's check results and returns True if the file failed validation.
+        `header` replaces the validator's banner when given.
+        """
+        self.files += 1
+        failed = validator.failed(results)
+        self.failed_files += failed
+        self.write_report(validator, file_path, results, header)
+        return failed
+
+    def write_report(self, validator, file_path, results, header):
+        (header or validator.print_header)(file_path)
+        validator.print_report(results)
+
+    def finish(self):
+        """Ends the report and returns the process exit code (see exit_code)."""
+        return self.exit_code()
+
+
+class NDJSONReporter(TextReporter):
+    """
+    Writes one JSON object per line: a "diagnostic" record per finding, a "file" record with the
+    file's status and check summary once its checks finish, and a final "summary" record.
+    Messages go to stderr so stdout stays machine-readable.
+    """
+    name = "ndjson"
+
+    def message(self, text):
+        print(text, file=sys.stderr)
+
+    def write(self, record):
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.out.flush()
+
+    def write_report(self, validator, file_path, results, header):
+        for diagnostic in parse_results(file_path, results):
+            self.write(dict(type="diagnostic", **diagnostic.to_dict()))
+        self.write({
+            "type": "file",
+            "file": file_path,
+            "status": "failed" if validator.failed(results) else "passed",
+            "summary": getattr(validator, "summary", None),
+        })
+
+    def finish(self):
+        self.write({"type": "summary", "files": self.files, "failed": self.failed_files, "errors": self.errors, **self.run_info})
+        return self.exit_code()
+
+
+class SarifReporter(NDJSONReporter):
+    """
+    Writes a SARIF 2.1.0 log with a single run. The document is streamed: the header goes out
+    with the first result and each result is written as soon as its file finishes.
+    Python checks that fail on a threshold (e.g. the pylint rating) are reported as file-level results.
+    """
+    name = "sarif"
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self.started = False
+        self.results = 0
+
+    def start(self):
+        if self.started:
+            return
+        self.started = True
+        header = {
+            "version": "2.1.0",
+            "$schema": SARIF_SCHEMA,
+            "runs": [{
+                "tool": {"driver": {"name": "frappe-code-validate", "version": __version__}},
+                "results": [],
+            }],
+        }
+        text = json.dumps(header, ensure_ascii=False)
+        # Leave the results array open; finish() closes it
+        self.out.write(text[:text.rindex("[]") + 1] + "\n")
+
+    def write_result(self, result):
+        self.start()
+        self.out.write(("," if self.results else "") + json.dumps(result, ensure_ascii=False) + "\n")
+        self.out.flush()
+        self.results += 1
+
+    @staticmethod
+    def location(file_path, line=0, column=0):
+        # URIs are relative to the working directory, or absolute file URIs for files outside it
+        path = os.path.relpath(file_path).replace(os.sep, "/")
+        if path.startswith("../"):
+            path = "file://" + os.path.abspath(file_path).replace(os.sep, "/")
+        physical = {"artifactLocation": {"uri": path}}
+        if line:
+            physical["region"] = {"startLine": line, **({"startColumn": column} if column else {})}
+        return {"physicalLocation": physical}
+
+    def write_report(self, validator, file_path, results, header):
+        for diagnostic in parse_results(file_path, results):
+            self.write_result({
+                "ruleId": f"{diagnostic.tool}/{diagnostic.rule}",
+                "level": diagnostic.severity,
+                "message": {"text": diagnostic.message},
+                "locations": [self.location(file_path, diagnostic.line, diagnostic.column)],
+                "properties": {"tool": diagnostic.tool},
+            })
+        for check, status in getattr(validator, "summary", {}).items():
+            if status == "Failed":
+                self.write_result({
+                    "ruleId": f"frappe-code/{check.lower().replace(' ', '-')}",
+                    "level": "error",
+                    "message": {"text": f"{check} check failed"},
+                    "locations": [self.location(file_path)],
+                })
+
+    def finish(self):
+        self.start()
+        properties = f', "properties": {json.dumps(self.run_info, ensure_ascii=False)}' if self.run_info else ""
+        self.out.write(f"]{properties}}}]}}\n")
+        self.out.flush()
+        return self.exit_code()
+
+
+REPORTERS = {reporter.name: reporter for reporter in (TextReporter, NDJSONReporter, SarifReporter)}
+
+
+def get_reporter(output_format="text", stream=None):
+    """Returns a new reporter for an output format: text, ndjson or sarif."""
+    return REPORTERS[output_format](stream)
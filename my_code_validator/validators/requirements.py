@@ -0,0 +1,311 @@
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from importlib import metadata
+from my_code_validator import __version__
+from . import analysis
+from .cache import file_hash
+from .utils import format_output
+
+MAX_LOCATIONS = 3  # Importing files listed per unresolved module in the project report
+
+# Import names of common packages whose distribution is named differently. Only consulted for
+# imports no installed distribution provides, to name what is missing without asking PyPI.
+IMPORT_DISTRIBUTIONS = {
+    "attr": "attrs",
+    "barcode": "python-barcode",
+    "bs4": "beautifulsoup4",
+    "Crypto": "pycryptodome",
+    "cv2": "opencv-python",
+    "dateutil": "python-dateutil",
+    "dns": "dnspython",
+    "docx": "python-docx",
+    "dotenv": "python-dotenv",
+    "fitz": "PyMuPDF",
+    "git": "GitPython",
+    "gi": "PyGObject",
+    "jose": "python-jose",
+    "jwt": "PyJWT",
+    "kafka": "kafka-python",
+    "ldap": "python-ldap",
+    "Levenshtein": "python-Levenshtein",
+    "magic": "python-magic",
+    "MySQLdb": "mysqlclient",
+    "nacl": "PyNaCl",
+    "OpenSSL": "pyOpenSSL",
+    "PIL": "Pillow",
+    "pkg_resources": "setuptools",
+    "pptx": "python-pptx",
+    "psycopg2": "psycopg2-binary",
+    "pymysql": "PyMySQL",
+    "pyqrcode": "PyQRCode",
+    "serial": "pyserial",
+    "skimage": "scikit-image",
+    "sklearn": "scikit-learn",
+    "slugify": "python-slugify",
+    "socketio": "python-socketio",
+    "telegram": "python-telegram-bot",
+    "usb": "pyusb",
+    "win32api": "pywin32",
+    "yaml": "PyYAML",
+    "zmq": "pyzmq",
+}
+
+
+@lru_cache(maxsize=None)
+def environment_digest():
+    """Returns a digest of the installed distributions and their versions, computed once per process."""
+    names = sorted(
+        f"{distribution.metadata['Name']}=={distribution.version}" for distribution in metadata.distributions()
+    )
+    return hashlib.sha256("\n".join(names).encode()).hexdigest()
+
+
+def resolver_version():
+    """
+    Returns the version used to key cached dependency checks: results change with this
+    package and with what is installed, not with an external tool.
+    """
+    return f"{__version__}+{environment_digest()[:12]}"
+
+
+@lru_cache(maxsize=None)
+def requirement(name):
+    """Returns the pinned requirement of an installed distribution."""
+    try:
+        return f"{name}=={metadata.version(name)}"
+    except metadata.PackageNotFoundError:
+        return name
+
+
+class FileRequirements:
+    """The resolved imports of one file."""
+
+    def __init__(self, installed=(), missing=None, unresolved=None, error=None):
+        self.installed = list(installed)  # "name==version" of installed distributions
+        self.missing = missing or {}  # module -> (distribution from IMPORT_DISTRIBUTIONS, line)
+        self.unresolved = unresolved or {}  # module -> line
+        self.error = error
+
+
+class DependencyResolver:
+    """
+    Maps the imports of Python files to the distributions providing them, offline: imports
+    are extracted with `ast`, installed distributions come from the environment's metadata,
+    and imports nothing installed provides are named from IMPORT_DISTRIBUTIONS.
+    Extracted imports are cached by content hash, so unchanged files are not parsed again,
+    and each file is resolved once per run however many checks ask for it.
+    It also digests the project modules each file imports, for the keys of cached results that depend on them.
+    """
+
+    def __init__(self, cache=None):
+        """
+        Initializes the resolver for one run. Imports are stored in the given ResultCache, if any.
+        """
+        self.cache = cache
+        self.files = {}
+        self.module_lists = {}  # Path -> dotted imports, see module_imports
+        self.local_modules = {}  # (directory, import) -> project files it loads
+        self.digests = {}
+        self.lock = threading.Lock()
+
+    def imports(self, file_path):
+        """Returns a file's imported top-level modules as {module: line}, and the parse error if any."""
+        key = None
+        if self.cache is not None and self.cache.enabled:
+            try:
+                content_hash = self.cache.content_hash(file_path)
+            except OSError:
+                content_hash = None
+            if content_hash:
+                # Imports only depend on the content, so files with the same content share the entry
+                key = hashlib.sha256(f"imports\0{content_hash}\0{__version__}".encode()).hexdigest()
+                entry = self.cache.get(key)
+                if entry is not None:
+                    return entry["imports"], entry["error"]
+
+        source = analysis.analyze(file_path)
+        imports = source.get("imports") if source.error is None else {}
+        error = None if source.error is None else str(source.error)
+        if key is not None:
+            self.cache.put(key, {"imports": imports, "error": error})
+        return imports, error
+
+    def module_imports(self, file_path):
+        """Returns the modules a file imports by full dotted name (see analysis.ModuleImportsAnalyzer), cached like `imports`."""
+        path = os.path.abspath(file_path)
+        with self.lock:
+            modules = self.module_lists.get(path)
+        if modules is not None:
+            return modules
+
+        key = None
+        try:
+            key = hashlib.sha256(f"module_imports\0{self.content_hash(path)}\0{__version__}".encode()).hexdigest()
+            entry = self.cache.get(key)
+        except OSError:
+            entry = None
+        if entry is not None:
+            modules = entry["modules"]
+        else:
+            source = analysis.analyze(path)
+            modules = source.get("module_imports") if source.error is None else []
+            if key is not None:
+                self.cache.put(key, {"modules": modules})
+        with self.lock:
+            self.module_lists[path] = modules
+        return modules
+
+    def content_hash(self, file_path):
+        return self.cache.content_hash(file_path) if self.cache is not None else file_hash(file_path)
+
+    def dependency_digest(self, file_path):
+        """
+        Returns a digest of the content of the project modules a file imports, directly or through
+        other modules, for the keys of cached results that depend on them (see PythonValidator).
+        Computed once per file per run; empty without an enabled cache, since nothing is cached then.
+        """
+        if self.cache is None or not self.cache.enabled:
+            return ""
+        path = os.path.abspath(file_path)
+        with self.lock:
+            digest = self.digests.get(path)
+        if digest is not None:
+            return digest
+
+        found, pending = {path}, [path]
+        while pending:
+            current = pending.pop()
+            for specifier in self.module_imports(current):
+                memo_key = (os.path.dirname(current), specifier)
+                modules = self.local_modules.get(memo_key)
+                if modules is None:
+                    modules = self.local_modules[memo_key] = analysis.local_module_files(current, specifier)
+                for module in modules:
+                    if module not in found:
+                        found.add(module)
+                        pending.append(module)
+
+        digest = hashlib.sha256()
+        for module in sorted(found - {path}):
+            try:
+                digest.update(f"{module}\0{self.content_hash(module)}\n".encode())
+            except OSError:
+                continue
+        with self.lock:
+            self.digests[path] = digest = digest.hexdigest()
+        return digest
+
+    def resolve(self, file_path):
+        """
+        Returns the FileRequirements of a file, resolving it on first use.
+        Standard library modules and modules of the project itself are left out.
+        """
+        path = os.path.abspath(file_path)
+        with self.lock:
+            resolved = self.files.get(path)
+        if resolved is not None:
+            return resolved
+
+        imports, error = self.imports(file_path)
+        if error is not None:
+            resolved = FileRequirements(error=error)
+        else:
+            roots = analysis.import_roots(file_path)
+            distributions = analysis.installed_distributions()
+            installed, missing, unresolved = set(), {}, {}
+            for module, line in imports.items():
+                if analysis.is_standard_library(module) or any(
+                    os.path.exists(os.path.join(root, module + ".py")) or os.path.isdir(os.path.join(root, module))
+                    for root in roots
+                ):
+                    continue
+                if distributions.get(module):
+                    installed.update(requirement(name) for name in distributions[module])
+                elif module in IMPORT_DISTRIBUTIONS:
+                    missing[module] = (IMPORT_DISTRIBUTIONS[module], line)
+                else:
+                    unresolved[module] = line
+            resolved = FileRequirements(sorted(installed, key=str.lower), missing, unresolved)
+
+        with self.lock:
+            self.files[path] = resolved
+        return resolved
+
+    def forget(self, file_paths):
+        """Drops what is known about files that changed, so a resolver kept across runs (see watch.py) reads them again."""
+        with self.lock:
+            for file_path in file_paths:
+                self.files.pop(os.path.abspath(file_path), None)
+                self.module_lists.pop(os.path.abspath(file_path), None)
+            # Files importing the changed ones, directly or not, have new digests; new modules may resolve imports
+            self.local_modules.clear()
+            self.digests.clear()
+
+    def check_file(self, file_path):
+        """
+        Returns the dependency check output of one file: a warning per import that no installed
+        distribution provides, in the format pipreqs used. Requirements go in the project report.
+        """
+        resolved = self.resolve(file_path)
+        if resolved.error is not None:
+            return f"ERROR: Failed on file: {file_path}: {resolved.error}\n"
+        lines = [
+            f'WARNING: Import named "{module}" not found locally (line {line}), it is provided by {distribution}.'
+            for module, (distribution, line) in sorted(resolved.missing.items())
+        ]
+        lines += [
+            f'WARNING: Import named "{module}" not found locally (line {line}).'
+            for module, line in sorted(resolved.unresolved.items())
+        ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def project(self, file_paths):
+        """
+        Combines the requirements of the files into one report for the project.
+        Returns a dictionary with the pinned installed requirements, the distributions that
+        are needed but not installed, and the unresolved modules with the files importing them.
+        """
+        installed, missing, unresolved, errors = set(), {}, {}, []
+        for file_path in file_paths:
+            resolved = self.resolve(file_path)
+            if resolved.error is not None:
+                errors.append(file_path)
+            installed.update(resolved.installed)
+            for distribution, line in resolved.missing.values():
+                missing.setdefault(distribution, []).append(f"{file_path}:{line}")
+            for module, line in resolved.unresolved.items():
+                unresolved.setdefault(module, []).append(f"{file_path}:{line}")
+        return {
+            "requirements": sorted(installed, key=str.lower),
+            "missing": dict(sorted(missing.items(), key=lambda item: item[0].lower())),
+            "unresolved": dict(sorted(unresolved.items())),
+            "errors": errors,
+        }
+
+
+def format_locations(locations):
+    shown = ", ".join(locations[:MAX_LOCATIONS])
+    more = len(locations) - MAX_LOCATIONS
+    return f"{shown} and {more} more" if more > 0 else shown
+
+
+def report_requirements(reporter, resolver, file_paths):
+    """
+    Reports the requirements of all Python files of a run once, after their results.
+    The structured report also goes into the run's summary (NDJSON and SARIF).
+    """
+    if not file_paths:
+        return
+    project = resolver.project(file_paths)
+    lines = [f"📦 {len(project['requirements'])} installed requirement(s) imported by {len(file_paths)} file(s):"]
+    lines += project["requirements"]
+    for distribution, locations in project["missing"].items():
+        lines.append(f"⚠️ {distribution} is not installed, imported in {format_locations(locations)}")
+    for module, locations in project["unresolved"].items():
+        lines.append(f'⚠️ No distribution provides "{module}", imported in {format_locations(locations)}')
+    if project["errors"]:
+        lines.append(f"❌ {len(project['errors'])} file(s) could not be parsed: {format_locations(project['errors'])}")
+    reporter.message(format_output("Project Requirements", "\n".join(lines)))
+    reporter.run_info["requirements"] = project
@@ -0,0 +1,110 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from . import process
+
+
+def default_jobs():
+    """Returns the default number of parallel workers (one per CPU)."""
+    return os.cpu_count() or 1
+
+
+class Scheduler:
+    """
+    A bounded worker pool for running independent checks concurrently.
+    Checks are mostly external tools, so threads are enough to keep every core busy.
+    Results are always handed back in submission order so output stays readable.
+    """
+    def __init__(self, jobs=None, plan=None):
+        """
+        Initializes the scheduler with `jobs` workers (defaults to the CPU count).
+        With a CheckPlan (see planner.py), each file's checks run cheapest first and may be
+        cut short by fail-fast or the time budget.
+        Workers start tools in the directory of the thread creating the scheduler (see process.in_directory).
+        """
+        self.jobs = max(1, jobs or default_jobs())
+        self.plan = plan
+        directory = getattr(process.DIRECTORY, "value", None)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.jobs, initializer=process.set_directory, initargs=(directory,)
+        ) if self.jobs > 1 else None
+
+    def submit(self, tasks):
+        """
+        Starts running a list of zero-argument callables and returns a handle for their results.
+        With a single job the tasks are run lazily, in order, when the results are requested.
+        """
+        if self.executor is None:
+            return list(tasks)
+        return [self.executor.submit(task) for task in tasks]
+
+    def results(self, handles):
+        """
+        Waits for the tasks returned by `submit` and returns their results in order.
+        """
+        if self.executor is None:
+            return [task() for task in handles]
+        return [future.result() for future in handles]
+
+    def run(self, tasks):
+        """
+        Runs a list of callables and returns their results in order.
+        """
+        return self.results(self.submit(tasks))
+
+    def validate(self, validator, file_path, checks=None, reporter=None):
+        """
+        Starts a validator's checks for a file and returns a callable that,
+        once called, waits for them and reports the file's results through `reporter`
+        (printing the text report when no reporter is given). The validator's summary is then
+        frozen, see PythonValidator.freeze.
+        `checks` replaces the validator's default checks for the file when given.
+        """
+        checks = validator.checks(file_path) if checks is None else checks
+        if self.plan is not None:
+            collect = self.plan.start(self, validator, checks)
+        else:
+            handle = self.submit(checks)
+            collect = lambda: self.results(handle)
+
+        def report():
+            results = collect()
+            try:
+                if reporter is None:
+                    validator.print_header(file_path)
+                    return validator.print_report(results)
+                return reporter.report(validator, file_path, results)
+            finally:
+                if hasattr(validator, "freeze"):
+                    validator.freeze()
+
+        return report
+
+    def stream(self, starts, window=None):
+        """
+        Calls each of a lazy sequence of `start` callables (which submit work and return a report
+        callable, like `validate`), then runs the reports in order. At most `window` files are in
+        flight at once, so results never pile up however many files there are.
+        """
+        window = window or self.jobs * 4
+        pending = deque()
+        for start in starts:
+            pending.append(start())
+            if len(pending) >= window:
+                pending.popleft()()
+        while pending:
+            pending.popleft()()
+
+    def shutdown(self):
+        """
+        Stops the worker pool once all submitted tasks have finished. Checks abandoned when a
+        time budget ran out are not waited for, they run outside the pool (see planner.py).
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from .cache import CACHE_DIR_NAME, ResultCache
+
+TIMINGS_FILE = "timings.json"
+TIMING_SMOOTHING = 0.5  # Weight of the latest run in a file's recorded runtime
+DEFAULT_SECONDS_PER_BYTE = 1 / 20000  # Runtime assumed per byte of source before any file was timed
+MIN_FILE_WEIGHT = 0.01  # Seconds assumed for empty files, so they still spread over the shards
+
+
+class FileTimings:
+    """
+    Per-file validation runtimes recorded from earlier runs, keyed by path relative to the
+    project, so they carry over between checkouts in different places (e.g. CI nodes).
+    A file's runtime is the summed duration of its checks, not its wall-clock time.
+    """
+
+    def __init__(self, directory, path=None, load=True):
+        """
+        Loads the recorded runtimes from `path`, or from timings.json in the project's cache directory.
+        Without `load`, none are read and files are weighed by size alone.
+        """
+        self.directory = os.path.abspath(directory)
+        self.path = path or os.path.join(self.directory, CACHE_DIR_NAME, TIMINGS_FILE)
+        self.lock = threading.Lock()
+        self.current = {}
+        self.history = {}
+        if not load:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as timings_file:
+                self.history = json.load(timings_file)
+        except (OSError, ValueError):
+            self.history = {}
+
+    def key(self, file_path):
+        return os.path.relpath(os.path.abspath(file_path), self.directory).replace(os.sep, "/")
+
+    def add(self, file_path, seconds):
+        """Adds check time spent on a file during this run."""
+        key = self.key(file_path)
+        with self.lock:
+            self.current[key] = self.current.get(key, 0.0) + seconds
+
+    def timed(self, check, file_path):
+        """Wraps a zero-argument check so its duration is added to the file's runtime."""
+        def run():
+            start = time.perf_counter()
+            try:
+                return check()
+            finally:
+                self.add(file_path, time.perf_counter() - start)
+        return run
+
+    def weights(self, file_paths):
+        """
+        Returns the expected runtime of each file: its recorded runtime, or for files never
+        timed, its size times the seconds per byte measured on timed files of the same type.
+        """
+        sizes = {}
+        for file_path in file_paths:
+            try:
+                sizes[file_path] = os.path.getsize(file_path)
+            except OSError:
+                sizes[file_path] = 0
+
+        rates = {}
+        for extension in {os.path.splitext(file_path)[1] for file_path in file_paths}:
+            timed = [
+                (self.history[self.key(file_path)], sizes[file_path]) for file_path in file_paths
+                if file_path.endswith(extension) and self.key(file_path) in self.history
+            ]
+            total_size = sum(size for _, size in timed)
+            rates[extension] = sum(seconds for seconds, _ in timed) / total_size if total_size else DEFAULT_SECONDS_PER_BYTE
+
+        return {
+            file_path: max(MIN_FILE_WEIGHT, self.history.get(
+                self.key(file_path), sizes[file_path] * rates[os.path.splitext(file_path)[1]]
+            ))
+            for file_path in file_paths
+        }
+
+    def merged(self):
+        """Returns the recorded runtimes updated with the runtimes measured in this run."""
+        history = dict(self.history)
+        for key, seconds in self.current.items():
+            previous = history.get(key)
+            history[key] = seconds if previous is None else previous + TIMING_SMOOTHING * (seconds - previous)
+        return history
+
+    def save(self):
+        """Writes the updated runtimes back, if anything was timed in this run."""
+        if not self.current:
+            return
+        if os.path.dirname(self.path) == os.path.join(self.directory, CACHE_DIR_NAME):
+            ResultCache(self.directory).ensure_gitignore()
+        write_timings(self.path, self.merged())
+
+
+def write_timings(path, timings):
+    """Writes a timings file atomically."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as timings_file:
+        json.dump(timings, timings_file, indent=0, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def partition(file_paths, count, timings):
+    """
+    Splits files into `count` shards of about equal expected runtime: the most expensive
+    files are placed first, each on the shard with the least work so far.
+    The result only depends on the relative paths, sizes and recorded runtimes, so every
+    node computes the same partition as long as they share the same timings file.
+    Files keep their original order within a shard.
+    """
+    weights = timings.weights(file_paths)
+    loads = [0.0] * count
+    assignment = {}
+    for file_path in sorted(file_paths, key=lambda path: (-weights[path], timings.key(path))):
+        shard = min(range(count), key=lambda index: (loads[index], index))
+        assignment[file_path] = shard
+        loads[shard] += weights[file_path]
+    return [[path for path in file_paths if assignment[path] == index] for index in range(count)]
+
+
+def partition_fingerprint(shards, timings):
+    """
+    Identifies a partition by the files of each shard, so merge-results can tell whether every
+    shard of a run computed the same one.
+    """
+    digest = hashlib.sha256()
+    for index, file_paths in enumerate(shards):
+        for key in sorted(timings.key(file_path) for file_path in file_paths):
+            digest.update(f"{index}\0{key}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def shard_files(file_paths, shard, timings):
+    """
+    Returns the files of one shard, given as an (index, count) tuple with a 1-based index,
+    and the fingerprint of the partition they were taken from.
+    """
+    index, count = shard
+    shards = partition(file_paths, count, timings)
+    return shards[index - 1], partition_fingerprint(shards, timings)
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import sysconfig
+from functools import lru_cache
+from my_code_validator import __version__
+from .cache import CACHE_DIR_NAME, TOOLCHAIN_FILE, ResultCache, file_hash
+from .process import current_directory, run
+
+SCHEMA_VERSION = 1
+JS_TOOLS = ("eslint", "prettier", "retire")  # Installed with npm into the project's node_modules
+# Configuration files each tool reads from the project directory, fingerprinted in the manifest
+TOOL_CONFIGS = {
+    "pylint": (".pylintrc", "pylintrc", "pyproject.toml", "setup.cfg"),
+    "mypy": ("mypy.ini", ".mypy.ini", "pyproject.toml", "setup.cfg"),
+    "vulture": ("pyproject.toml",),
+    "radon": ("radon.cfg", "setup.cfg"),
+    "bandit": (".bandit", "pyproject.toml"),
+    "coverage": (".coveragerc", "setup.cfg", "pyproject.toml"),
+    "eslint": ("eslint.config.cjs", "eslint.config.js"),
+    "prettier": (".prettierrc", ".prettierrc.json"),
+    "retire": (".retireignore.json",),
+}
+
+LOADED = {}  # Manifest path -> (mtime, Toolchain), so a manifest is parsed once until it changes
+
+
+class ToolchainError(Exception):
+    """Raised when the toolchain manifest cannot be read or no longer matches the installed tools."""
+
+
+class Toolchain:
+    """
+    The tools recorded by `frappe-code install`: for each, the absolute path of its executable,
+    the version it reported, the size and mtime of the executable (to notice a reinstall or
+    upgrade without running it) and the fingerprint of the configuration it read at install time.
+    """
+
+    def __init__(self, path, manifest):
+        self.path = path
+        self.schema = manifest.get("schema")
+        self.tools = manifest.get("tools", {})
+
+    def problems(self):
+        """Returns why the manifest no longer describes the installed tools; empty if it is current."""
+        if self.schema != SCHEMA_VERSION:
+            return ["it was written by an incompatible version of frappe-code-validate"]
+        problems = []
+        directory = os.path.dirname(os.path.dirname(self.path))  # The manifest sits in the project's cache directory
+        for tool, entry in sorted(self.tools.items()):
+            try:
+                signature = file_signature(entry["path"])
+            except OSError:
+                problems.append(f"{tool} is no longer installed at {entry['path']}")
+                continue
+            if signature != entry["signature"]:
+                problems.append(f"{tool} at {entry['path']} was reinstalled or upgraded")
+            if "config" in entry and config_digest(tool, directory) != entry["config"]:
+                problems.append(f"the {tool} configuration in {directory} changed")
+        return problems
+
+    def versions(self):
+        """Returns the first line of each tool's recorded version, for run summaries."""
+        return {tool: entry["version"].splitlines()[0] if entry["version"] else "" for tool, entry in sorted(self.tools.items())}
+
+
+def file_signature(path):
+    """Returns the size and mtime of the file a path resolves to."""
+    stat = os.stat(os.path.realpath(path))
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def parent_directories(directory):
+    directory = os.path.abspath(directory)
+    while True:
+        yield directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return
+        directory = parent
+
+
+@lru_cache(maxsize=None)
+def manifest_path(directory):
+    """Returns the manifest in the directory's cache directory or the nearest parent's, or None."""
+    for base in parent_directories(directory):
+        path = os.path.join(base, CACHE_DIR_NAME, TOOLCHAIN_FILE)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def load_toolchain(directory=None):
+    """
+    Returns the Toolchain recorded for a directory (the current one by default), or None if
+    `frappe-code install` did not write a manifest there. Raises ToolchainError if it cannot be read.
+    """
+    path = manifest_path(os.path.abspath(directory or os.getcwd()))
+    if path is None:
+        return None
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        loaded = LOADED.get(path)
+        if loaded is not None and loaded[0] == mtime:
+            return loaded[1]
+        with open(path, encoding="utf-8") as manifest_file:
+            toolchain = Toolchain(path, json.load(manifest_file))
+    except (OSError, ValueError) as e:
+        raise ToolchainError(f"The toolchain manifest {path} cannot be read ({e}). Run `frappe-code install` to write it again.")
+    LOADED[path] = (mtime, toolchain)
+    return toolchain
+
+
+def check_toolchain(directory=None):
+    """
+    Checks at the start of a run that the toolchain manifest still matches the installed tools,
+    and returns it (None without a manifest). Raises ToolchainError naming what changed if it is stale.
+    Lookups are refreshed, so a long-running process picks up a manifest written since its last run.
+    """
+    manifest_path.cache_clear()
+    find_tool.cache_clear()
+    toolchain = load_toolchain(directory)
+    if toolchain is not None:
+        problems = toolchain.problems()
+        if problems:
+            raise ToolchainError(
+                f"The toolchain manifest {toolchain.path} is stale: {'; '.join(problems)}. "
+                "Run `frappe-code install` again to record the installed tools."
+            )
+    return toolchain
+
+
+def prepare_toolchain(reporter):
+    """
+    Checks the toolchain at the start of a validate command and records the tool versions in
+    the report's summary. Reports why and returns False if the manifest is stale or unreadable.
+    """
+    try:
+        toolchain = check_toolchain()
+    except ToolchainError as e:
+        reporter.message(f"❌ Error: {e}")
+        return False
+    if toolchain is not None:
+        reporter.run_info["toolchain"] = toolchain.versions()
+    return True
+
+
+@lru_cache(maxsize=None)
+def find_tool(tool, directory):
+    """
+    Looks a tool up without a manifest: Node tools in the nearest node_modules/.bin, then
+    every tool on PATH. Returns the absolute path, or None if the tool is not installed.
+    """
+    if tool in JS_TOOLS:
+        for base in parent_directories(directory):
+            path = os.path.join(base, "node_modules", ".bin", tool)
+            if os.path.isfile(path) and os.access(path, os.X_OK):
+                return path
+    path = shutil.which(tool)
+    return os.path.abspath(path) if path else None
+
+
+def tool_path(tool):
+    """
+    Returns the executable to run a tool with: the manifest's path, or without a manifest (or
+    for a tool it does not list) the tool found by find_tool once per process, or the bare name.
+    """
+    toolchain = load_toolchain()
+    entry = toolchain.tools.get(tool) if toolchain is not None else None
+    if entry is not None:
+        return entry["path"]
+    return find_tool(tool, current_directory()) or tool
+
+
+def tool_command(tool, *args):
+    """Returns the argument list running a tool with the given arguments."""
+    return [tool_path(tool), *args]
+
+
+@lru_cache(maxsize=None)
+def probe_version(path):
+    """Returns the version string an executable reports, asked once per process."""
+    result = run([path, "--version"])
+    return (result.stdout or result.stderr).strip() if result.returncode == 0 else "unknown"
+
+
+def tool_version(tool):
+    """Returns the version of a tool: the manifest's, or the one the tool reports without a manifest."""
+    toolchain = load_toolchain()
+    entry = toolchain.tools.get(tool) if toolchain is not None else None
+    return entry["version"] if entry is not None else probe_version(tool_path(tool))
+
+
+def config_digest(tool, directory):
+    """Returns a digest of the configuration files a tool reads from the directory."""
+    digest = hashlib.sha256()
+    for name in TOOL_CONFIGS.get(tool, ()):
+        config_path = os.path.join(directory, name)
+        if os.path.isfile(config_path):
+            digest.update(f"{name}\0{file_hash(config_path)}\0".encode())
+    return digest.hexdigest()
+
+
+def write_toolchain(directory, python_tools, js_tools):
+    """
+    Resolves each tool once and writes the manifest into the directory's cache directory.
+    Python tools are taken from the scripts directory of this interpreter, where pip installed
+    them, before PATH. Returns the manifest's path and the tools that could not be found.
+    """
+    directory = os.path.abspath(directory)
+    scripts = sysconfig.get_path("scripts")
+    tools, missing = {}, []
+    for tool in list(python_tools) + list(js_tools):
+        path = shutil.which(tool, path=scripts) if tool not in js_tools else None
+        path = os.path.abspath(path) if path else find_tool.__wrapped__(tool, directory)
+        if path is None:
+            missing.append(tool)
+            continue
+        tools[tool] = {
+            "path": path,
+            "version": probe_version.__wrapped__(path),
+            "signature": file_signature(path),
+            "config": config_digest(tool, directory),
+        }
+
+    cache = ResultCache(directory)
+    cache.ensure_gitignore()
+    path = os.path.join(cache.root, TOOLCHAIN_FILE)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(
+            {"schema": SCHEMA_VERSION, "validator": __version__, "python": sys.executable, "tools": tools},
+            manifest_file, indent=2, sort_keys=True
+        )
+    os.replace(temp_path, path)
+    manifest_path.cache_clear()
+    return path, missing
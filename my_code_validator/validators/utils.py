@@ -1,13 +1,13 @@
-import subprocess
+from .process import run
 
-def run_command(command):
-    """Runs a shell command using Popen and returns the output and errors."""
-    try:
-        proc = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        stdout, stderr = proc.communicate()
-        return stdout.strip() + "\n" + stderr.strip()
-    except Exception as e:
-        return str(e)
+
+def run_command(args):
+    """
+    Runs a tool given as an argument list and returns its ProcessResult (see process.run):
+    the text checks parse is its `output`; `returncode` and `timed_out` tell a tool that
+    could not start or was killed from one that ran.
+    """
+    return run(args)
 
 def format_output(title, result):
     """Formats the output for better readability."""
@@ -28,6 +28,7 @@ setup(
     version="1.1.0",
     packages=find_packages(),
     include_package_data=True,
+    package_data={"my_code_validator": ["validators/js_worker.js"]},
     entry_points={
         "console_scripts": [
             "frappe-code=my_code_validator.cli:main",